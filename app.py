@@ -1,267 +1,412 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
+import json
 import os
+import time
 from datetime import datetime
 from flask_cors import CORS
 
 from services.pipeline import (
-    load_news,
-    analyze_news,
-    compute_dashboard,
-    generate_alerts,
-    run_pipeline,
+    alert_stream,
+    load_corpus,
+    pipeline_scheduler,
     get_data_source_info,
 )
-from services.brief import brief_generator
+from services.article import json_default
+from services.httpcache import CompressedAsset, ResponseCache, make_etag, matches_any_encoding
+from services.index import parse_time_bound
+from services.jobs import brief_queue
+from services.metrics import metrics
+from services.serialize import (
+    decode_cursor,
+    encode_cursor,
+    format_sse,
+    iter_json_array,
+    iter_ndjson,
+    paginate,
+    parse_fields,
+    project,
+)
 from services.sentiment import sentiment_analyzer
 
 app = Flask(__name__)
 CORS(app)
 
-def _current_news():
-    return analyze_news(load_news())
+# Full /api/news arrays longer than this are streamed instead of compressed and cached.
+STREAM_THRESHOLD = int(os.getenv("NEWS_STREAM_THRESHOLD", "5000"))
+# Idle SSE connections get a comment line this often (seconds) so dead clients are noticed.
+SSE_HEARTBEAT = float(os.getenv("ALERT_STREAM_HEARTBEAT", "15"))
+# /api/generate_brief waits this long (seconds) for the brief, then answers 202 with a job id to poll.
+BRIEF_WAIT = float(os.getenv("BRIEF_WAIT", "2"))
+
+
+def _load_landing_page() -> CompressedAsset:
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "index.html")
+    with open(path, "rb") as f:
+        body = f.read()
+    return CompressedAsset(
+        body,
+        "text/html; charset=utf-8",
+        last_modified=os.path.getmtime(path),
+        max_age=int(os.getenv("LANDING_PAGE_MAX_AGE", "600")),
+    )
+
+
+LANDING_PAGE = _load_landing_page()
+# Compressed JSON bodies per (route, query), valid for one corpus/snapshot version.
+response_cache = ResponseCache(max_bytes=int(os.getenv("RESPONSE_CACHE_MB", "64")) << 20)
+
+metrics.describe("http_request_duration_seconds", "Time to build each API response (streamed bodies excluded)")
+metrics.describe("http_conditional_responses_total", "Versioned JSON responses by outcome (not_modified, hit, miss)")
+
+
+@app.before_request
+def _start_timer():
+    if not metrics.enabled:
+        return
+    g.request_start = time.perf_counter()
+    if metrics.profiling and request.args.get("profile") == "1":
+        g.profiler = metrics.start_profile()
+
+
+@app.after_request
+def _record_request(response):
+    start = g.pop("request_start", None)
+    if start is None:
+        return response
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    metrics.observe(
+        "http_request_duration_seconds",
+        time.perf_counter() - start,
+        {"route": route, "method": request.method, "status": response.status_code},
+    )
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profile = profiler.stop()
+        profile["route"] = route
+        response.headers["X-Profile-Id"] = metrics.save_profile(profile)
+    return response
+
+def _query_filters():
+    """stock_code / industry / start / end query parameters, if any were given.
+
+    Raises ValueError for a ``start``/``end`` that is not an ISO date or time.
+    """
+    filters = {key: request.args.get(key) for key in ("stock_code", "industry", "start", "end")}
+    filters = {key: value for key, value in filters.items() if value}
+    for key in ("start", "end"):
+        if key in filters:
+            filters[key] = parse_time_bound(key, filters[key])
+    return filters
+
+
+def _dumps(obj):
+    """Compact JSON matching jsonify's key order and escaping."""
+    return json.dumps(
+        obj,
+        ensure_ascii=app.json.ensure_ascii,
+        sort_keys=app.json.sort_keys,
+        separators=(",", ":"),
+        default=json_default,
+    )
+
+
+def _cache_key():
+    args = tuple(sorted((k, v) for k, v in request.args.items(multi=True) if k != "profile"))
+    return request.path, args
+
+
+def _not_modified(version, weak=False):
+    """Bare 304 when the client already holds ``version``, checked before any serialization."""
+    etag = make_etag(version, weak)
+    if not matches_any_encoding(request.headers.get("If-None-Match"), etag):
+        return None
+    metrics.inc("http_conditional_responses_total", 1, {"result": "not_modified"})
+    return Response(status=304, headers={"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"})
+
+
+def _versioned_json(version, build, volatile=None):
+    """JSON response for data identified by ``version``, with ETag/304 and cached gzip.
+
+    ``build()`` returns the payload and runs only when no body is cached for
+    this route, query and version.  ``volatile`` fields are appended to every
+    response without invalidating the cached part (the ETag is then weak);
+    the payload must then be a dict.
+    """
+    weak = volatile is not None
+    response = _not_modified(version, weak)
+    if response is not None:
+        return response
+
+    def compile_body():
+        body = _dumps(build()).encode("utf-8")
+        return CompressedAsset(
+            body[:-1] if weak else body,
+            "application/json",
+            etag=make_etag(version, weak),
+            trailer=weak,
+        )
+
+    asset, hit = response_cache.get(_cache_key(), version, compile_body)
+    metrics.inc("http_conditional_responses_total", 1, {"result": "hit" if hit else "miss"})
+    trailer = b""
+    if weak:
+        # The cached prefix is the payload without its closing brace.
+        trailer = _dumps(volatile)[1:].encode("utf-8")
+        if volatile and asset.variants["identity"] != b"{":
+            trailer = b"," + trailer
+    status, body, headers = asset.select(request.headers, trailer)
+    return Response(body, status=status, headers=headers)
+
+
+def _int_arg(name):
+    value = request.args.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} 必须为整数") from None
 
 @app.route('/')
 def home():
-        # 简易落地页，前端直接调用同域 API
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        html = """
-        <!doctype html>
-        <html lang=zh-CN>
-            <head>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <title>市场舆情风险挖掘系统</title>
-                <style>
-                    @import url('https://fonts.googleapis.com/css2?family=Manrope:wght@400;600;700&display=swap');
-                    body {{ font-family: 'Manrope', 'Helvetica Neue', sans-serif; margin: 0; background: linear-gradient(180deg, #f4f6fb 0%, #f9fafc 60%, #ffffff 100%); color: #1f2a44; }}
-                    header {{ background: #0d6efd; color: #fff; padding: 16px 24px; box-shadow: 0 4px 12px rgba(0,0,0,0.08); }}
-                    h1 {{ margin: 0; font-size: 20px; letter-spacing: 0.4px; }}
-                    main {{ max-width: 1100px; margin: 24px auto; padding: 0 16px 32px; }}
-                    .card {{ background: #fff; border: 1px solid #e9ecef; border-radius: 10px; padding: 16px; margin-bottom: 16px; box-shadow: 0 6px 20px rgba(0,0,0,0.05); }}
-                    .btn {{ display: inline-block; padding: 9px 14px; border-radius: 8px; border: 1px solid #0d6efd; color: #0d6efd; background: #fff; cursor: pointer; font-weight: 600; transition: all 0.2s ease; }}
-                    .btn.primary {{ background: #0d6efd; color: #fff; border-color: #0d6efd; }}
-                    .btn:hover {{ transform: translateY(-1px); box-shadow: 0 6px 16px rgba(13,110,253,0.15); }}
-                    .grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }}
-                    .muted {{ color: #6c757d; font-size: 12px; }}
-                    ul {{ padding-left: 18px; }}
-                    li.risk {{ color: #c1121f; }}
-                    li.safe {{ color: #2b9348; }}
-                    textarea {{ width: 100%; min-height: 120px; font-family: inherit; border-radius: 8px; border: 1px solid #e2e6ea; padding: 10px; background: #fbfcfe; }}
-                    .footer {{ margin-top: 24px; color: #6c757d; font-size: 12px; text-align: center; }}
-                    .pill {{ display: inline-block; padding: 4px 8px; border-radius: 999px; font-size: 11px; background: #eef2ff; color: #0d6efd; margin-left: 6px; }}
-                    .stack {{ display: grid; gap: 8px; }}
-                </style>
-            </head>
-            <body>
-                <header>
-                    <h1>📈 市场舆情风险挖掘系统</h1>
-                    <div class="muted">服务时间：""" + current_time + """</div>
-                </header>
-                <main>
-                    <div class="grid">
-                        <section class="card">
-                            <h3>新闻列表 <span class="pill">实时情感</span></h3>
-                            <div class="stack">
-                                <button class="btn" id="loadNews">加载新闻</button>
-                                <small class="muted">点击新闻即可选中用于生成简报</small>
-                            </div>
-                            <ul id="newsList" style="margin-top: 12px;"></ul>
-                        </section>
-                        <section class="card">
-                            <h3>仪表盘</h3>
-                            <div class="stack">
-                                <button class="btn" id="loadDash">刷新统计</button>
-                                <div id="dash" class="muted">点击刷新统计数据</div>
-                            </div>
-                        </section>
-                    </div>
-
-                    <section class="card">
-                        <h3>自动预警 + 市场简报</h3>
-                        <div class="stack">
-                            <div class="muted">一键跑通：情感判别 → 风险报警 → 风险简报/市场速报。</div>
-                            <div style="display:flex; gap:8px; flex-wrap:wrap;">
-                                <button class="btn primary" id="runPipeline">一键检测+简报</button>
-                                <button class="btn" id="genBrief">仅对选中新闻生成简报</button>
-                            </div>
-                            <textarea id="briefOut" placeholder="生成的风险应对简报会显示在这里" readonly></textarea>
-                            <textarea id="marketReport" placeholder="市场风险速报将显示在这里" readonly></textarea>
-                        </div>
-                    </section>
-
-                    <section class="card">
-                        <h3>自动报警列表</h3>
-                        <div class="stack">
-                            <div class="muted">当情感为风险且置信度≥0.6时触发。</div>
-                            <ul id="alertsList" style="margin-top: 6px;"></ul>
-                        </div>
-                    </section>
-
-                    <section class="card">
-                        <h3>接口快速测试</h3>
-                        <ul>
-                            <li><a href="/api/news" target="_blank">/api/news</a> 获取新闻数据</li>
-                            <li><a href="/api/dashboard_data" target="_blank">/api/dashboard_data</a> 获取仪表盘数据</li>
-                            <li><a href="/api/pipeline" target="_blank">/api/pipeline</a> 一键跑全流程</li>
-                        </ul>
-                    </section>
-
-                    <div class="footer">Render 免费实例首次访问可能有唤醒延迟 30-60 秒。</div>
-                </main>
-
-                <script>
-                    const base = window.location.origin;
-                    let selectedNews = null;
-
-                    async function fetchJSON(url, opts) {{
-                        const res = await fetch(url, opts);
-                        if (!res.ok) throw new Error(`HTTP ${{res.status}}`);
-                        return await res.json();
-                    }}
-
-                    document.getElementById('loadNews').onclick = async () => {{
-                        const listEl = document.getElementById('newsList');
-                        listEl.innerHTML = '加载中...';
-                        try {{
-                            const data = await fetchJSON(`${{base}}/api/news`);
-                            listEl.innerHTML = '';
-                            if (!data || !data.length) {{
-                                listEl.innerHTML = '<li class="muted">暂无新闻数据</li>';
-                                return;
-                            }}
-                            data.forEach(item => {{
-                                const li = document.createElement('li');
-                                const isRisk = String(item.sentiment_label).includes('风险');
-                                li.className = isRisk ? 'risk' : 'safe';
-                                li.style.cursor = 'pointer';
-                                li.title = '点击选择用于生成简报';
-                                const badge = isRisk ? '⚠️' : '✅';
-                                const stock = item.stock_code ? ` ｜ ${{item.stock_code}}` : '';
-                                li.textContent = `${{badge}} ${{item.title}}${{stock}}`;
-                                li.onclick = () => {{ selectedNews = item; [...listEl.children].forEach(el => el.style.fontWeight='normal'); li.style.fontWeight='bold'; }}
-                                listEl.appendChild(li);
-                            }});
-                        }} catch (e) {{
-                            listEl.innerHTML = `<li class="risk">加载失败：${{e.message}}</li>`;
-                        }}
-                    }};
-
-                    document.getElementById('loadDash').onclick = async () => {{
-                        const dash = document.getElementById('dash');
-                        dash.textContent = '刷新中...';
-                        try {{
-                            const d = await fetchJSON(`${{base}}/api/dashboard_data`);
-                            dash.innerHTML = `总新闻：<b>${{d.total_news}}</b>；风险：<b>${{d.risk_news_count}}</b>；风险占比：<b>${{d.risk_ratio}}%</b>；警报：<b>${{d.alert_count}}</b><br/>高/中风险：<b>${{d.high_risk}}</b>/<b>${{d.medium_risk}}</b>；风险关键词命中：<b>${{d.keyword_hits}}</b><br/>最近更新时间：${{d.update_time}}`;
-                        }} catch (e) {{ dash.textContent = `加载失败：${{e.message}}`; }}
-                    }};
-
-                    document.getElementById('runPipeline').onclick = async () => {{
-                        const out = document.getElementById('briefOut');
-                        const report = document.getElementById('marketReport');
-                        const alerts = document.getElementById('alertsList');
-                        const dash = document.getElementById('dash');
-                        const listEl = document.getElementById('newsList');
-                        out.value = '生成中...';
-                        report.value = '生成中...';
-                        alerts.innerHTML = '检测中...';
-                        dash.textContent = '刷新中...';
-                        try {{
-                            const resp = await fetchJSON(`${{base}}/api/pipeline`);
-                            // 更新新闻
-                            listEl.innerHTML = '';
-                            resp.news.forEach(item => {{
-                                const li = document.createElement('li');
-                                const isRisk = item.is_risk;
-                                li.className = isRisk ? 'risk' : 'safe';
-                                li.style.cursor = 'pointer';
-                                const badge = isRisk ? '⚠️' : '✅';
-                                li.textContent = `${{badge}} ${{item.title}}`;
-                                li.onclick = () => {{ selectedNews = item; [...listEl.children].forEach(el => el.style.fontWeight='normal'); li.style.fontWeight='bold'; }}
-                                listEl.appendChild(li);
-                            }});
-                            // 更新仪表盘
-                            const d = resp.dashboard;
-                            dash.innerHTML = `总新闻：<b>${{d.total_news}}</b>；风险：<b>${{d.risk_news_count}}</b>；风险占比：<b>${{d.risk_ratio}}%</b>；警报：<b>${{d.alert_count}}</b><br/>高/中风险：<b>${{d.high_risk}}</b>/<b>${{d.medium_risk}}</b>；风险关键词命中：<b>${{d.keyword_hits}}</b><br/>最近更新时间：${{d.update_time}}`;
-                            // 报警
-                            alerts.innerHTML = '';
-                            if (!resp.alerts.length) {{
-                                alerts.innerHTML = '<li class="muted">暂无触发的警报</li>';
-                            }} else {{
-                                resp.alerts.forEach(a => {{
-                                    const li = document.createElement('li');
-                                    li.className = 'risk';
-                                    li.textContent = `⚠️ ${{a.title}} ｜ 置信度 ${{a.confidence}} ｜ 分数 ${{a.sentiment_score}}`;
-                                    alerts.appendChild(li);
-                                }});
-                            }}
-                            // 简报与市场速报
-                            out.value = resp.risk_brief || '未生成';
-                            report.value = resp.market_report || '未生成';
-                        }} catch (e) {{
-                            out.value = `生成失败：${{e.message}}`;
-                            report.value = '';
-                            alerts.innerHTML = `<li class="risk">流水线失败：${{e.message}}</li>`;
-                            dash.textContent = '流水线失败';
-                        }}
-                    }};
-
-                    document.getElementById('genBrief').onclick = async () => {{
-                        const out = document.getElementById('briefOut');
-                        if (!selectedNews) {{ out.value = '请先在左侧列表选择一条新闻（⚠️为风险新闻）'; return; }}
-                        out.value = '生成中...';
-                        try {{
-                            const body = {{ news_id: selectedNews.id, news_title: selectedNews.title, news_content: selectedNews.content || '' }};
-                            const resp = await fetchJSON(`${{base}}/api/generate_brief`, {{ method: 'POST', headers: {{ 'Content-Type': 'application/json' }}, body: JSON.stringify(body) }});
-                            out.value = `标题：${{resp.brief_title}}\n\n${{resp.brief_content}}\n\n生成时间：${{resp.generated_time}}`;
-                        }} catch (e) {{ out.value = `生成失败：${{e.message}}`; }}
-                    }};
-                </script>
-            </body>
-        </html>
-        """
-        return html
+    # 简易落地页，前端直接调用同域 API；启动时一次性读入并预压缩
+    status, body, headers = LANDING_PAGE.select(request.headers)
+    return Response(body, status=status, headers=headers)
 
 @app.route('/api/news', methods=['GET'])
 def get_news():
-    return jsonify(_current_news())
+    """News list with optional filters, offset/cursor pagination and ``fields`` projection.
+
+    ``format=ndjson`` streams one article per line; otherwise paginated
+    requests get an ``{"items", "total", "next_cursor", ...}`` envelope and
+    unpaginated ones the plain array (streamed when large).
+    """
+    corpus = load_corpus()
+    fields = parse_fields(request.args.get('fields'))
+    cursor = request.args.get('cursor')
+    try:
+        filters = _query_filters()
+        items = corpus["index"].select(**filters) if filters else corpus["processed"]
+        offset = decode_cursor(cursor) if cursor else (_int_arg('offset') or 0)
+        limit = _int_arg('limit')
+        page, next_offset = paginate(items, offset, limit)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    next_cursor = encode_cursor(next_offset) if next_offset is not None else None
+    version = corpus["version"]
+
+    ndjson = request.args.get('format') == 'ndjson'
+    if ndjson or len(page) > STREAM_THRESHOLD:
+        response = _not_modified(version)
+        if response is not None:
+            return response
+        headers = {"ETag": make_etag(version), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if not ndjson:
+            return Response(iter_json_array(project(page, fields), _dumps), mimetype='application/json', headers=headers)
+        headers["X-Total-Count"] = str(len(items))
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return Response(iter_ndjson(project(page, fields), _dumps), mimetype='application/x-ndjson', headers=headers)
+    if cursor or 'offset' in request.args or limit is not None:
+        return _versioned_json(version, lambda: {
+            "items": list(project(page, fields)),
+            "total": len(items),
+            "offset": offset,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        })
+    return _versioned_json(version, lambda: list(project(page, fields)))
 
 @app.route('/api/dashboard_data', methods=['GET'])
 def get_dashboard():
-    processed = _current_news()
-    dash = compute_dashboard(processed)
-    return jsonify(dash)
+    corpus = load_corpus()
+    try:
+        filters = _query_filters()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if not filters:
+        return _dashboard_json(corpus["version"], lambda: corpus["dashboard"])
+    return _dashboard_json(corpus["version"], lambda: corpus["index"].dashboard(**filters))
+
+def _dashboard_json(version, build):
+    """Dashboard cached per corpus version; ``update_time`` is per response, not frozen in the cache."""
+    def payload():
+        dashboard = dict(build())
+        dashboard.pop("update_time", None)
+        return dashboard
+    return _versioned_json(version, payload, volatile={"update_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+@app.route('/api/rollups', methods=['GET'])
+def get_rollups():
+    by = request.args.get('by', 'stock')
+    if by not in ('stock', 'industry'):
+        return jsonify({"error": "by 参数仅支持 stock 或 industry"}), 400
+    return jsonify(load_corpus()["index"].rollup(by))
+
+@app.route('/api/risk_series', methods=['GET'])
+def get_risk_series():
+    """Rolling 15m/1h/24h window metrics plus a per-minute or per-hour series."""
+    resolution = request.args.get('resolution', 'minute')
+    if resolution not in ('minute', 'hour'):
+        return jsonify({"error": "resolution 参数仅支持 minute 或 hour"}), 400
+    try:
+        points = min(max(_int_arg('points') or 60, 1), 24 * 60)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    stock_code = request.args.get('stock_code') or None
+    series = load_corpus()["timeseries"]
+    return jsonify({
+        "stock_code": stock_code,
+        "as_of": series.as_of(),
+        "windows": series.windows(stock_code),
+        "resolution": resolution,
+        "series": series.series(resolution, points, stock_code),
+    })
+
+def _brief_request(data):
+    """(stock_code, stock_name, articles) from a brief request body."""
+    news_title = data.get('news_title', '')
+    news_content = data.get('news_content', '')
+    stock_code = data.get('stock_code', '000000')
+    stock_name = data.get('stock_name', '自选标的')
+    articles = data.get('articles')
+    if not isinstance(articles, list):
+        articles = [f"{news_title} {news_content}".strip()] if (news_title or news_content) else [news_title]
+    return stock_code, stock_name, [str(a) for a in articles]
 
 @app.route('/api/generate_brief', methods=['POST'])
 def generate_brief():
     data = request.json if request.is_json else {}
     news_id = data.get('news_id', 1)
     news_title = data.get('news_title', '')
-    news_content = data.get('news_content', '')
-    stock_code = data.get('stock_code', '000000')
-    stock_name = data.get('stock_name', '自选标的')
-    articles = [f"{news_title} {news_content}".strip()] if (news_title or news_content) else [news_title]
-    brief_text = brief_generator.generate_risk_briefing(stock_code, stock_name, articles)
+    brief_title = f"关于「{news_title}」的风险应对简报"
+    job = brief_queue.submit(*_brief_request(data))
+    job = brief_queue.wait(job["job_id"], BRIEF_WAIT) or job
+    if job["status"] in ("queued", "running"):
+        # Slow model backends must not pin a request thread: hand back the job to poll.
+        return jsonify({
+            "news_id": news_id,
+            "brief_title": brief_title,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "poll": f"/api/briefs/{job['job_id']}",
+        }), 202
     return jsonify({
         "news_id": news_id,
-        "brief_title": f"关于「{news_title}」的风险应对简报",
-        "brief_content": brief_text,
+        "brief_title": brief_title,
+        "brief_content": brief_queue.briefing(job),
         "generated_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     })
 
+@app.route('/api/briefs', methods=['POST'])
+def submit_brief():
+    """Queue a brief; poll /api/briefs/<job_id> for the result."""
+    data = request.json if request.is_json else {}
+    job = brief_queue.submit(*_brief_request(data))
+    return jsonify(job), 202
+
+@app.route('/api/briefs/<job_id>', methods=['GET'])
+def brief_status(job_id):
+    job = brief_queue.status(job_id)
+    if job is None:
+        return jsonify({"error": "任务不存在或已过期", "job_id": job_id}), 404
+    return jsonify(job)
+
 
 @app.route('/api/pipeline', methods=['GET'])
 def pipeline_run():
-    result = run_pipeline()
-    return jsonify(result)
+    """Latest precomputed pipeline snapshot; ``refresh=1`` recomputes first."""
+    if os.getenv("PIPELINE_SCHEDULER", "1") != "0":
+        pipeline_scheduler.start()
+    if request.args.get("refresh") in ("1", "true"):
+        snapshot = pipeline_scheduler.refresh()
+    else:
+        snapshot = pipeline_scheduler.latest()
+    stale = pipeline_scheduler.is_stale(snapshot)
+    return _versioned_json(
+        repr((snapshot.signature, snapshot.generated_ts, stale)),
+        lambda: {**snapshot.result, "generated_at": snapshot.generated_at, "stale": stale},
+        volatile={"staleness_seconds": round(snapshot.age(), 1)},
+    )
+
+@app.route('/api/alerts/stream', methods=['GET'])
+def alerts_stream():
+    """Server-Sent Events: one ``alert`` event per newly ingested alert article.
+
+    New clients start from the current head; ``Last-Event-ID`` (or
+    ``last_event_id``) resumes after that event.  If events were dropped from
+    the retained ring in between, a ``gap`` event is sent first.
+    """
+    raw = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        cursor = int(raw) if raw not in (None, "") else alert_stream.last_id
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID 必须为整数"}), 400
+    if not alert_stream.subscribe():
+        return jsonify({"error": "订阅连接数已满，请稍后重试"}), 503
+    if os.getenv("PIPELINE_SCHEDULER", "1") != "0":
+        pipeline_scheduler.start()  # its polling is what ingests new crawler files
+
+    def events(cursor):
+        yield "retry: 3000\n\n"
+        while True:
+            batch, gap = alert_stream.events_after(cursor)
+            if gap:
+                resume = batch[0]["id"] - 1 if batch else alert_stream.last_id
+                yield format_sse(_dumps({"resume_from": resume}), event="gap")
+                cursor = resume
+            for item in batch:
+                yield format_sse(_dumps(item["alert"]), event_id=item["id"], event="alert")
+                cursor = item["id"]
+            if not batch and not gap and not alert_stream.wait(cursor, SSE_HEARTBEAT):
+                yield ": keepalive\n\n"
+
+    response = Response(
+        events(cursor),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Runs even if the client goes away before the first event is sent.
+    response.call_on_close(alert_stream.unsubscribe)
+    return response
+
 
 @app.route('/api/health', methods=['GET'])
 def health():
-    return jsonify({"status": "ok", "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+    model = sentiment_analyzer.model
+    return jsonify({
+        "status": "ok",
+        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        # "keywords" when no model is configured, else unloaded/loading/ready/failed
+        "sentiment_model": model.state if model is not None else "keywords",
+    })
 
 
 @app.route('/api/source_info', methods=['GET'])
 def source_info():
-    return jsonify(get_data_source_info())
+    corpus = load_corpus()
+
+    def build():
+        info = get_data_source_info(corpus)
+        del info["timestamp"]
+        return info
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return _versioned_json(corpus["version"], build, volatile={"timestamp": timestamp})
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_text():
+    """Prometheus text exposition of stage/endpoint latency, throughput and cache gauges."""
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.route('/api/metrics/profiles/<profile_id>', methods=['GET'])
+def metrics_profile(profile_id):
+    profile = metrics.get_profile(profile_id)
+    if profile is None:
+        return jsonify({"error": "profile 不存在"}), 404
+    return jsonify(profile)
 
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8000))
@@ -0,0 +1,5 @@
+"""
+Benchmarks for the market risk system.
+Run the suite with ``python -m benchmarks run`` or individual modules with
+``python -m benchmarks.<name>``.
+"""
@@ -0,0 +1,109 @@
+"""
+Benchmark suite runner
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.15
+
+``run`` writes stage and API timings as JSON; ``compare`` reports every
+median that got slower by more than ``threshold`` and exits non-zero if any did.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, Iterator, List, Tuple
+
+from benchmarks.timing import environment
+
+
+def run_suite(articles: int, repeat: int, requests: int, concurrency: int, api: bool = True, seed: int = 0) -> Dict:
+    from benchmarks.bench_stages import run_stages
+    from benchmarks.corpus import synthetic_corpus
+
+    corpus = synthetic_corpus(articles, seed)
+    report = {
+        "environment": environment(),
+        "params": {
+            "articles": articles, "repeat": repeat, "requests": requests,
+            "concurrency": concurrency, "seed": seed,
+        },
+        "stages": run_stages(corpus, repeat),
+    }
+    if api:
+        from benchmarks.bench_api import run_load
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "articles_bench.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(corpus, f, ensure_ascii=False)
+            os.environ["CRAWLER_JSON_PATH"] = path
+            report["endpoints"] = run_load(requests, concurrency)
+    return report
+
+
+def _medians(report: Dict) -> Iterator[Tuple[str, float]]:
+    for section in ("stages", "endpoints"):
+        for name, stats in report.get(section, {}).items():
+            yield f"{section}.{name}", stats["median_ms"]
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """One row per timing present in both reports; ``regressed`` if slower than threshold."""
+    before = dict(_medians(baseline))
+    rows = []
+    for name, after in _medians(current):
+        if name not in before:
+            continue
+        ratio = after / before[name] if before[name] else float("inf")
+        rows.append({
+            "name": name,
+            "baseline_ms": before[name],
+            "current_ms": after,
+            "ratio": round(ratio, 3),
+            "regressed": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Market risk benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run stage microbenchmarks and the API load test")
+    run.add_argument("--articles", type=int, default=5_000)
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--requests", type=int, default=200)
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--no-api", action="store_true", help="skip the endpoint load test")
+    run.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suite(args.articles, args.repeat, args.requests, args.concurrency, not args.no_api, args.seed)
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    print(json.dumps({"threshold": args.threshold, "results": rows}, ensure_ascii=False, indent=2))
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+In-process API load test
+Drives the Flask endpoints through the test client from several threads and
+reports per-endpoint latency percentiles and throughput.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+from benchmarks.corpus import synthetic_corpus
+from benchmarks.timing import environment, summarize
+
+os.environ.setdefault("PIPELINE_SCHEDULER", "0")  # keep background recomputes out of the numbers
+
+# (name, method, path, json body)
+ENDPOINTS: List[Tuple[str, str, str, Dict | None]] = [
+    ("news_page", "GET", "/api/news?limit=100", None),
+    ("news_full", "GET", "/api/news", None),
+    ("news_ndjson", "GET", "/api/news?format=ndjson&fields=title,stock_code,sentiment_label", None),
+    ("dashboard", "GET", "/api/dashboard_data", None),
+    ("dashboard_stock", "GET", "/api/dashboard_data?stock_code=600519.SH", None),
+    ("rollups", "GET", "/api/rollups?by=industry", None),
+    ("risk_series", "GET", "/api/risk_series", None),
+    ("pipeline", "GET", "/api/pipeline", None),
+    ("source_info", "GET", "/api/source_info", None),
+    ("generate_brief", "POST", "/api/generate_brief", {"news_title": "某公司业绩预警", "stock_code": "600519"}),
+]
+
+
+def run_load(
+    requests: int = 200,
+    concurrency: int = 4,
+    endpoints: Sequence[Tuple[str, str, str, Dict | None]] = ENDPOINTS,
+) -> Dict[str, Dict]:
+    """Issue ``requests`` calls per endpoint over ``concurrency`` threads."""
+    from app import app  # imported late so the environment above applies
+
+    local = threading.local()
+
+    def call(method: str, path: str, body: Dict | None) -> Tuple[float, int]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        start = time.perf_counter()
+        resp = client.open(path, method=method, json=body)
+        resp.get_data()  # drain streamed responses
+        return time.perf_counter() - start, resp.status_code
+
+    results: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, method, path, body in endpoints:
+            call(method, path, body)  # warm up caches and snapshots
+            start = time.perf_counter()
+            outcomes = list(pool.map(lambda _: call(method, path, body), range(requests)))
+            wall = time.perf_counter() - start
+            stats = summarize([elapsed for elapsed, _ in outcomes])
+            stats["errors"] = sum(1 for _, status in outcomes if status >= 400)
+            stats["requests_per_s"] = round(requests / wall, 1)
+            results[name] = stats
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=5_000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "articles_bench.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(synthetic_corpus(args.articles, args.seed), f, ensure_ascii=False)
+        os.environ["CRAWLER_JSON_PATH"] = path
+        report = {
+            "environment": environment(),
+            "params": vars(args),
+            "endpoints": run_load(args.requests, args.concurrency),
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
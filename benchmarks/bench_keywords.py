@@ -0,0 +1,59 @@
+"""
+Keyword matching microbenchmark
+Compares per-keyword substring scans with the compiled Aho-Corasick matcher
+on the bundled crawler data and checks that both give identical counts.
+"""
+
+import glob
+import json
+import os
+import timeit
+from typing import List
+
+from services.sentiment import SentimentAnalyzer
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def load_texts() -> List[str]:
+    texts = []
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, "data", "articles_600519_*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                texts.append(f"{item.get('title', '')} {item.get('content', '')}".lower())
+    return texts
+
+
+def scan_counts(analyzer: SentimentAnalyzer, text: str):
+    """Reference implementation: one substring scan per keyword."""
+    return (
+        sum(1 for w in analyzer.risk_keywords if w in text),
+        sum(1 for w in analyzer.positive_keywords if w in text),
+        sum(1 for w in analyzer.neutral_keywords if w in text),
+    )
+
+
+def main(repeat: int = 20) -> None:
+    analyzer = SentimentAnalyzer()
+    matcher = analyzer.matcher
+    texts = load_texts()
+    # Overlapping terms must not change the counts.
+    texts += ["跌停板", "降价潮来了，跌停", "暴雷踩雷黑天鹅，降价降价潮"]
+
+    for text in texts:
+        expected = scan_counts(analyzer, text)
+        actual = matcher.count(text)
+        assert actual == expected, (text, actual, expected)
+
+    scan = min(timeit.repeat(lambda: [scan_counts(analyzer, t) for t in texts], number=repeat, repeat=3))
+    compiled = min(timeit.repeat(lambda: [matcher.count(t) for t in texts], number=repeat, repeat=3))
+    per_scan = scan / (repeat * len(texts)) * 1e6
+    per_compiled = compiled / (repeat * len(texts)) * 1e6
+    print(f"texts: {len(texts)}  patterns: {len(matcher.patterns)}")
+    print(f"substring scans : {per_scan:8.2f} us/text")
+    print(f"aho-corasick    : {per_compiled:8.2f} us/text")
+    print(f"speedup         : {per_scan / per_compiled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
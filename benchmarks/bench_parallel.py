@@ -0,0 +1,50 @@
+"""
+Parallel scoring benchmark
+Scores a synthetic corpus serially and on process pools of 1/2/4/8 workers.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.corpus import synthetic_corpus
+from services.sentiment import SentimentAnalyzer
+
+
+def run(analyzer: SentimentAnalyzer, texts, titles):
+    start = time.perf_counter()
+    scores = analyzer.score_batch(texts, titles)
+    return time.perf_counter() - start, scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.articles)
+    texts = [a["content"] for a in corpus]
+    titles = [a["title"] for a in corpus]
+
+    analyzer = SentimentAnalyzer()  # no result cache: measure matching only
+    baseline, expected = run(analyzer, texts, titles)
+    print(f"articles: {len(corpus)}  chunk_size: {args.chunk_size}")
+    print(f"serial    : {baseline:7.3f}s  {len(corpus) / baseline:10.0f} articles/s")
+    for workers in args.workers:
+        analyzer.enable_parallel(workers=workers, chunk_size=args.chunk_size)
+        run(analyzer, texts[: workers * args.chunk_size * 2], titles)  # warm up the pool
+        elapsed, scores = run(analyzer, texts, titles)
+        assert np.array_equal(scores.score, expected.score)
+        assert np.array_equal(scores.label, expected.label)
+        print(
+            f"{workers} workers : {elapsed:7.3f}s  {len(corpus) / elapsed:10.0f} articles/s"
+            f"  speedup {baseline / elapsed:5.2f}x"
+        )
+        analyzer.disable_parallel()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Pipeline stage microbenchmarks
+Times load, normalize, analyze, dashboard and brief on a synthetic corpus.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Dict, List
+
+from benchmarks.corpus import synthetic_corpus
+from benchmarks.timing import environment, measure
+from services.aggregator import RiskAggregator
+from services.brief import BriefGenerator
+from services.jsonstream import iter_json_records
+from services import pipeline
+from services.pipeline import _normalize_article, analyze_news, generate_alerts, iter_news
+from services.sentiment import sentiment_analyzer
+
+
+def run_stages(corpus: List[Dict], repeat: int = 5) -> Dict[str, Dict]:
+    """Per-stage timings over ``corpus`` (crawler-style dicts)."""
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "articles_bench.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(corpus, f, ensure_ascii=False)
+
+        results["load"] = measure(lambda: sum(1 for _ in iter_json_records(path)), repeat)
+        results["normalize"] = measure(
+            lambda: [_normalize_article(item, idx) for idx, item in enumerate(corpus, 1)], repeat
+        )
+        results["load_normalize"] = measure(lambda: list(iter_news(path)), repeat)
+        news = list(iter_news(path))
+
+    cache = sentiment_analyzer.result_cache
+
+    def cold() -> None:
+        if cache is not None:
+            cache.clear()
+        if pipeline.near_duplicates is not None:
+            pipeline.near_duplicates.clear()
+
+    results["analyze"] = measure(lambda: analyze_news(item.copy() for item in news), repeat, setup=cold)
+    processed = analyze_news(item.copy() for item in news)
+    if cache is not None or pipeline.near_duplicates is not None:
+        results["analyze_cached"] = measure(lambda: analyze_news(item.copy() for item in news), repeat)
+
+    results["dashboard"] = measure(lambda: RiskAggregator(processed).dashboard(), repeat)
+    results["alerts"] = measure(lambda: generate_alerts(processed), repeat)
+
+    aggregator = RiskAggregator(processed)
+    risk_articles = aggregator.risk_articles()
+    summary = aggregator.summary()
+    generator = BriefGenerator(use_mock=True)
+    results["brief"] = measure(
+        lambda: generator.generate_risk_briefing("000000", "市场组合", risk_articles), repeat
+    )
+    results["market_report"] = measure(
+        lambda: generator.generate_market_report(processed, summary=summary), repeat
+    )
+    for name, stats in results.items():
+        stats["articles"] = len(corpus)
+        stats["articles_per_s"] = round(len(corpus) / (stats["median_ms"] / 1000.0)) if stats["median_ms"] else None
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = {
+        "environment": environment(),
+        "params": vars(args),
+        "stages": run_stages(synthetic_corpus(args.articles, args.seed), args.repeat),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Synthetic corpus generator
+Builds large article lists seeded from the bundled crawler data and SEED_NEWS.
+"""
+
+import glob
+import json
+import os
+import random
+from typing import Dict, List
+
+from services.pipeline import SEED_NEWS
+from services.sentiment import SentimentAnalyzer
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def seed_articles() -> List[Dict]:
+    """Articles from data/articles_*.json plus SEED_NEWS."""
+    articles = [dict(item) for item in SEED_NEWS]
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, "data", "articles_*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            articles.extend(item for item in json.load(f) if isinstance(item, dict))
+    return articles
+
+
+def synthetic_corpus(n: int, seed: int = 0) -> List[Dict]:
+    """Return ``n`` crawler-style articles mixing seed text and lexicon words."""
+    rng = random.Random(seed)
+    seeds = seed_articles()
+    analyzer = SentimentAnalyzer()
+    words = list(analyzer.risk_keywords + analyzer.positive_keywords + analyzer.neutral_keywords)
+    corpus = []
+    for i in range(n):
+        base = rng.choice(seeds)
+        other = rng.choice(seeds)
+        extra = "".join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+        title = base.get("title") or ""
+        content = f"{base.get('content') or title}{extra}{other.get('content') or ''}"
+        corpus.append({
+            "title": title,
+            "content": content,
+            "source": base.get("source", "东方财富"),
+            "publish_time": base.get("publish_time", "2026-01-16T00:00:00"),
+            "stock_code": base.get("stock_code", "000000"),
+            "stock_name": base.get("stock_name", ""),
+            "stock_industry": base.get("stock_industry", "未知"),
+            "url": f"synthetic://{seed}/{i}",
+        })
+    return corpus
@@ -0,0 +1,60 @@
+"""
+Timing helpers shared by the benchmark modules.
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def summarize(samples: Sequence[float]) -> Dict:
+    """Seconds -> min/median/mean/p95/p99/max in milliseconds."""
+    arr = np.asarray(samples, dtype=np.float64) * 1000.0
+    return {
+        "runs": int(arr.size),
+        "min_ms": round(float(arr.min()), 3),
+        "median_ms": round(float(np.median(arr)), 3),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, setup: Callable[[], object] | None = None) -> Dict:
+    """Run ``fn`` ``repeat`` times (``setup`` untimed before each run)."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def environment() -> Dict:
+    """Where the numbers came from, so result files can be compared across commits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
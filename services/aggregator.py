@@ -0,0 +1,158 @@
+"""
+Risk aggregation
+Single-pass, incrementally updatable dashboard counters, alerts and brief summary.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+
+class RiskAggregator:
+    """Maintains every corpus-level metric the API serves.
+
+    Articles are consumed once via ``add``; ``remove`` undoes an earlier
+    ``add`` and must receive the same object.  Updating a refreshed corpus
+    therefore costs O(delta) instead of re-walking all articles.
+
+    Articles sharing a ``cluster_id`` (near-duplicates) count as one story:
+    alerts and risk titles list each story once with its cluster size as
+    weight, while the article counts stay weighted by cluster size.
+    """
+
+    def __init__(self, articles: Iterable[Dict] = ()):
+        self.clear()
+        for article in articles:
+            self.add(article)
+
+    def clear(self) -> None:
+        self.total = 0
+        self.risk_count = 0
+        self.risk_confidence = 0.0
+        self.alert_count = 0
+        self.high_risk = 0
+        self.medium_risk = 0
+        self.keyword_hits = 0
+        self.stocks: Counter = Counter()
+        self.industries: Counter = Counter()
+        # story -> member count, for all / risk / alert articles
+        self.stories: Counter = Counter()
+        self.risk_stories: Counter = Counter()
+        self.alert_stories: Counter = Counter()
+        # id(article) -> (article, value); holding the article keeps its id unique.
+        self._alerts: Dict[int, tuple] = {}
+        self._risk_titles: Dict[int, tuple] = {}
+
+    def add(self, article: Dict) -> None:
+        self._apply(article, 1)
+
+    def remove(self, article: Dict) -> None:
+        self._apply(article, -1)
+
+    def _apply(self, article: Dict, sign: int) -> None:
+        self.total += sign
+        score = article.get("sentiment_score", 0)
+        if score < -0.5:
+            self.high_risk += sign
+        elif score < -0.2:
+            self.medium_risk += sign
+        self.keyword_hits += sign * article.get("keyword_counts", {}).get("risk", 0)
+        if article.get("stock_code"):
+            self.stocks[article["stock_code"]] += sign
+        if article.get("stock_industry"):
+            self.industries[article["stock_industry"]] += sign
+        key = id(article)
+        story = _story(article)
+        _count(self.stories, story, sign)
+        if article.get("is_risk"):
+            _count(self.risk_stories, story, sign)
+            self.risk_count += sign
+            self.risk_confidence += sign * article.get("confidence", 0)
+            if sign > 0:
+                self._risk_titles[key] = (article, article["title"])
+            else:
+                self._risk_titles.pop(key, None)
+        if article.get("alert"):
+            _count(self.alert_stories, story, sign)
+            self.alert_count += sign
+            if sign > 0:
+                self._alerts[key] = (article, alert_entry(article))
+            else:
+                self._alerts.pop(key, None)
+
+    def dashboard(self) -> Dict:
+        total = self.total
+        risk_count = self.risk_count
+        return {
+            "total_news": total,
+            "risk_news_count": risk_count,
+            "risk_ratio": round((risk_count / total) * 100, 1) if total else 0,
+            "avg_confidence": round(self.risk_confidence / risk_count, 3) if risk_count else 0,
+            "alert_count": self.alert_count,
+            "high_risk": self.high_risk,
+            "medium_risk": self.medium_risk,
+            "keyword_hits": int(self.keyword_hits),
+            "unique_stories": len(self.stories),
+            "risk_stories": len(self.risk_stories),
+            "alert_stories": len(self.alert_stories),
+            "duplicate_ratio": round((total - len(self.stories)) / total * 100, 1) if total else 0,
+            "update_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def alerts(self) -> List[Dict]:
+        """One entry per story (its earliest alert article) with ``cluster_size``."""
+        seen = set()
+        entries = []
+        for article, entry in self._alerts.values():
+            story = _story(article)
+            if story in seen:
+                continue
+            seen.add(story)
+            entries.append(dict(entry, cluster_size=self.stories[story]))
+        return entries
+
+    def risk_articles(self) -> List[str]:
+        seen = set()
+        titles = []
+        for article, title in self._risk_titles.values():
+            story = _story(article)
+            if story not in seen:
+                seen.add(story)
+                titles.append(title)
+        return titles
+
+    def summary(self) -> Dict:
+        """Counts in the shape ``BriefGenerator._summarize_risk_data`` returns."""
+        return {
+            "total": self.total,
+            "high_risk": self.high_risk,
+            "medium_risk": self.medium_risk,
+            "low_risk": self.total - self.high_risk - self.medium_risk,
+            "stocks": [code for code, n in self.stocks.items() if n > 0],
+            "industries": [name for name, n in self.industries.items() if n > 0],
+        }
+
+
+def _story(article: Dict):
+    """Near-duplicate cluster of ``article``, or the article itself if unclustered."""
+    cluster = article.get("cluster_id")
+    return ("cluster", cluster) if cluster is not None else id(article)
+
+
+def _count(counter: Counter, key, sign: int) -> None:
+    counter[key] += sign
+    if counter[key] <= 0:
+        del counter[key]
+
+
+def alert_entry(article: Dict) -> Dict:
+    return {
+        "id": article["id"],
+        "title": article["title"],
+        "stock_code": article.get("stock_code"),
+        "confidence": article.get("confidence"),
+        "sentiment_score": article.get("sentiment_score"),
+        "publish_time": article.get("publish_time"),
+    }
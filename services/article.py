@@ -0,0 +1,161 @@
+"""
+Article records
+Compact ``__slots__`` representation of analyzed articles.  Records are
+read like dicts throughout the pipeline and only turned into real dicts
+(``to_dict``) when serialized at the API boundary.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, Iterator, Tuple
+
+# Fields of a normalized crawler article (the shape ``_normalize_article`` returns).
+NEWS_FIELDS = (
+    "id", "title", "content", "source", "publish_time",
+    "stock_code", "stock_name", "stock_industry", "url",
+)
+# Per-article sentiment, as a plain tuple in this order (see ``BatchScores.sentiment``).
+SENTIMENT_FIELDS = (
+    "success", "sentiment_score", "sentiment_label", "confidence",
+    "keyword_risk", "keyword_positive", "keyword_neutral", "method", "analysis_time",
+)
+# Low-cardinality strings shared by many articles; interned so each is stored once.
+_INTERNED = ("source", "stock_code", "stock_name", "stock_industry")
+# Result of scoring an empty text.
+EMPTY_ERROR = "输入文本为空"
+# ``text`` is a preview of the lowercased title+content, cut at this many characters.
+TEXT_PREVIEW = 100
+
+Sentiment = Tuple[bool, float, str, float, int, int, int, str, str]
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class Article:
+    """One analyzed article.
+
+    ``keyword_counts`` and the ``text`` preview are derived on access instead
+    of stored, and fields left as None (``error``, ``cluster_id``, news
+    fields the input lacked) count as absent, so a record serializes to
+    exactly the dict ``analyze_news`` used to build.
+    Supports the read side of the dict interface (``a["title"]``,
+    ``a.get(...)``, ``in``, ``keys()``, ``dict(a)``) plus item assignment
+    of stored fields.
+    """
+
+    __slots__ = NEWS_FIELDS + SENTIMENT_FIELDS + ("error", "cluster_id", "is_risk", "alert", "score_bucket")
+
+    def __init__(self, news: Dict, sentiment: Sentiment, cluster_id: int | None = None):
+        for name in NEWS_FIELDS:
+            setattr(self, name, news.get(name))
+        for name in _INTERNED:
+            setattr(self, name, _intern(getattr(self, name)))
+        (
+            self.success, self.sentiment_score, self.sentiment_label, self.confidence,
+            self.keyword_risk, self.keyword_positive, self.keyword_neutral,
+            self.method, self.analysis_time,
+        ) = sentiment
+        self.error = None if self.success else EMPTY_ERROR
+        self.cluster_id = cluster_id
+        self.is_risk = False
+        self.alert = False
+        self.score_bucket = None
+
+    @property
+    def keyword_counts(self) -> Dict[str, int]:
+        return {
+            "risk": self.keyword_risk,
+            "positive": self.keyword_positive,
+            "neutral": self.keyword_neutral,
+            "total": self.keyword_risk + self.keyword_positive + self.keyword_neutral,
+        }
+
+    @property
+    def text(self) -> str:
+        if not self.success:
+            return ""
+        text = f"{self.title} {self.content}".lower()
+        return text[:TEXT_PREVIEW] + "..." if len(text) > TEXT_PREVIEW else text
+
+    def keys(self) -> Iterator[str]:
+        for name in NEWS_FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        yield "success"
+        yield "text"
+        yield "sentiment_score"
+        yield "sentiment_label"
+        yield "confidence"
+        yield "keyword_counts"
+        yield "method"
+        if self.error is not None:
+            yield "error"
+        yield "analysis_time"
+        if self.cluster_id is not None:
+            yield "cluster_id"
+        yield "is_risk"
+        yield "alert"
+        yield "score_bucket"
+
+    __iter__ = keys
+
+    def __contains__(self, key: object) -> bool:
+        if key in _OPTIONAL:
+            return getattr(self, key) is not None
+        return key in _KEYS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in _INTERNED else value)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = {name: value for name in NEWS_FIELDS if (value := getattr(self, name)) is not None}
+        row["success"] = self.success
+        row["text"] = self.text
+        row["sentiment_score"] = self.sentiment_score
+        row["sentiment_label"] = self.sentiment_label
+        row["confidence"] = self.confidence
+        row["keyword_counts"] = self.keyword_counts
+        row["method"] = self.method
+        if self.error is not None:
+            row["error"] = self.error
+        row["analysis_time"] = self.analysis_time
+        if self.cluster_id is not None:
+            row["cluster_id"] = self.cluster_id
+        row["is_risk"] = self.is_risk
+        row["alert"] = self.alert
+        row["score_bucket"] = self.score_bucket
+        return row
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: tuple) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, title={self.title!r}, sentiment_label={self.sentiment_label!r})"
+
+
+_OPTIONAL = frozenset(NEWS_FIELDS + ("error", "cluster_id"))
+_KEYS = frozenset(Article.__slots__) - {"keyword_risk", "keyword_positive", "keyword_neutral"} | {"keyword_counts", "text"}
+
+
+def json_default(obj: Any) -> Any:
+    """``default=`` hook for ``json.dumps`` that serializes ``Article`` records."""
+    if isinstance(obj, Article):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
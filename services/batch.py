@@ -0,0 +1,161 @@
+"""
+Batch scoring results
+Columnar container for sentiment scores computed over many articles at once.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence
+
+import numpy as np
+
+# Label code -> label text; codes are what the ``label`` column stores.
+LABELS = ("中性", "风险", "正面")
+LABEL_NEUTRAL, LABEL_RISK, LABEL_POSITIVE = 0, 1, 2
+
+
+def score_counts(risk: np.ndarray, positive: np.ndarray, neutral: np.ndarray, weight: np.ndarray | None = None):
+    """Vectorized keyword scoring; returns (score, label, confidence) arrays.
+
+    ``weight`` is the summed score weight of each text's hits, for lexicons
+    with per-keyword weights; the default is 1.0 / 0.0 / -1.5 per hit.
+    """
+    total = risk + positive + neutral
+    hit = total > 0
+    safe_total = np.where(hit, total, 1)
+    if weight is None:
+        weight = positive * 1.0 + neutral * 0.0 - risk * 1.5
+    score = np.where(hit, weight / safe_total, 0.0)
+    score = np.clip(score, -1.0, 1.0)
+    confidence = np.where(hit, np.minimum(0.95, 0.6 + np.minimum(total, 5) * 0.08), 0.5)
+    label = np.full(len(score), LABEL_NEUTRAL, dtype=np.int8)
+    label[score < -0.3] = LABEL_RISK
+    label[score > 0.3] = LABEL_POSITIVE
+    return score, label, confidence
+
+
+def score_probs(probs: np.ndarray):
+    """(score, label, confidence) from ``(n, 3)`` model probabilities in ``LABELS`` order."""
+    score = (probs[:, LABEL_POSITIVE] - probs[:, LABEL_RISK]).astype(np.float64)
+    label = probs.argmax(axis=1).astype(np.int8)
+    confidence = probs.max(axis=1).astype(np.float64)
+    return score, label, confidence
+
+
+class BatchScores:
+    """Sentiment results for N articles stored as NumPy columns.
+
+    Scores come from the keyword counts, or from model class probabilities
+    when ``probs`` is given.  Per-article dicts (the shape
+    ``SentimentAnalyzer.analyze`` returns) are only built when indexed or
+    iterated, typically right before serialization.
+    """
+
+    def __init__(
+        self,
+        texts: Sequence[str],
+        risk: np.ndarray,
+        positive: np.ndarray,
+        neutral: np.ndarray,
+        success: np.ndarray,
+        analysis_time: str | None = None,
+        probs: np.ndarray | None = None,
+        method: str = "keyword_matching",
+        weight: np.ndarray | None = None,
+    ):
+        self.texts = texts
+        self.risk = risk
+        self.positive = positive
+        self.neutral = neutral
+        self.success = success
+        self.method = method
+        if probs is None:
+            self.score, self.label, self.confidence = score_counts(risk, positive, neutral, weight)
+        else:
+            self.score, self.label, self.confidence = score_probs(probs)
+        # Empty inputs keep the analyzer's "empty result" values.
+        self.score[~success] = 0.0
+        self.label[~success] = LABEL_NEUTRAL
+        self.confidence[~success] = 0.0
+        # Rows rescored by ``escalate``; they report ``escalated_method``.
+        self.escalated = np.zeros(len(texts), dtype=bool)
+        self.escalated_method = method
+        self.analysis_time = analysis_time or datetime.now().isoformat()
+
+    def escalate(self, rows: np.ndarray, probs: np.ndarray, method: str) -> None:
+        """Replace the scores of ``rows`` with model probabilities (see ``cascade``)."""
+        self.score[rows], self.label[rows], self.confidence[rows] = score_probs(probs)
+        self.escalated[rows] = True
+        self.escalated_method = method
+
+    def method_of(self, i: int) -> str:
+        return self.escalated_method if self.escalated[i] else self.method
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.risk + self.positive + self.neutral
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.record(i)
+
+    def records(self) -> List[Dict]:
+        return [self.record(i) for i in range(len(self))]
+
+    def sentiment(self, i: int) -> tuple:
+        """Row ``i`` as a compact tuple in ``article.SENTIMENT_FIELDS`` order."""
+        if not self.success[i]:
+            return (False, 0.0, "中性", 0.0, 0, 0, 0, "none", self.analysis_time)
+        return (
+            True,
+            round(float(self.score[i]), 3),
+            LABELS[self.label[i]],
+            round(float(self.confidence[i]), 3),
+            int(self.risk[i]),
+            int(self.positive[i]),
+            int(self.neutral[i]),
+            self.method_of(i),
+            self.analysis_time,
+        )
+
+    def label_text(self, i: int) -> str:
+        return LABELS[self.label[i]]
+
+    def record(self, i: int) -> Dict:
+        """Build the per-article result dict for row ``i``."""
+        if not self.success[i]:
+            return {
+                "success": False,
+                "text": "",
+                "sentiment_score": 0.0,
+                "sentiment_label": "中性",
+                "confidence": 0.0,
+                "keyword_counts": {"risk": 0, "positive": 0, "neutral": 0, "total": 0},
+                "method": "none",
+                "error": "输入文本为空",
+                "analysis_time": self.analysis_time,
+            }
+        text = self.texts[i]
+        risk, positive, neutral = int(self.risk[i]), int(self.positive[i]), int(self.neutral[i])
+        return {
+            "success": True,
+            "text": text[:100] + "..." if len(text) > 100 else text,
+            "sentiment_score": round(float(self.score[i]), 3),
+            "sentiment_label": LABELS[self.label[i]],
+            "confidence": round(float(self.confidence[i]), 3),
+            "keyword_counts": {
+                "risk": risk,
+                "positive": positive,
+                "neutral": neutral,
+                "total": risk + positive + neutral,
+            },
+            "method": self.method_of(i),
+            "analysis_time": self.analysis_time,
+        }
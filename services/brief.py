@@ -1,19 +1,35 @@
 """
 Brief generation service
-Uses mock LLM logic to produce concise risk briefings and market reports.
+Uses mock LLM logic (or an OpenAI-compatible chat endpoint) to produce
+concise risk briefings and market reports.
 """
 
+from __future__ import annotations
+
+import json
 import logging
+import os
+import urllib.request
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Sequence
 
 logger = logging.getLogger(__name__)
 
 
 class BriefGenerator:
-    def __init__(self, use_mock: bool = True):
+    def __init__(
+        self,
+        use_mock: bool = True,
+        api_base: str | None = None,
+        api_key: str | None = None,
+        model_name: str | None = None,
+        timeout: float = 30.0,
+    ):
         self.use_mock = use_mock
-        self.model_name = "mock" if use_mock else "gpt-3.5-turbo"
+        self.model_name = "mock" if use_mock else (model_name or "gpt-3.5-turbo")
+        self.api_base = (api_base or "https://api.openai.com/v1").rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
         self.status = {
             "use_mock": use_mock,
             "model_name": self.model_name,
@@ -27,21 +43,35 @@ class BriefGenerator:
         stock_name: str,
         risk_articles: List[str],
         additional_context: str = "",
+        raise_errors: bool = False,
     ) -> str:
+        """Generate a briefing; failures yield an error briefing unless ``raise_errors``."""
         try:
-            briefing = self._generate_mock_briefing(stock_code, stock_name, risk_articles)
+            if self.use_mock:
+                briefing = self._generate_mock_briefing(stock_code, stock_name, risk_articles)
+            else:
+                briefing = self._generate_model_briefing(stock_code, stock_name, risk_articles, additional_context)
             self.status["generated_count"] += 1
             self.status["last_generated"] = datetime.now().isoformat()
             return briefing
         except Exception as exc:  # pragma: no cover
             logger.error("生成风险简报失败: %s", exc)
+            if raise_errors:
+                raise
             return self._generate_error_briefing(stock_code, stock_name, str(exc))
 
-    def generate_market_report(self, risk_data: List[Dict], market_context: str = "") -> str:
-        summary = self._summarize_risk_data(risk_data)
+    def generate_market_report(
+        self,
+        risk_data: Sequence[Mapping[str, Any]],
+        market_context: str = "",
+        summary: Dict | None = None,
+    ) -> str:
+        """Build the market report; a precomputed ``summary`` skips re-scanning ``risk_data``."""
+        if summary is None:
+            summary = self._summarize_risk_data(risk_data)
         return self._generate_mock_market_report(summary, market_context)
 
-    def _summarize_risk_data(self, risk_data: List[Dict]) -> Dict:
+    def _summarize_risk_data(self, risk_data: Sequence[Mapping[str, Any]]) -> Dict:
         if not risk_data:
             return {"total": 0, "high_risk": 0, "medium_risk": 0, "low_risk": 0, "stocks": [], "industries": []}
         summary = {"total": len(risk_data), "high_risk": 0, "medium_risk": 0, "low_risk": 0, "stocks": set(), "industries": set()}
@@ -92,11 +122,41 @@ class BriefGenerator:
             "【自动生成，供风控参考】"
         )
 
+    def _generate_model_briefing(
+        self,
+        stock_code: str,
+        stock_name: str,
+        risk_articles: List[str],
+        additional_context: str,
+    ) -> str:
+        """Ask an OpenAI-compatible /chat/completions endpoint for the briefing."""
+        articles = "\n".join(f"- {a}" for a in risk_articles) or "- （无）"
+        prompt = (
+            f"请为股票 {stock_name}（{stock_code}）撰写一份《市场风险应对简报》，"
+            f"包含风险等级、主要风险点、建议与监控要点。\n相关风险文章：\n{articles}"
+        )
+        if additional_context:
+            prompt += f"\n补充信息：{additional_context}"
+        body = json.dumps({
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": "你是一名证券公司风控分析师。"},
+                {"role": "user", "content": prompt},
+            ],
+        }).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        req = urllib.request.Request(f"{self.api_base}/chat/completions", data=body, headers=headers)
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            payload = json.load(resp)
+        return payload["choices"][0]["message"]["content"]
+
     def _generate_mock_market_report(self, summary: Dict, market_context: str) -> str:
         now = datetime.now().strftime("%Y年%m月%d日 %H:%M")
         return (
             f"《市场风险速报》\n生成时间：{now}\n"
-            f"监测窗口：24h；风险事件：{summary.get('total', 0)} 起\n"
+            f"{self._format_window(summary)}；风险事件：{summary.get('total', 0)} 起\n"
             f"高/中/低风险：{summary.get('high_risk',0)}/{summary.get('medium_risk',0)}/{summary.get('low_risk',0)}\n"
             f"涉及股票：{', '.join(summary.get('stocks', [])) or '—'}；行业：{', '.join(summary.get('industries', [])) or '—'}\n\n"
             "情绪观察：避险情绪升温，风险偏好下降；需防范短期放量下挫。\n"
@@ -105,6 +165,16 @@ class BriefGenerator:
             "【自动生成，供内部风控参考】"
         )
 
+    @staticmethod
+    def _format_window(summary: Dict) -> str:
+        window = summary.get("window")
+        if not window:
+            return "监测窗口：24h"
+        return (
+            f"监测窗口：{window.get('label', '24h')}（新闻 {window.get('articles', 0)} 条，"
+            f"风险占比 {window.get('risk_ratio', 0)}%，报警 {window.get('alerts', 0)} 条）"
+        )
+
     def _generate_error_briefing(self, stock_code: str, stock_name: str, error_msg: str) -> str:
         now = datetime.now().strftime("%Y年%m月%d日 %H:%M")
         return (
@@ -113,4 +183,18 @@ class BriefGenerator:
         )
 
 
-brief_generator = BriefGenerator(use_mock=True)
+def _default_brief_generator() -> BriefGenerator:
+    """Mock generator unless BRIEF_API_BASE points at an OpenAI-compatible server."""
+    api_base = os.getenv("BRIEF_API_BASE")
+    if not api_base:
+        return BriefGenerator(use_mock=True)
+    return BriefGenerator(
+        use_mock=False,
+        api_base=api_base,
+        api_key=os.getenv("BRIEF_API_KEY"),
+        model_name=os.getenv("BRIEF_MODEL"),
+        timeout=float(os.getenv("BRIEF_TIMEOUT", "30")),
+    )
+
+
+brief_generator = _default_brief_generator()
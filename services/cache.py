@@ -0,0 +1,104 @@
+"""
+Result cache
+Bounded LRU cache for per-article sentiment results, optionally persisted to disk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Thread-safe LRU mapping keyed on content hashes.
+
+    Keys come from ``make_key`` and already include the keyword-list
+    fingerprint, so entries computed with an older lexicon are simply never
+    hit again and age out instead of requiring a flush.
+    """
+
+    def __init__(self, max_size: int = 50_000, path: str | None = None):
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load()
+
+    @staticmethod
+    def make_key(fingerprint: str, text: str) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16, key=fingerprint.encode("utf-8")[:64])
+        return digest.hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def load(self) -> None:
+        """Load persisted entries from ``path``; a missing or bad file is ignored."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if not isinstance(entries, list):
+                raise ValueError("缓存文件应为 [key, value] 列表")
+            loaded = {key: tuple(value) for key, value in entries[-self.max_size:]}
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("情感结果缓存加载失败 %s: %s", self.path, exc)
+            return
+        with self._lock:
+            self._data.update(loaded)
+
+    def save(self) -> None:
+        """Write entries to ``path`` in LRU order (oldest first)."""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [[key, list(value)] for key, value in self._data.items()]
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.path)
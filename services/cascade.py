@@ -0,0 +1,81 @@
+"""
+Scoring cascade
+Keyword scores decide the clear-cut articles; only ambiguous ones are
+escalated to the heavier model backend.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from .batch import BatchScores
+
+TIERS = ("keyword", "model")
+
+
+@dataclass(frozen=True)
+class CascadePolicy:
+    """Which keyword-scored articles are ambiguous enough to escalate.
+
+    An article is escalated when its keyword score lies inside the band
+    ``|score| < band`` or its keyword confidence is below ``min_confidence``.
+    Articles without any keyword hit are chatter in most of the corpus and
+    stay neutral unless ``escalate_unmatched`` is set.
+    """
+
+    band: float = 0.3
+    min_confidence: float = 0.7
+    escalate_unmatched: bool = False
+
+    def escalate(self, scores: BatchScores) -> np.ndarray:
+        """Boolean mask of the rows of ``scores`` to rescore with the model."""
+        ambiguous = (np.abs(scores.score) < self.band) | (scores.confidence < self.min_confidence)
+        if not self.escalate_unmatched:
+            ambiguous &= scores.total > 0
+        return ambiguous & scores.success
+
+    @property
+    def fingerprint(self) -> str:
+        return f"cascade:{self.band}:{self.min_confidence}:{int(self.escalate_unmatched)}"
+
+
+class TierStats:
+    """Thread-safe per-tier counters: articles decided, calls and seconds spent.
+
+    The keyword tier's time covers the prefilter pass over every article,
+    including those it then escalates.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.articles = dict.fromkeys(TIERS, 0)
+        self.calls = dict.fromkeys(TIERS, 0)
+        self.seconds = dict.fromkeys(TIERS, 0.0)
+
+    def record(self, tier: str, articles: int, seconds: float) -> None:
+        with self._lock:
+            self.articles[tier] += articles
+            self.calls[tier] += 1
+            self.seconds[tier] += seconds
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            scored = self.articles["keyword"] + self.articles["model"]
+            return {
+                "escalation_rate": round(self.articles["model"] / scored, 4) if scored else 0.0,
+                "tiers": {
+                    tier: {
+                        "articles": self.articles[tier],
+                        "calls": self.calls[tier],
+                        "seconds": round(self.seconds[tier], 6),
+                    }
+                    for tier in TIERS
+                },
+            }
@@ -0,0 +1,229 @@
+"""
+Columnar article store
+Compact memory-mapped file of normalized articles and their sentiment results.
+
+Layout: an 8-byte magic, a little-endian uint64 header length, a JSON header,
+then 8-byte aligned column sections.  Repeated strings are dictionary-encoded
+(uint32 codes plus a dictionary in the header), numbers are fixed-width
+arrays, and free text is one UTF-8 blob per column with an int64 offsets
+array; ``json`` columns store each value JSON-encoded in such a blob.  Files are opened read-only with ``mmap`` so every worker process
+maps the same page-cache pages.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from .article import NEWS_FIELDS, SENTIMENT_FIELDS, Article
+
+MAGIC = b"MRCOLS01"
+SUFFIX = ".cols"
+_ALIGN = 8
+
+# (field, kind); kinds: int, float, bool, dict (dictionary-encoded), text, json.
+# ``id`` falls back to json when a file has non-integer ids (see ``_id_kind``).
+SCHEMA = (
+    ("id", "int"),
+    ("title", "text"),
+    ("content", "text"),
+    ("source", "dict"),
+    ("publish_time", "text"),
+    ("stock_code", "dict"),
+    ("stock_name", "dict"),
+    ("stock_industry", "dict"),
+    ("url", "text"),
+    ("success", "bool"),
+    ("sentiment_score", "float"),
+    ("sentiment_label", "dict"),
+    ("confidence", "float"),
+    ("keyword_risk", "int"),
+    ("keyword_positive", "int"),
+    ("keyword_neutral", "int"),
+    ("method", "dict"),
+    ("error", "dict"),
+    ("analysis_time", "dict"),
+    ("is_risk", "bool"),
+    ("alert", "bool"),
+    ("score_bucket", "dict"),
+)
+_DTYPES = {"int": "<i8", "float": "<f8", "bool": "|b1", "dict": "<u4"}
+
+
+def is_columnar(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _flatten(article: Dict) -> Dict:
+    counts = article.get("keyword_counts") or {}
+    row = dict(article)
+    row["keyword_risk"] = counts.get("risk", 0)
+    row["keyword_positive"] = counts.get("positive", 0)
+    row["keyword_neutral"] = counts.get("neutral", 0)
+    return row
+
+
+def _id_kind(ids: List[Any]) -> str:
+    """``int`` if every id is an integer (or missing), else ``json`` to keep string ids as they are."""
+    ok = all(v is None or (isinstance(v, int) and not isinstance(v, bool)) for v in ids)
+    return "int" if ok else "json"
+
+
+def write_columnar(path: str, articles: Iterable[Dict], meta: Dict | None = None) -> int:
+    """Write analyzed articles to ``path``; return the number of rows."""
+    values: Dict[str, List[Any]] = {name: [] for name, _ in SCHEMA}
+    for article in articles:
+        row = _flatten(article)
+        for name, _ in SCHEMA:
+            values[name].append(row.get(name))
+    count = len(values["id"])
+
+    sections: List[bytes] = []
+    columns: Dict[str, Dict] = {}
+    dictionaries: Dict[str, List[str]] = {}
+    for name, kind in SCHEMA:
+        col = values[name]
+        if name == "id":
+            kind = _id_kind(col)
+        if kind in ("text", "json"):
+            if kind == "json":
+                encoded = [json.dumps(v, ensure_ascii=False).encode("utf-8") for v in col]
+            else:
+                encoded = [(v or "").encode("utf-8") for v in col]
+            offsets = np.zeros(count + 1, dtype="<i8")
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            parts = {"offsets": offsets.tobytes(), "blob": b"".join(encoded)}
+        elif kind == "dict":
+            lookup: Dict[str, int] = {}
+            codes = np.fromiter(
+                (lookup.setdefault("" if v is None else str(v), len(lookup)) for v in col),
+                dtype=_DTYPES[kind], count=count,
+            )
+            dictionaries[name] = list(lookup)
+            parts = {"data": codes.tobytes()}
+        elif kind == "int":
+            parts = {"data": np.asarray([int(v or 0) for v in col], dtype=_DTYPES[kind]).tobytes()}
+        elif kind == "float":
+            parts = {"data": np.asarray([float(v or 0.0) for v in col], dtype=_DTYPES[kind]).tobytes()}
+        else:
+            parts = {"data": np.asarray([bool(v) for v in col], dtype=_DTYPES[kind]).tobytes()}
+        columns[name] = {"kind": kind}
+        for part, data in parts.items():
+            columns[name][part] = len(sections)
+            sections.append(data)
+
+    # Section offsets are relative to the (aligned) end of the header.
+    positions, pos = [], 0
+    for data in sections:
+        positions.append(pos)
+        pos += len(data) + (-len(data)) % _ALIGN
+    for spec in columns.values():
+        for part in ("offsets", "blob", "data"):
+            if part in spec:
+                index = spec[part]
+                spec[part] = [positions[index], len(sections[index])]
+    header = json.dumps(
+        {"count": count, "meta": meta or {}, "columns": columns, "dictionaries": dictionaries},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    header += b" " * ((-(len(MAGIC) + 8 + len(header))) % _ALIGN)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for data in sections:
+            f.write(data)
+            f.write(b"\0" * ((-len(data)) % _ALIGN))
+    os.replace(tmp, path)
+    return count
+
+
+class ColumnarArticles:
+    """Read-only, memory-mapped view of a columnar article file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"not a columnar article file: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (header_len,) = struct.unpack_from("<Q", self._mm, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(self._mm[start:start + header_len]).decode("utf-8"))
+        self.meta: Dict = header["meta"]
+        self.count: int = header["count"]
+        self.dictionaries: Dict[str, List[str]] = header["dictionaries"]
+        base = start + header_len
+        self._columns: Dict[str, Dict] = {}
+        for name, spec in header["columns"].items():
+            kind = spec["kind"]
+            col: Dict[str, Any] = {"kind": kind}
+            if kind in ("text", "json"):
+                offset, _ = spec["offsets"]
+                col["offsets"] = np.frombuffer(self._mm, dtype="<i8", count=self.count + 1, offset=base + offset)
+                col["blob"] = base + spec["blob"][0]
+            else:
+                offset, _ = spec["data"]
+                col["data"] = np.frombuffer(self._mm, dtype=_DTYPES[kind], count=self.count, offset=base + offset)
+            self._columns[name] = col
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column array (codes for dictionary columns); zero-copy."""
+        col = self._columns[name]
+        return col["offsets"] if col["kind"] in ("text", "json") else col["data"]
+
+    def value(self, name: str, i: int) -> Any:
+        col = self._columns[name]
+        kind = col["kind"]
+        if kind in ("text", "json"):
+            offsets = col["offsets"]
+            start = col["blob"]
+            raw = self._mm[start + int(offsets[i]):start + int(offsets[i + 1])].decode("utf-8")
+            return json.loads(raw) if kind == "json" else raw
+        data = col["data"]
+        if kind == "dict":
+            return self.dictionaries[name][data[i]]
+        if kind == "int":
+            return int(data[i])
+        if kind == "float":
+            return float(data[i])
+        return bool(data[i])
+
+    def news(self, i: int) -> Dict:
+        """Normalized article ``i`` (the shape ``_normalize_article`` returns)."""
+        return {name: self.value(name, i) for name in NEWS_FIELDS}
+
+    def analyzed(self, i: int) -> Article:
+        """Analyzed article ``i`` (what ``analyze_news`` returns)."""
+        article = Article(self.news(i), tuple(self.value(name, i) for name in SENTIMENT_FIELDS))
+        article.error = self.value("error", i) or None
+        article.is_risk = self.value("is_risk", i)
+        article.alert = self.value("alert", i)
+        article.score_bucket = self.value("score_bucket", i)
+        return article
+
+    def iter_news(self, start: int = 0) -> Iterator[Dict]:
+        for i in range(start, self.count):
+            yield self.news(i)
+
+    def iter_analyzed(self, start: int = 0) -> Iterator[Article]:
+        for i in range(start, self.count):
+            yield self.analyzed(i)
+
+    def close(self) -> None:
+        self._columns.clear()
+        self._mm.close()
@@ -0,0 +1,211 @@
+"""
+Near-duplicate detection
+MinHash signatures over character shingles and an LSH-banded index that
+groups near-identical posts into clusters in roughly linear time.
+"""
+
+from __future__ import annotations
+
+import operator
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .hashing import PRIME, mix64
+
+# Texts are hashed in sub-batches of this many to bound the (perms x shingles) matrix.
+MINHASH_BATCH = 1024
+
+
+def _permutations(num_perm: int, seed: int = 1) -> tuple:
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**32, num_perm, dtype=np.uint64).astype(np.uint32) | np.uint32(1)
+    b = rng.integers(0, 2**32, num_perm, dtype=np.uint64).astype(np.uint32)
+    return a[:, None], b[:, None]
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.split())
+
+
+def minhash_batch(texts: Sequence[str], num_perm: int = 32, shingle: int = 3) -> np.ndarray:
+    """``(len(texts), num_perm)`` uint32 MinHash signatures of character ``shingle``-grams.
+
+    Whitespace is ignored.  The fraction of equal columns between two rows
+    estimates the Jaccard similarity of the two texts' shingle sets; empty
+    texts get all-ones rows.
+    """
+    a, b = _permutations(num_perm)
+    out = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for lo in range(0, len(texts), MINHASH_BATCH):
+        _minhash_chunk(texts[lo:lo + MINHASH_BATCH], shingle, a, b, out[lo:lo + MINHASH_BATCH])
+    return out
+
+
+def _minhash_chunk(texts: Sequence[str], shingle: int, a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    encoded = [_normalize(text).encode("utf-32-le") for text in texts]
+    lengths = np.fromiter((len(e) // 4 for e in encoded), dtype=np.int64, count=len(encoded))
+    nonempty = lengths > 0
+    if not nonempty.any():
+        return
+    # Every text is followed by shingle-1 zero code points, so each position
+    # inside a text starts one shingle and no shingle spans two texts.
+    pad = b"\0\0\0\0" * (shingle - 1)
+    cps = np.frombuffer(pad.join(encoded) + pad, dtype="<u4").astype(np.uint64)
+    span = len(cps) - shingle + 1
+    codes = cps[:span].copy()
+    for j in range(1, shingle):
+        codes = codes * PRIME + cps[j:span + j]
+    starts = np.concatenate(([0], np.cumsum(lengths + shingle - 1)[:-1]))
+    lens = lengths[nonempty]
+    segments = np.cumsum(lens) - lens  # first shingle of each kept text
+    positions = np.arange(lens.sum()) + np.repeat(starts[nonempty] - segments, lens)
+    hashes = (mix64(codes[positions]) >> np.uint64(32)).astype(np.uint32)
+    permuted = a * hashes[None, :]
+    permuted += b
+    out[nonempty] = np.minimum.reduceat(permuted, segments, axis=1).T
+
+
+class NearDuplicateIndex:
+    """Leader clustering of MinHash signatures.
+
+    A text joins the first candidate cluster whose representative's estimated
+    Jaccard similarity is at least ``threshold``, otherwise it founds a new cluster.
+    Candidates come from LSH: the signature is cut into ``bands`` bands and
+    only the ``max_candidates`` most recent representatives sharing a whole
+    band are compared, which keeps insertion cost bounded even when many
+    dissimilar texts collide.  Identical (whitespace-normalized) texts skip
+    hashing altogether.
+
+    Each cluster can also remember a scoring result for its members (the
+    pipeline stores the model prediction), keyed by scoring fingerprint, so
+    later members skip the model.
+
+    At most ``max_clusters`` clusters are kept: when a new one would exceed
+    that, the least recently matched cluster is dropped with its LSH
+    entries, exact-text keys and remembered result, so memory and candidate lists
+    stay bounded however long the crawl runs.  A later copy of an evicted
+    story simply founds a new cluster.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 32,
+        bands: int = 8,
+        shingle: int = 3,
+        max_candidates: int = 8,
+        max_clusters: int = 200_000,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm 必须能被 bands 整除")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle = shingle
+        self.max_candidates = max_candidates
+        self.max_clusters = max_clusters
+        self._rows = num_perm // bands
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+            self._exact: Dict[int, int] = {}
+            # Cluster id -> (signature, band keys, exact-text keys), least recently matched first.
+            self._clusters: "OrderedDict[int, tuple]" = OrderedDict()
+            self._sentiment: Dict[int, tuple] = {}
+            self._next_cluster = 0
+            self.assigned = 0
+            self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Fold each band's rows into one uint64 (collisions only add candidates)."""
+        bands = signatures.reshape(len(signatures), self.bands, self._rows).astype(np.uint64)
+        keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+        for row in range(self._rows):
+            keys = mix64(keys ^ bands[:, :, row])
+        return keys
+
+    def _assign(self, signature: tuple, keys: List[int]) -> int:
+        need = self.threshold * self.num_perm
+        checked = set()
+        for table, key in zip(self._tables, keys):
+            for candidate in table.get(key, ())[-self.max_candidates:]:
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                if sum(map(operator.eq, self._clusters[candidate][0], signature)) >= need:
+                    self._clusters.move_to_end(candidate)
+                    return candidate
+        cluster = self._next_cluster
+        self._next_cluster += 1
+        self._clusters[cluster] = (signature, keys, [])
+        for table, key in zip(self._tables, keys):
+            table.setdefault(key, []).append(cluster)
+        while len(self._clusters) > self.max_clusters:
+            self._evict()
+        return cluster
+
+    def _evict(self) -> None:
+        cluster, (_, keys, exact) = self._clusters.popitem(last=False)
+        for table, key in zip(self._tables, keys):
+            members = table[key]
+            members.remove(cluster)
+            if not members:
+                del table[key]
+        for key in exact:
+            if self._exact.get(key) == cluster:
+                del self._exact[key]
+        self._sentiment.pop(cluster, None)
+        self.evicted += 1
+
+    def assign_batch(self, texts: Sequence[str]) -> List[int]:
+        """Cluster id for each text, creating clusters as needed."""
+        keys = [hash(_normalize(text)) for text in texts]
+        with self._lock:
+            clusters: List[int | None] = [self._exact.get(key) for key in keys]
+            for cluster in clusters:
+                if cluster is not None:
+                    self._clusters.move_to_end(cluster)
+        fresh: Dict[int, int] = {}
+        for i, (key, cluster) in enumerate(zip(keys, clusters)):
+            if cluster is None and key not in fresh:
+                fresh[key] = i
+        signatures = minhash_batch([texts[i] for i in fresh.values()], self.num_perm, self.shingle)
+        band_keys = self._band_keys(signatures).tolist()
+        with self._lock:
+            self.assigned += len(texts)
+            for key, signature, bands in zip(fresh, map(tuple, signatures.tolist()), band_keys):
+                if key not in self._exact:
+                    cluster = self._assign(signature, bands)
+                    self._exact[key] = cluster
+                    self._clusters[cluster][2].append(key)
+            # A cluster matched by exact text above may have been evicted since.
+            return [self._exact.get(key, cluster) for key, cluster in zip(keys, clusters)]
+
+    def sentiment(self, cluster: int, fingerprint: str) -> tuple | None:
+        entry = self._sentiment.get(cluster)
+        return entry[1] if entry is not None and entry[0] == fingerprint else None
+
+    def remember(self, cluster: int, fingerprint: str, sentiment: tuple) -> None:
+        with self._lock:
+            if cluster in self._clusters:
+                self._sentiment[cluster] = (fingerprint, sentiment)
+
+    def get_status(self) -> Dict:
+        return {
+            "clusters": len(self._clusters),
+            "max_clusters": self.max_clusters,
+            "evicted": self.evicted,
+            "assigned": self.assigned,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+        }
@@ -0,0 +1,153 @@
+"""
+Alert event stream
+Turns newly ingested alert articles into numbered events for SSE subscribers.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, List, Tuple
+
+from .aggregator import alert_entry
+from .ingest import article_key
+
+
+class AlertStream:
+    """Ring of the last ``retention`` alert events, registered as an ``ArticleStore`` observer.
+
+    Every story is published at most once, the first time one of its
+    articles is added with ``alert`` set; re-scoring or upserting it, or
+    near-duplicates of it (same ``cluster_id``), do not repeat the event.
+    Articles added inside ``quiet()`` (the cold-start load, re-scoring) are
+    recorded as seen without being published, so only alerts that arrive
+    after them reach subscribers.  Seen stories are counted per live article
+    and forgotten once the store no longer holds any of them.
+    Event ids start from the wall clock in milliseconds, so ids issued after
+    a restart stay above the ones clients saw before it.
+    Subscribers do not get their own queues: each one reads the shared ring
+    from its own cursor at whatever pace its connection allows, so a slow
+    client only falls behind (and is told about the gap) instead of buffering
+    without bound.
+    """
+
+    def __init__(self, retention: int = 1000, max_subscribers: int = 100):
+        self.retention = retention
+        self.max_subscribers = max_subscribers
+        self._events: deque = deque(maxlen=retention)
+        # Story key -> number of its alert articles currently in the store.
+        self._seen: Dict[Hashable, int] = {}
+        # Stories whose last article just left the store; an upsert removes
+        # then re-adds an article, which must not publish it again.
+        self._retired: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._quiet = 0
+        self._cond = threading.Condition()
+        self.last_id = int(time.time() * 1000)
+        self.subscribers = 0
+        self.stats = {"published": 0, "rejected": 0, "gaps": 0}
+
+    @staticmethod
+    def _key(article: Dict) -> Hashable:
+        cluster = article.get("cluster_id")
+        return ("cluster", cluster) if cluster is not None else article_key(article)
+
+    @contextmanager
+    def quiet(self) -> Iterator[None]:
+        """Record alerts added in this block as seen without publishing them."""
+        with self._cond:
+            self._quiet += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._quiet -= 1
+
+    def add(self, article: Dict) -> None:
+        if not article.get("alert"):
+            return
+        key = self._key(article)
+        with self._cond:
+            if key in self._seen:
+                self._seen[key] += 1
+                return
+            self._seen[key] = 1
+            retired = key in self._retired
+            if retired:
+                del self._retired[key]
+            if retired or self._quiet:
+                return
+            self.last_id += 1
+            self._events.append({"id": self.last_id, "ts": time.time(), "alert": alert_entry(article)})
+            self.stats["published"] += 1
+            self._cond.notify_all()
+
+    def remove(self, article: Dict) -> None:
+        # Published alerts are not retracted; the story is only forgotten.
+        if not article.get("alert"):
+            return
+        key = self._key(article)
+        with self._cond:
+            count = self._seen.get(key, 0) - 1
+            if count > 0:
+                self._seen[key] = count
+                return
+            self._seen.pop(key, None)
+            self._retired[key] = None
+            while len(self._retired) > self.retention:
+                self._retired.popitem(last=False)
+
+    def clear(self) -> None:
+        # The store is being rebuilt; it re-adds its articles inside quiet().
+        with self._cond:
+            self._seen.clear()
+            self._retired.clear()
+
+    def events_after(self, last_id: int, limit: int = 100) -> Tuple[List[Dict], bool]:
+        """Up to ``limit`` events newer than ``last_id``, and whether some were lost.
+
+        An id from the future (issued before a restart) counts as a gap and
+        replays the whole ring.
+        """
+        with self._cond:
+            reset = last_id > self.last_id
+            if reset:
+                last_id = 0
+            if not self._events or last_id >= self.last_id:
+                return [], reset
+            first = self._events[0]["id"]
+            gap = reset or last_id < first - 1
+            start = max(0, last_id + 1 - first)
+            events = [self._events[i] for i in range(start, min(len(self._events), start + limit))]
+            if gap:
+                self.stats["gaps"] += 1
+            return events, gap
+
+    def wait(self, last_id: int, timeout: float) -> bool:
+        """Block until an event newer than ``last_id`` exists; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.last_id > last_id, timeout)
+
+    def subscribe(self) -> bool:
+        with self._cond:
+            if self.subscribers >= self.max_subscribers:
+                self.stats["rejected"] += 1
+                return False
+            self.subscribers += 1
+            return True
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self.subscribers = max(0, self.subscribers - 1)
+
+    def get_status(self) -> Dict:
+        with self._cond:
+            return {
+                "last_id": self.last_id,
+                "retained": len(self._events),
+                "seen_stories": len(self._seen),
+                "subscribers": self.subscribers,
+                "max_subscribers": self.max_subscribers,
+                **self.stats,
+            }
@@ -0,0 +1,24 @@
+"""
+Hashing primitives
+64-bit hashes shared by near-duplicate detection and model feature hashing.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Identifies PRIME and mix64 below.  Model files record it, so change it
+# whenever either changes: models trained on the old hash then refuse to
+# load instead of silently scoring garbage.
+HASH_VERSION = "fnv-splitmix64-v1"
+# FNV-1 64-bit prime, used to roll code points into n-gram codes.
+PRIME = np.uint64(1099511628211)
+
+
+def mix64(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads n-gram codes over all 64 bits."""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
@@ -0,0 +1,234 @@
+"""
+HTTP caching helpers
+Precompressed response bodies with validators (ETag / Last-Modified) and
+content-encoding negotiation.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, Hashable, Mapping, Tuple
+
+try:  # optional: brotli variants are only built when the package is installed
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Bodies smaller than this are not worth compressing.
+MIN_COMPRESS_BYTES = 512
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """``{"identity": body, "gzip": ..., "br": ...}``; codecs that don't shrink the body are left out."""
+    variants = {"identity": body}
+    if len(body) < MIN_COMPRESS_BYTES:
+        return variants
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(gz) < len(body):
+        variants["gzip"] = gz
+    if brotli is not None:
+        br = brotli.compress(body, quality=11)
+        if len(br) < len(body):
+            variants["br"] = br
+    return variants
+
+
+def negotiate_encoding(accept_encoding: str | None, available) -> str:
+    """Pick ``br`` over ``gzip`` over ``identity`` among what the client accepts."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def not_modified(headers: Mapping[str, str], etag: str, last_modified: float | None = None) -> bool:
+    """True if the request's validators show the client copy is current.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted
+    without it (RFC 9110 13.2.2).
+    """
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    since = headers.get("If-Modified-Since")
+    if since and last_modified is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def make_etag(version: str, weak: bool = False) -> str:
+    """Entity tag for an opaque version string."""
+    tag = f'"{hashlib.blake2b(version.encode("utf-8"), digest_size=10).hexdigest()}"'
+    return f"W/{tag}" if weak else tag
+
+
+def _variant_tag(etag: str, encoding: str) -> str:
+    # Each encoding is a different representation, so it gets its own tag.
+    return etag if encoding == "identity" else f'{etag[:-1]}-{encoding}"'
+
+
+def matches_any_encoding(if_none_match: str | None, etag: str) -> bool:
+    """True if the client holds ``etag`` in any encoding we may have sent."""
+    return any(etag_matches(if_none_match, _variant_tag(etag, e)) for e in ("identity", "gzip", "br"))
+
+
+class CompressedAsset:
+    """A body compressed once, served with validators.
+
+    ``select(headers)`` returns ``(status, body, response headers)``: 304
+    with an empty body when the client's copy is current, otherwise 200 with
+    the best encoding the client accepts.
+
+    With ``trailer=True`` the body is only a prefix, completed per response
+    by ``select(headers, trailer)``; this keeps a few volatile fields (a
+    timestamp, an age) out of the cached bytes.  The gzip variant then keeps
+    the compressor state after the prefix so each response only compresses
+    its trailer, there is no brotli variant, and the ETag is weak because
+    the bytes differ between responses.
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        content_type: str,
+        last_modified: float | None = None,
+        max_age: int = 0,
+        etag: str | None = None,
+        trailer: bool = False,
+    ):
+        self.content_type = content_type
+        self.trailer = trailer
+        if trailer:
+            self.variants = {"identity": body}
+            self._gzip = None
+            if len(body) >= MIN_COMPRESS_BYTES:
+                compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+                self._gzip = (compressor.compress(body), compressor)
+                self.variants["gzip"] = self._gzip[0]
+        else:
+            self.variants = compress_variants(body)
+        if etag is None:
+            etag = f'"{hashlib.blake2b(body, digest_size=10).hexdigest()}"'
+            if trailer:
+                etag = f"W/{etag}"
+        self.etag = etag
+        self.last_modified = last_modified
+        self.max_age = max_age
+        self.size = sum(len(v) for v in self.variants.values())
+
+    def headers(self, encoding: str = "identity") -> Dict[str, str]:
+        out = {
+            "ETag": _variant_tag(self.etag, encoding),
+            "Cache-Control": f"public, max-age={self.max_age}" if self.max_age else "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if self.last_modified is not None:
+            out["Last-Modified"] = formatdate(self.last_modified, usegmt=True)
+        return out
+
+    def _body(self, encoding: str, trailer: bytes) -> bytes:
+        if not self.trailer:
+            return self.variants[encoding]
+        if encoding == "gzip":
+            prefix, compressor = self._gzip
+            compressor = compressor.copy()
+            return prefix + compressor.compress(trailer) + compressor.flush()
+        return self.variants["identity"] + trailer
+
+    def select(self, headers: Mapping[str, str], trailer: bytes = b"") -> Tuple[int, bytes, Dict[str, str]]:
+        encoding = negotiate_encoding(headers.get("Accept-Encoding"), self.variants)
+        out = self.headers(encoding)
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match and matches_any_encoding(if_none_match, self.etag):
+            return 304, b"", out
+        if not if_none_match and not_modified(headers, out["ETag"], self.last_modified):
+            return 304, b"", out
+        if encoding != "identity":
+            out["Content-Encoding"] = encoding
+        out["Content-Type"] = self.content_type
+        return 200, self._body(encoding, trailer), out
+
+
+class ResponseCache:
+    """Compressed response bodies keyed by request, valid for one data version.
+
+    An entry is rebuilt when its version changes; least recently used
+    entries are evicted once the cached bytes exceed ``max_bytes``, and
+    bodies larger than ``max_entry_bytes`` are not kept at all.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20, max_entry_bytes: int = 8 << 20):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[str, CompressedAsset]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: str, build: Callable[[], CompressedAsset]) -> Tuple[CompressedAsset, bool]:
+        """The asset for ``key`` at ``version``, building it if needed, and whether it was cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+        asset = build()
+        if asset.size > self.max_entry_bytes:
+            return asset, False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1].size
+            self._entries[key] = (version, asset)
+            self.bytes += asset.size
+            while self.bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+        return asset, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,156 @@
+"""
+Article index
+Per-stock and per-industry rollups maintained at ingest time for filtered queries.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from .aggregator import RiskAggregator
+
+
+def time_key(value) -> str:
+    """Comparable form of a publish time ("2026-01-16T01:51:00" or "2026-01-16 01:51:00")."""
+    return str(value or "").replace("T", " ")[:19]
+
+
+def parse_time_bound(name: str, value: str) -> str:
+    """Validate a ``start``/``end`` query value and return its ``time_key``.
+
+    Accepts ISO dates and date-times with either a ``T`` or a space
+    ("2026-01-16", "2026-01-16T09:30", "2026-01-16 09:30:00").  The key
+    keeps the given precision, so ``end=2026-01-16`` covers the whole day.
+    """
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} 必须为 ISO 日期或时间，如 2026-01-16 或 2026-01-16T09:30") from None
+    return time_key(value)
+
+
+class _Bucket:
+    """Articles of one stock/industry: insertion order, time order and rollup."""
+
+    __slots__ = ("articles", "times", "aggregator")
+
+    def __init__(self):
+        self.articles: Dict[int, Dict] = {}
+        self.times: List[Tuple[str, int]] = []
+        self.aggregator = RiskAggregator()
+
+    def add(self, article: Dict) -> None:
+        key = id(article)
+        self.articles[key] = article
+        insort(self.times, (time_key(article.get("publish_time")), key))
+        self.aggregator.add(article)
+
+    def remove(self, article: Dict) -> None:
+        key = id(article)
+        if self.articles.pop(key, None) is None:
+            return
+        entry = (time_key(article.get("publish_time")), key)
+        pos = bisect_left(self.times, entry)
+        if pos < len(self.times) and self.times[pos] == entry:
+            del self.times[pos]
+        self.aggregator.remove(article)
+
+    def between(self, start: str | None, end: str | None) -> List[Dict]:
+        """Articles with start <= publish_time <= end, oldest first.
+
+        Bounds are prefixes, so ``end="2026-01-16"`` includes that whole day.
+        """
+        lo = bisect_left(self.times, (time_key(start), -1)) if start else 0
+        hi = bisect_right(self.times, (time_key(end) + "\uffff",)) if end else len(self.times)
+        return [self.articles[key] for _, key in self.times[lo:hi]]
+
+
+class ArticleIndex:
+    """stock_code -> articles and stock_industry -> articles, each with a rollup.
+
+    Registered as an ``ArticleStore`` observer, so it follows every upsert.
+    Queries without a time range are answered from precomputed rollups.
+    """
+
+    def __init__(self, articles: Iterable[Dict] = ()):
+        self._lock = threading.RLock()
+        self.clear()
+        for article in articles:
+            self.add(article)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.total = _Bucket()
+            self.stocks: Dict[str, _Bucket] = {}
+            self.industries: Dict[str, _Bucket] = {}
+
+    def add(self, article: Dict) -> None:
+        with self._lock:
+            self.total.add(article)
+            self.stocks.setdefault(article.get("stock_code") or "", _Bucket()).add(article)
+            self.industries.setdefault(article.get("stock_industry") or "", _Bucket()).add(article)
+
+    def remove(self, article: Dict) -> None:
+        with self._lock:
+            self.total.remove(article)
+            for buckets, key in ((self.stocks, article.get("stock_code") or ""),
+                                 (self.industries, article.get("stock_industry") or "")):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    continue
+                bucket.remove(article)
+                if not bucket.articles:
+                    del buckets[key]
+
+    def _bucket(self, stock_code: str | None, industry: str | None) -> _Bucket | None:
+        if stock_code:
+            return self.stocks.get(stock_code)
+        if industry:
+            return self.industries.get(industry)
+        return self.total
+
+    def select(
+        self,
+        stock_code: str | None = None,
+        industry: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> List[Dict]:
+        """Articles matching every given filter.
+
+        Without a time range the corpus order is kept; with one, results are
+        ordered by publish time.
+        """
+        with self._lock:
+            bucket = self._bucket(stock_code, industry)
+            if bucket is None:
+                return []
+            if start or end:
+                articles = bucket.between(start, end)
+            else:
+                articles = list(bucket.articles.values())
+        if stock_code and industry:
+            articles = [a for a in articles if a.get("stock_industry") == industry]
+        return articles
+
+    def dashboard(
+        self,
+        stock_code: str | None = None,
+        industry: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> Dict:
+        if start or end or (stock_code and industry):
+            return RiskAggregator(self.select(stock_code, industry, start, end)).dashboard()
+        with self._lock:
+            bucket = self._bucket(stock_code, industry)
+            return (bucket.aggregator if bucket else RiskAggregator()).dashboard()
+
+    def rollup(self, by: str = "stock") -> Dict[str, Dict]:
+        """Dashboard per stock_code (``by="stock"``) or per stock_industry."""
+        with self._lock:
+            buckets = self.stocks if by == "stock" else self.industries
+            return {key: bucket.aggregator.dashboard() for key, bucket in buckets.items()}
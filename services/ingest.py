@@ -0,0 +1,272 @@
+"""
+Incremental ingestion
+Tracks every crawler file with a watermark and merges new records into a
+rolling article store deduplicated by url.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from .article import NEWS_FIELDS
+from .colstore import ColumnarArticles, is_columnar
+from .jsonstream import is_json_array, iter_json_lines, iter_json_records
+
+logger = logging.getLogger(__name__)
+
+
+def article_key(article: Dict) -> str:
+    """Deduplication key: the post url, or a content fingerprint without one."""
+    return article.get("url") or "|".join(
+        str(article.get(k, "")) for k in ("stock_code", "publish_time", "title")
+    )
+
+
+class ArticleStore:
+    """Analyzed articles from all crawler files seen so far.
+
+    Each file keeps a watermark: the byte offset reached for JSON Lines, or
+    the number of records consumed for a JSON array or columnar file.  A JSON
+    array is only resumed if its first record is unchanged; guba dumps are
+    newest-first, so a rewrite that prepends posts is read again in full
+    (and deduplicated by url) instead of skipping them with the old prefix.
+    ``refresh`` only normalizes and analyzes records past the watermark, so
+    its cost follows the newly crawled delta instead of the whole history.
+    Columnar files whose keyword fingerprint matches ``fingerprint()`` are
+    merged with their stored sentiment results and skip analysis entirely;
+    ``restore`` then fills in what is not stored (near-duplicate clusters).
+    """
+
+    def __init__(
+        self,
+        normalize: Callable[[Dict, int], Dict],
+        analyze: Callable[[Iterable[Dict]], Iterator[Dict]],
+        max_articles: int | None = None,
+        fingerprint: Callable[[], str] | None = None,
+        restore: Callable[[Iterable[Dict]], Iterator[Dict]] | None = None,
+    ):
+        self.normalize = normalize
+        self.analyze = analyze
+        self.fingerprint = fingerprint
+        self.restore = restore
+        self.max_articles = max_articles
+        self.watermarks: Dict[str, Dict] = {}
+        # Objects with add(article)/remove(article)/clear(), kept in sync with the store.
+        self.observers: List = []
+        self.version = 0
+        self._articles: Dict[str, Dict] = {}
+        # Deduplication key -> file the article was last read from.
+        self.origins: Dict[str, str] = {}
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def values(self) -> List[Dict]:
+        return list(self._articles.values())
+
+    def refresh(self, paths: Iterable[str], workers: int = 1) -> int:
+        """Ingest whatever is new in ``paths``; return the number of upserts.
+
+        With ``workers > 1``, changed files are read and decoded on a thread
+        pool; normalizing, analysis and merging stay on the calling thread,
+        file by file in ``paths`` order, so ids and observer updates are the
+        same as a sequential refresh.  At most ``workers`` files are read
+        ahead of the one being merged, so memory stays bounded by a few
+        files rather than the whole changed corpus.
+        """
+        with self._lock:
+            plans = []
+            for path in paths:
+                try:
+                    plan = self._plan(path)
+                except Exception as exc:
+                    logger.warning("读取爬虫文件失败 %s: %s", path, exc)
+                    continue
+                if plan is not None:
+                    plans.append(plan)
+            if workers > 1 and len(plans) > 1:
+                return self._refresh_pooled(plans, min(workers, len(plans)))
+            return sum(self._apply(plan, partial(self._read, plan)) for plan in plans)
+
+    def _refresh_pooled(self, plans: List[tuple], workers: int) -> int:
+        changed = 0
+        queued = iter(plans)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as pool:
+            window = deque((plan, pool.submit(self._read, plan, True)) for plan in islice(queued, workers))
+            while window:
+                plan, load = window.popleft()
+                following = next(queued, None)
+                if following is not None:
+                    window.append((following, pool.submit(self._read, following, True)))
+                changed += self._apply(plan, load.result)
+                del load  # release the records before waiting on the next file
+        return changed
+
+    def forget(self, paths: Iterable[str]) -> int:
+        """Drop files and the articles last seen in them; return how many were removed.
+
+        Used when a newer crawl run supersedes a file: articles that the new
+        run repeats have already moved to it, the rest are retracted.
+        """
+        with self._lock:
+            paths = set(paths) & self.watermarks.keys()
+            if not paths:
+                return 0
+            removed = 0
+            for key, origin in list(self.origins.items()):
+                if origin not in paths:
+                    continue
+                del self.origins[key]
+                article = self._articles.pop(key)
+                for observer in self.observers:
+                    observer.remove(article)
+                removed += 1
+            for path in paths:
+                del self.watermarks[path]
+            self.version += 1
+            return removed
+
+    def file_counts(self) -> Counter:
+        """Number of stored articles attributed to each file."""
+        with self._lock:
+            return Counter(self.origins.values())
+
+    def reanalyze(self) -> None:
+        """Re-score every stored article, e.g. after the keyword lists change."""
+        with self._lock:
+            news = ({k: a.get(k) for k in NEWS_FIELDS} for a in self._articles.values())
+            self._articles = {article_key(a): a for a in self.analyze(news)}
+            for observer in self.observers:
+                observer.clear()
+                for article in self._articles.values():
+                    observer.add(article)
+            self.version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._articles.clear()
+            self.origins.clear()
+            self.watermarks.clear()
+            self._next_id = 1
+            for observer in self.observers:
+                observer.clear()
+            self.version += 1
+
+    def _plan(self, path: str) -> tuple | None:
+        """``(path, stat, mark)`` for a file with unread data, else None."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        mark = self.watermarks.get(path)
+        if mark and mark["mtime_ns"] == st.st_mtime_ns and mark["size"] == st.st_size:
+            return None
+        if mark is None or st.st_size < mark["size"]:
+            # New file, or truncated/rewritten: start over and rely on dedup.
+            mark = {"offset": 0, "records": 0, "size": 0, "mtime_ns": 0}
+        if is_columnar(path):
+            mark = dict(mark, format="columnar")
+        else:
+            mark = dict(mark, format="array" if is_json_array(path) else "lines")
+        return path, st, mark
+
+    def _read(self, plan: tuple, materialize: bool = False) -> Iterable[Dict] | None:
+        """Raw records past the watermark (None for columnar files, merged directly)."""
+        path, _, mark = plan
+        if mark["format"] == "columnar":
+            return None
+        if mark["format"] == "array":
+            records = self._iter_array(path, mark)
+        else:
+            records = self._iter_lines(path, mark)
+        return list(records) if materialize else records
+
+    def _apply(self, plan: tuple, read: Callable[[], Iterable[Dict] | None]) -> int:
+        path, st, mark = plan
+        # The watermark is only stored once the file is fully consumed; after
+        # a failure the delta is read again and deduplicated by url.
+        try:
+            if mark["format"] == "columnar":
+                changed = self._merge_columnar(path, mark)
+            else:
+                changed = self._merge(self.analyze(self._normalized(read(), mark)), path)
+        except Exception as exc:
+            logger.warning("读取爬虫文件失败 %s: %s", path, exc)
+            return 0
+        mark["size"], mark["mtime_ns"] = st.st_size, st.st_mtime_ns
+        self.watermarks[path] = mark
+        return changed
+
+    @staticmethod
+    def _iter_array(path: str, mark: Dict) -> Iterator[Dict]:
+        skip = mark["records"]
+        for i, record in enumerate(iter_json_records(path)):
+            if i == 0:
+                head = hashlib.blake2b(
+                    json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8"), digest_size=8
+                ).hexdigest()
+                if skip and mark.get("head") != head:
+                    logger.info("爬虫文件开头已变化，重新读取 %s", path)
+                    skip = mark["records"] = 0
+                mark["head"] = head
+            if i >= skip:
+                yield record
+
+    @staticmethod
+    def _iter_lines(path: str, mark: Dict) -> Iterator[Dict]:
+        for record, end in iter_json_lines(path, mark["offset"]):
+            mark["offset"] = end
+            yield record
+
+    def _normalized(self, records: Iterable[Dict], mark: Dict) -> Iterator[Dict]:
+        for item in records:
+            mark["records"] += 1
+            yield self.normalize(item, self._next_id)
+            self._next_id += 1
+
+    def _merge_columnar(self, path: str, mark: Dict) -> int:
+        table = ColumnarArticles(path)
+        try:
+            start = mark["records"]
+            mark["records"] = len(table)
+            if self.fingerprint and table.meta.get("keyword_fingerprint") == self.fingerprint():
+                articles = table.iter_analyzed(start)
+                return self._merge(self.restore(articles) if self.restore else articles, path)
+            return self._merge(self.analyze(table.iter_news(start)), path)
+        finally:
+            table.close()
+
+    def _merge(self, articles: Iterable[Dict], path: str) -> int:
+        changed = 0
+        for article in articles:
+            key = article_key(article)
+            old = self._articles.pop(key, None)
+            if old is not None:
+                article["id"] = old["id"]
+            self._articles[key] = article
+            self.origins[key] = path
+            for observer in self.observers:
+                if old is not None:
+                    observer.remove(old)
+                observer.add(article)
+            self.version += 1
+            changed += 1
+        if self.max_articles:
+            while len(self._articles) > self.max_articles:
+                key = next(iter(self._articles))
+                evicted = self._articles.pop(key)
+                self.origins.pop(key, None)
+                for observer in self.observers:
+                    observer.remove(evicted)
+        return changed
@@ -0,0 +1,153 @@
+"""
+Brief job queue
+Bounded-concurrency background generation of risk briefings with dedup and caching.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List
+
+from .brief import BriefGenerator, brief_generator
+
+
+def brief_key(stock_code: str, stock_name: str, articles: List[str]) -> str:
+    """Job id for a request: identical stock and article set -> identical id."""
+    payload = json.dumps([stock_code, stock_name, sorted(set(articles))], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+
+
+class BriefQueue:
+    """Runs ``generate_risk_briefing`` on at most ``max_workers`` threads.
+
+    Submitting a request that is already queued or running returns the same
+    job.  Finished briefs stay cached for ``ttl`` seconds (at most
+    ``max_cached`` of them); failed jobs are kept for polling but a new
+    submission retries them.
+    """
+
+    def __init__(
+        self,
+        generator: BriefGenerator,
+        max_workers: int = 2,
+        ttl: float = 600.0,
+        max_cached: int = 1000,
+    ):
+        self.generator = generator
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="brief")
+        self._jobs: OrderedDict = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "deduplicated": 0, "cache_hits": 0, "completed": 0, "failed": 0}
+
+    def submit(self, stock_code: str, stock_name: str, articles: List[str]) -> Dict:
+        """Queue a brief (or reuse an identical one); returns the job record."""
+        job_id = brief_key(stock_code, stock_name, articles)
+        with self._lock:
+            self.stats["submitted"] += 1
+            job = self._jobs.get(job_id)
+            if job is not None:
+                if job["status"] in ("queued", "running"):
+                    self.stats["deduplicated"] += 1
+                    return dict(job)
+                if job["status"] == "done" and time.time() - job["finished_ts"] < self.ttl:
+                    self.stats["cache_hits"] += 1
+                    self._jobs.move_to_end(job_id)
+                    return dict(job)
+            job = {
+                "job_id": job_id,
+                "status": "queued",
+                "stock_code": stock_code,
+                "stock_name": stock_name,
+                "article_count": len(articles),
+                "submitted_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "finished_at": None,
+                "finished_ts": None,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            self._futures[job_id] = self._executor.submit(self._run, job_id, stock_code, stock_name, list(articles))
+            self._evict()
+            return dict(job)
+
+    def _run(self, job_id: str, stock_code: str, stock_name: str, articles: List[str]) -> str:
+        with self._lock:
+            self._jobs[job_id]["status"] = "running"
+        try:
+            result = self.generator.generate_risk_briefing(stock_code, stock_name, articles, raise_errors=True)
+        except Exception as exc:
+            self._finish(job_id, status="failed", error=str(exc))
+            raise
+        self._finish(job_id, status="done", result=result)
+        return result
+
+    def _finish(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                job["finished_ts"] = time.time()
+                job["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._futures.pop(job_id, None)
+            self.stats["completed" if fields["status"] == "done" else "failed"] += 1
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond ``max_cached``; pending ones stay."""
+        excess = len(self._jobs) - self.max_cached
+        for job_id in list(self._jobs):
+            if excess <= 0:
+                break
+            if self._jobs[job_id]["status"] in ("done", "failed"):
+                del self._jobs[job_id]
+                excess -= 1
+
+    def status(self, job_id: str) -> Dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id: str, timeout: float | None = None) -> Dict | None:
+        """The job once finished, or as it stands after ``timeout`` seconds."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            wait([future], timeout=timeout)
+        return self.status(job_id)
+
+    def briefing(self, job: Dict) -> str:
+        """Text of a finished job: its brief, or an error briefing if it failed."""
+        if job["status"] == "done":
+            return job["result"]
+        return self.generator._generate_error_briefing(job["stock_code"], job["stock_name"], job.get("error") or "")
+
+    def generate(self, stock_code: str, stock_name: str, articles: List[str], timeout: float | None = None) -> str:
+        """Submit and wait; used by synchronous callers that still want dedup and caching."""
+        job = self.submit(stock_code, stock_name, articles)
+        job = self.wait(job["job_id"], timeout) or job
+        if job["status"] in ("queued", "running"):
+            return self.generator._generate_error_briefing(stock_code, stock_name, f"等待超过 {timeout} 秒")
+        return self.briefing(job)
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job["status"] in ("queued", "running"))
+            return {"max_workers": self.max_workers, "pending": pending, "cached": len(self._jobs) - pending, **self.stats}
+
+
+brief_queue = BriefQueue(
+    brief_generator,
+    max_workers=int(os.getenv("BRIEF_WORKERS", "2")),
+    ttl=float(os.getenv("BRIEF_CACHE_TTL", "600")),
+)
@@ -0,0 +1,139 @@
+"""
+Streaming JSON reader
+Yields records from a JSON array or JSON Lines file without loading it whole.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Iterator, Tuple
+
+READ_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def iter_json_records(path: str, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """Yield top-level records from ``path``.
+
+    A file whose first non-blank character is ``[`` is read as one JSON array
+    and its elements are yielded one by one; anything else is read as JSON
+    Lines (one value per non-blank line).  Malformed input raises ``ValueError``.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = ""
+        while True:
+            chunk = f.read(read_size)
+            if not chunk:
+                return
+            head += chunk
+            stripped = head.lstrip(_WHITESPACE)
+            if stripped:
+                break
+        if stripped[0] == "[":
+            yield from _iter_array(f, stripped[1:], read_size)
+        else:
+            yield from _iter_lines(f, stripped)
+
+
+def _iter_lines(f: IO[str], buf: str) -> Iterator[Any]:
+    for line in _join_lines(f, buf):
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _join_lines(f: IO[str], buf: str) -> Iterator[str]:
+    """Yield lines of ``buf`` followed by the rest of ``f``."""
+    lines = buf.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        tail = lines.pop()
+        yield from lines
+        yield tail + f.readline()
+    else:
+        yield from lines
+    yield from f
+
+
+def _iter_array(f: IO[str], buf: str, read_size: int) -> Iterator[Any]:
+    pos = 0
+    eof = False
+    expect_value = True  # directly after "[" or ","
+    first = True
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        chunk = f.read(read_size)
+        # Drop consumed input so the buffer holds at most one pending record.
+        buf = buf[pos:] + chunk
+        pos = 0
+        return not chunk
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("unterminated JSON array")
+            eof = fill()
+            continue
+        ch = buf[pos]
+        if ch == "]" and (first or not expect_value):
+            return
+        if not expect_value:
+            if ch != ",":
+                raise ValueError(f"expected ',' or ']' in JSON array, got {ch!r}")
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            value, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            eof = fill()
+            continue
+        # A number running up to the buffer edge may continue in the next read.
+        if not eof and not buf[end:].lstrip(_NUMBER_CHARS):
+            eof = fill()
+            continue
+        pos = end
+        first = False
+        expect_value = False
+        yield value
+
+
+def is_json_array(path: str) -> bool:
+    """Return True if the file's first non-blank character is ``[``."""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(256)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped[:1] == b"["
+
+
+def iter_json_lines(path: str, offset: int = 0) -> Iterator[Tuple[Any, int]]:
+    """Yield ``(record, end_offset)`` for JSON Lines records after byte ``offset``.
+
+    A trailing line without a newline is only consumed if it already parses,
+    so a record still being written is picked up on a later call.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            end = offset + len(line)
+            text = line.strip()
+            if text:
+                try:
+                    record = json.loads(text)
+                except json.JSONDecodeError:
+                    if line.endswith(b"\n"):
+                        raise
+                    return
+                yield record, end
+            offset = end
@@ -0,0 +1,203 @@
+"""
+Keyword lexicon
+Versioned keyword lists with optional per-keyword score weights, loaded
+from a JSON file and reloaded in the background when the file changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Sequence, Tuple
+
+from .matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("risk", "positive", "neutral")
+# Score contribution of one keyword hit when the lexicon gives no weight.
+DEFAULT_WEIGHTS = {"risk": -1.5, "positive": 1.0, "neutral": 0.0}
+
+
+class Lexicon:
+    """Immutable risk/positive/neutral keyword lists.
+
+    A lexicon is never edited in place: changes build a new one, which is
+    swapped in as a whole.  ``version`` is a content hash of the lists and
+    weights, stable across processes; a lexicon without custom weights
+    hashes exactly like the plain keyword lists did.  The matcher is
+    compiled on first use, or ahead of the swap by ``compile()``.
+    """
+
+    def __init__(
+        self,
+        categories: Mapping[str, Sequence[str]],
+        weights: Mapping[str, Mapping[str, float]] | None = None,
+        source: str = "builtin",
+    ):
+        self.categories: Dict[str, Tuple[str, ...]] = {name: tuple(categories.get(name, ())) for name in CATEGORIES}
+        # Only weights that differ from the category default are kept.
+        self.weights: Dict[str, Dict[str, float]] = {}
+        for name, words in (weights or {}).items():
+            custom = {
+                word: float(weight)
+                for word, weight in words.items()
+                if word in self.categories[name] and float(weight) != DEFAULT_WEIGHTS[name]
+            }
+            if custom:
+                self.weights[name] = custom
+        self.source = source
+        self.loaded_at = time.time()
+        self._matcher: KeywordMatcher | None = None
+        digest = hashlib.sha1()
+        for name in CATEGORIES:
+            digest.update("\x1f".join(self.categories[name]).encode("utf-8"))
+            digest.update(b"\x1e")
+        if self.weights:
+            digest.update(json.dumps(self.weights, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+    @property
+    def weighted(self) -> bool:
+        return bool(self.weights)
+
+    def weight(self, category: str, word: str) -> float:
+        return self.weights.get(category, {}).get(word, DEFAULT_WEIGHTS[category])
+
+    def matcher_weights(self) -> Dict[str, Dict[str, float]] | None:
+        """Full category -> word -> weight table for ``KeywordMatcher``; None if unweighted."""
+        if not self.weighted:
+            return None
+        return {name: {word: self.weight(name, word) for word in words} for name, words in self.categories.items()}
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(self.categories, self.matcher_weights())
+        return self._matcher
+
+    def compile(self) -> "Lexicon":
+        self.matcher
+        return self
+
+    def with_words(self, category: str, words: Sequence[str]) -> "Lexicon":
+        """A copy with ``category`` replaced; weights of the words that remain are kept."""
+        categories = dict(self.categories, **{category: tuple(words)})
+        return Lexicon(categories, self.weights, self.source)
+
+    @classmethod
+    def load(cls, path: str) -> "Lexicon":
+        """Read a JSON lexicon.
+
+        Each category is a list of keywords, or an object mapping keywords to
+        their score weight; categories left out are empty.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("词表文件必须是 JSON 对象")
+        unknown = set(data) - set(CATEGORIES)
+        if unknown:
+            raise ValueError(f"未知的词表类别: {', '.join(sorted(unknown))}")
+        categories: Dict[str, Tuple[str, ...]] = {}
+        weights: Dict[str, Dict[str, float]] = {}
+        for name, entries in data.items():
+            if isinstance(entries, dict):
+                weights[name] = {}
+                for word, weight in entries.items():
+                    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                        raise ValueError(f"关键词权重必须是数字: {name}/{word}")
+                    weights[name][word] = weight
+                words = list(entries)
+            elif isinstance(entries, list):
+                words = entries
+            else:
+                raise ValueError(f"词表类别 {name} 必须是列表或对象")
+            if not all(isinstance(word, str) for word in words):
+                raise ValueError(f"词表类别 {name} 含有非字符串关键词")
+            categories[name] = tuple(words)
+        return cls(categories, weights, source=os.path.abspath(path))
+
+    def get_status(self) -> Dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "keywords": {name: len(words) for name, words in self.categories.items()},
+            "weighted": self.weighted,
+            "loaded_at": self.loaded_at,
+        }
+
+
+class LexiconWatcher:
+    """Reloads the lexicon file at ``path`` whenever it changes.
+
+    A daemon thread checks the file's mtime and size every ``poll`` seconds.
+    A changed file is parsed and its matcher compiled on that thread, then
+    handed to ``apply`` in one step; a file that fails to load is logged and
+    the lexicon in use stays.
+    """
+
+    def __init__(self, path: str, apply: Callable[[Lexicon], None], poll: float = 5.0):
+        self.path = path
+        self.apply = apply
+        self.poll = poll
+        self._mark: Tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.stats = {"reloads": 0, "failures": 0, "last_error": None}
+
+    def check(self) -> bool:
+        """Reload now if the file changed since the last check; True if a new lexicon was applied."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except OSError as exc:
+                self.stats["last_error"] = str(exc)
+                return False
+            mark = (st.st_mtime_ns, st.st_size)
+            if mark == self._mark:
+                return False
+            self._mark = mark
+            try:
+                lexicon = Lexicon.load(self.path).compile()
+            except Exception as exc:
+                self.stats["failures"] += 1
+                self.stats["last_error"] = str(exc)
+                logger.warning("词表加载失败 %s: %s", self.path, exc)
+                return False
+            self.apply(lexicon)
+            self.stats["reloads"] += 1
+            self.stats["last_error"] = None
+            return True
+
+    def start(self) -> None:
+        """Start the background thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="lexicon-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.poll):
+            self.check()
+
+    def get_status(self) -> Dict:
+        return {
+            "path": self.path,
+            "poll": self.poll,
+            "running": self._thread is not None and self._thread.is_alive(),
+            **self.stats,
+        }
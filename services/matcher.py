@@ -0,0 +1,99 @@
+"""
+Keyword matcher
+Aho-Corasick automaton that counts keyword hits for several categories in one pass.
+"""
+
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+
+class KeywordMatcher:
+    """Multi-pattern matcher compiled from named keyword categories.
+
+    ``count`` reports, per category, how many keyword entries occur in the text
+    at least once -- the same numbers as ``sum(1 for w in words if w in text)``
+    for each category, but computed with a single scan over the text.
+
+    With ``weights`` (category -> word -> score weight) each count row gets
+    one more element: the summed weight of the entries that occur.
+    """
+
+    def __init__(
+        self,
+        categories: Dict[str, Sequence[str]],
+        weights: Mapping[str, Mapping[str, float]] | None = None,
+    ):
+        self.categories = tuple(categories)
+        self.weighted = weights is not None
+        width = len(self.categories) + self.weighted
+        # One weight vector per distinct pattern: how many entries of each
+        # category it stands for (duplicates and shared words count per entry),
+        # followed by their summed score weight for weighted matchers.
+        rows: Dict[str, List[float]] = {}
+        for pos, name in enumerate(self.categories):
+            for word in categories[name]:
+                row = rows.setdefault(word, [0] * width)
+                row[pos] += 1
+                if weights is not None:
+                    row[-1] += weights[name][word]
+        # The empty string is "in" every text, so it is a constant base count.
+        self._base = tuple(rows.pop("", [0] * width))
+        self.patterns: Tuple[str, ...] = tuple(rows)
+        self._weights = [tuple(rows[p]) for p in self.patterns]
+        self._delta, self._out = self._compile(self.patterns)
+
+    @staticmethod
+    def _compile(patterns: Sequence[str]):
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for pid, word in enumerate(patterns):
+            state = 0
+            for ch in word:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Breadth-first failure links, folded into a full transition table so
+        # matching never walks the failure chain.  Transitions back to the root
+        # are left out; a missing key means "go to state 0".
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            trans = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                trans[ch] = nxt
+                queue.append(nxt)
+            delta[state] = trans
+        return delta, [tuple(o) for o in out]
+
+    def matches(self, text: str) -> set:
+        """Return the ids of all patterns occurring in ``text``."""
+        delta = self._delta
+        out = self._out
+        state = 0
+        found = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def count(self, text: str) -> Tuple[int, ...]:
+        """Return per-category hit counts in category order (plus the weight sum if weighted)."""
+        counts = list(self._base)
+        weights = self._weights
+        for pid in self.matches(text):
+            for pos, n in enumerate(weights[pid]):
+                counts[pos] += n
+        return tuple(counts)
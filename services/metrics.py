@@ -0,0 +1,243 @@
+"""
+Metrics
+Latency histograms, counters and gauges rendered in the Prometheus text format,
+plus an opt-in sampling profiler for single requests.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, List, Tuple, Union
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeValue = Union[float, List[Tuple[Dict[str, object], float]]]
+
+
+def _labels(labels: Dict[str, object] | None) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "articles", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict | None, articles: int | None):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.articles = articles
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.labels)
+        if self.articles:
+            self.metrics.inc(self.name.replace("_seconds", "_articles_total"), self.articles, self.labels)
+
+
+class _NullTimer:
+    """Returned while metrics are disabled: entering and leaving it costs nothing."""
+
+    __slots__ = ("articles",)
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every ``interval`` seconds.
+
+    Stacks are kept in collapsed form ("outer;inner;leaf") with sample counts,
+    which flame-graph tools accept directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            parts: List[str] = []
+            while frame is not None and len(parts) < self.max_depth:
+                code = frame.f_code
+                parts.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(parts))] += 1
+            self.samples += 1
+
+    def stop(self, top: int = 50) -> Dict:
+        self._stop.set()
+        self._thread.join()
+        return {
+            "interval_ms": self.interval * 1000,
+            "duration_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "samples": self.samples,
+            "stacks": [{"stack": stack, "count": count} for stack, count in self.stacks.most_common(top)],
+        }
+
+
+class Metrics:
+    """Process-wide registry.
+
+    ``timer()`` is meant for hot paths: with ``enabled`` False it returns a
+    shared no-op context manager and records nothing.  Gauges are callbacks
+    evaluated only when the registry is rendered.
+    """
+
+    def __init__(self, enabled: bool = True, profiling: bool = False, max_profiles: int = 20):
+        self.enabled = enabled
+        self.profiling = profiling
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Callable[[], GaugeValue]] = {}
+        self._help: Dict[str, str] = {}
+        self._profiles: OrderedDict = OrderedDict()
+
+    def describe(self, name: str, text: str) -> None:
+        self._help[name] = text
+
+    def timer(self, name: str, labels: Dict | None = None, articles: int | None = None):
+        """``with metrics.timer("pipeline_stage_seconds", {"stage": "glob"}): ...``"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels, articles)
+
+    def observe(self, name: str, seconds: float, labels: Dict | None = None) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name: str, value: float = 1, labels: Dict | None = None) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def gauge(self, name: str, fn: Callable[[], GaugeValue], text: str = "") -> None:
+        """Register ``fn`` returning a number or a list of ``(labels, value)`` pairs."""
+        self._gauges[name] = fn
+        if text:
+            self._help[name] = text
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            histograms = {name: {k: (list(h.counts), h.sum, h.count) for k, h in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        for name in sorted(histograms):
+            self._header(lines, name, "histogram")
+            for labels, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS + (float("inf"),), counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for name in sorted(counters):
+            self._header(lines, name, "counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for name in sorted(self._gauges):
+            try:
+                value = self._gauges[name]()
+            except Exception:
+                continue
+            self._header(lines, name, "gauge")
+            for labels, v in (value if isinstance(value, list) else [(None, value)]):
+                lines.append(f"{name}{_format_labels(_labels(labels))} {float(v):g}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def start_profile(self, interval: float = 0.005) -> SamplingProfiler:
+        return SamplingProfiler(threading.get_ident(), interval).start()
+
+    def save_profile(self, profile: Dict) -> str:
+        profile_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get_profile(self, profile_id: str) -> Dict | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+metrics = Metrics(
+    enabled=os.getenv("METRICS_ENABLED", "1") != "0",
+    profiling=os.getenv("METRICS_PROFILE", "0") == "1",
+)
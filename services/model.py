@@ -0,0 +1,365 @@
+"""
+Model-backed sentiment scoring
+A small quantized text classifier loaded from a file, a micro-batcher that
+groups concurrent requests into one inference call, and the engine that
+loads the model once per process and reports readiness.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from .batch import LABELS
+from .hashing import HASH_VERSION, PRIME, mix64
+
+logger = logging.getLogger(__name__)
+
+# Texts are featurized in sub-batches of this many to bound temporary arrays.
+FEATURE_BATCH = 1024
+# Feature hash of model files that predate the ``feature_hash`` field.
+LEGACY_FEATURE_HASH = "fnv-splitmix64-v1"
+
+
+def hashed_ngrams(texts: Sequence[str], dim: int, ngram: int) -> tuple:
+    """Hashed character 1..``ngram``-grams of each text.
+
+    Returns ``(features, starts, counts)``: feature indices in ``[0, dim)``
+    for all texts concatenated, the offset of each text's first feature and
+    each text's feature count.  Whitespace is ignored; a text without
+    characters is featurized as one NUL so every segment is non-empty.
+    """
+    encoded = ["".join(text.split()).encode("utf-32-le") or b"\0\0\0\0" for text in texts]
+    lengths = np.fromiter((len(e) // 4 for e in encoded), dtype=np.int64, count=len(encoded))
+    cps = np.frombuffer(b"".join(encoded), dtype="<u4").astype(np.uint64)
+    ends = np.cumsum(lengths)
+    parts = []
+    counts = np.zeros(len(texts), dtype=np.int64)
+    codes = cps.copy()
+    for n in range(1, ngram + 1):
+        if n > 1:
+            codes = codes[:-1] * PRIME + cps[n - 1:]
+        # Keep only n-grams that start and end inside the same text.
+        pos = np.arange(len(codes))
+        owner = np.searchsorted(ends, pos, side="right")
+        valid = pos + n <= ends[np.minimum(owner, len(ends) - 1)]
+        keep = np.flatnonzero(valid)
+        parts.append((owner[keep], mix64(codes[keep] + np.uint64(n)) & np.uint64(dim - 1)))
+        counts += np.bincount(owner[keep], minlength=len(texts))
+    owners = np.concatenate([o for o, _ in parts])
+    features = np.concatenate([f for _, f in parts]).astype(np.int64)
+    order = np.argsort(owners, kind="stable")
+    return features[order], np.concatenate(([0], np.cumsum(counts)[:-1])), counts
+
+
+class LinearTextModel:
+    """Softmax regression over hashed character n-grams with int8 weights.
+
+    Probabilities are returned in ``batch.LABELS`` order (中性, 风险, 正面).
+    Stored as ``.npz``: ``weights`` (int8, ``dim x 3``), ``scale`` and
+    ``bias`` (float32, per class), ``ngram``, ``name`` and ``feature_hash``,
+    the ``hashing.HASH_VERSION`` the features were hashed with.  A file
+    hashed differently fails to load.
+    """
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        scale: np.ndarray,
+        bias: np.ndarray,
+        ngram: int = 2,
+        name: str = "linear",
+        feature_hash: str = HASH_VERSION,
+    ):
+        if feature_hash != HASH_VERSION:
+            raise ValueError(f"模型特征哈希 {feature_hash} 与当前 {HASH_VERSION} 不一致，请重新训练模型")
+        self.weights = weights
+        self.scale = scale.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.ngram = ngram
+        self.dim = len(weights)
+        self.name = name
+        self.feature_hash = feature_hash
+        if self.dim & (self.dim - 1):
+            raise ValueError("模型维度必须是 2 的幂")
+
+    @classmethod
+    def load(cls, path: str) -> "LinearTextModel":
+        with np.load(path, allow_pickle=False) as data:
+            # Files written before feature_hash was recorded used the first hash version.
+            feature_hash = str(data["feature_hash"]) if "feature_hash" in data.files else LEGACY_FEATURE_HASH
+            return cls(
+                data["weights"], data["scale"], data["bias"], int(data["ngram"]), str(data["name"]), feature_hash
+            )
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                weights=self.weights,
+                scale=self.scale,
+                bias=self.bias,
+                ngram=self.ngram,
+                name=self.name,
+                feature_hash=self.feature_hash,
+            )
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.empty((len(texts), len(LABELS)), dtype=np.float32)
+        for lo in range(0, len(texts), FEATURE_BATCH):
+            out[lo:lo + FEATURE_BATCH] = self._predict(texts[lo:lo + FEATURE_BATCH])
+        return out
+
+    def _predict(self, texts: Sequence[str]) -> np.ndarray:
+        features, starts, counts = hashed_ngrams(texts, self.dim, self.ngram)
+        sums = np.add.reduceat(self.weights[features].astype(np.float32), starts, axis=0)
+        logits = sums * (self.scale / np.sqrt(np.maximum(counts, 1))[:, None]) + self.bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+
+def train_linear_model(
+    texts: Sequence[str],
+    labels: Sequence[int],
+    dim: int = 1 << 18,
+    ngram: int = 2,
+    epochs: int = 50,
+    lr: float = 5.0,
+    name: str = "linear",
+) -> LinearTextModel:
+    """Fit a ``LinearTextModel`` by full-batch gradient descent, then quantize to int8."""
+    features, starts, counts = hashed_ngrams(texts, dim, ngram)
+    norm = np.repeat(1.0 / np.sqrt(counts), counts).astype(np.float32)[:, None]
+    # Each weight moves by the mean gradient of the texts it occurs in.
+    frequency = np.maximum(np.bincount(features, minlength=dim), 1)
+    y = np.eye(len(LABELS), dtype=np.float32)[np.asarray(labels)]
+    weights = np.zeros((dim, len(LABELS)), dtype=np.float32)
+    bias = np.zeros(len(LABELS), dtype=np.float32)
+    for _ in range(epochs):
+        logits = np.add.reduceat(weights[features] * norm, starts, axis=0) + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        grad = probs - y
+        per_feature = np.repeat(grad, counts, axis=0) * norm
+        for label in range(len(LABELS)):
+            weights[:, label] -= lr * np.bincount(features, per_feature[:, label], minlength=dim) / frequency
+        bias -= lr * grad.mean(axis=0)
+    scale = np.maximum(np.abs(weights).max(axis=0), 1e-8) / 127.0
+    quantized = np.round(weights / scale).astype(np.int8)
+    return LinearTextModel(quantized, scale, bias, ngram, name)
+
+
+# File extension -> loader; a loaded model needs ``predict(texts) -> (n, 3) probabilities`` and ``name``.
+MODEL_LOADERS: Dict[str, Callable[[str], object]] = {".npz": LinearTextModel.load}
+
+
+def load_model(path: str):
+    loader = MODEL_LOADERS.get(os.path.splitext(path)[1].lower())
+    if loader is None:
+        raise ValueError(f"不支持的模型文件格式: {path}（支持 {', '.join(MODEL_LOADERS)}）")
+    return loader(path)
+
+
+class MicroBatcher:
+    """Groups concurrent ``predict`` calls into batches on one worker thread.
+
+    A batch closes when it holds ``max_batch`` texts or ``max_delay``
+    seconds after its first request arrived, whichever comes first.  A
+    single request is never split, so a large one runs as its own batch.
+    """
+
+    def __init__(self, predict: Callable[[List[str]], np.ndarray], max_batch: int = 64, max_delay: float = 0.005):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "texts": 0}
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="model-batcher", daemon=True)
+                self._thread.start()
+        self._queue.put((list(texts), future))
+        return future
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_delay
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            self._run(batch, size)
+
+    def _run(self, batch: list, size: int) -> None:
+        texts = [text for request, _ in batch for text in request]
+        try:
+            probs = self.predict(texts) if texts else np.zeros((0, len(LABELS)), dtype=np.float32)
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["texts"] += size
+        offset = 0
+        for request, future in batch:
+            future.set_result(probs[offset:offset + len(request)])
+            offset += len(request)
+
+    def get_status(self) -> Dict:
+        stats = dict(self.stats)
+        stats["avg_batch"] = round(stats["texts"] / stats["batches"], 1) if stats["batches"] else 0.0
+        stats["max_batch"] = self.max_batch
+        stats["max_delay_ms"] = self.max_delay * 1000
+        return stats
+
+
+class ModelEngine:
+    """Loads the model at ``path`` once per process and serves it through a ``MicroBatcher``.
+
+    ``warm()`` loads in a background thread (startup warm-up); otherwise the
+    first ``available()`` call loads synchronously.  Callbacks in
+    ``on_ready`` run once the model can serve.
+    """
+
+    def __init__(self, path: str, max_batch: int = 64, max_delay: float = 0.005):
+        self.path = path
+        self.model = None
+        self.state = "unloaded"  # unloaded -> loading -> ready | failed
+        self.error: str | None = None
+        self.load_seconds: float | None = None
+        self.on_ready: List[Callable[[], None]] = []
+        self.batcher = MicroBatcher(self._predict, max_batch, max_delay)
+        self._lock = threading.Lock()
+
+    @property
+    def fingerprint(self) -> str:
+        """Identity of the model file and feature hash, used to version scores it produced."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return "missing"
+        identity = f"{os.path.abspath(self.path)}|{st.st_mtime_ns}|{st.st_size}|{HASH_VERSION}"
+        return hashlib.sha1(identity.encode()).hexdigest()[:12]
+
+    def load(self) -> bool:
+        """Load the model unless already done; blocks while another thread loads it."""
+        with self._lock:
+            if self.state in ("ready", "failed"):
+                return self.state == "ready"
+            self.state = "loading"
+            start = time.perf_counter()
+            try:
+                model = load_model(self.path)
+                model.predict(["预热"])  # first call allocates; keep it off the request path
+            except Exception as exc:
+                self.state, self.error = "failed", str(exc)
+                logger.warning("情感模型加载失败 %s: %s", self.path, exc)
+                return False
+            self.model = model
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            self.state = "ready"
+        for callback in self.on_ready:
+            callback()
+        return True
+
+    def warm(self) -> None:
+        """Load in the background; callers fall back to keywords until ready."""
+        with self._lock:
+            if self.state != "unloaded":
+                return
+            self.state = "loading"
+        threading.Thread(target=self.load, name="model-warmup", daemon=True).start()
+
+    def available(self, wait: bool = True) -> bool:
+        """Whether the model can serve now; loads it first if nobody has started to."""
+        if self.state == "unloaded" and wait:
+            return self.load()
+        return self.state == "ready"
+
+    def _predict(self, texts: List[str]) -> np.ndarray:
+        return self.model.predict(texts)
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        """``(len(texts), 3)`` class probabilities, batched with concurrent callers."""
+        return self.batcher(texts)
+
+    def get_status(self) -> Dict:
+        return {
+            "path": self.path,
+            "name": getattr(self.model, "name", None),
+            "state": self.state,
+            "ready": self.state == "ready",
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+            "batching": self.batcher.get_status(),
+        }
+
+
+def _load_training_set(path: str) -> tuple:
+    """Texts and label codes; records without a label are labelled by the keyword analyzer."""
+    from .jsonstream import iter_json_records
+    from .sentiment import sentiment_analyzer
+
+    codes = {label: code for code, label in enumerate(LABELS)}
+    texts, labels = [], []
+    for record in iter_json_records(path):
+        content = record.get("content") or record.get("title")
+        if not content:
+            continue
+        title = record.get("title") or ""
+        label = record.get("label") or record.get("sentiment_label")
+        if label not in codes:
+            label = sentiment_analyzer._analyze_with_keywords(f"{title} {content}".lower())["sentiment_label"]
+        texts.append(f"{title} {content}".lower())
+        labels.append(codes[label])
+    return texts, labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train a LinearTextModel for SENTIMENT_MODEL_PATH")
+    parser.add_argument("corpus", help="crawler JSON / JSON Lines; uses `label` if present, else keyword labels")
+    parser.add_argument("output", help="model file (.npz)")
+    parser.add_argument("--dim", type=int, default=1 << 18)
+    parser.add_argument("--ngram", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--lr", type=float, default=5.0)
+    args = parser.parse_args()
+    texts, labels = _load_training_set(args.corpus)
+    model = train_linear_model(texts, labels, dim=args.dim, ngram=args.ngram, epochs=args.epochs, lr=args.lr,
+                               name=os.path.splitext(os.path.basename(args.output))[0])
+    model.save(args.output)
+    predicted = model.predict(texts).argmax(axis=1)
+    print(json.dumps({"texts": len(texts), "train_accuracy": round(float((predicted == np.asarray(labels)).mean()), 4)}))
+
+
+if __name__ == "__main__":
+    main()
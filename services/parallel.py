@@ -0,0 +1,98 @@
+"""
+Parallel keyword scoring
+Shards keyword matching across a reusable process pool for large backfills.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .matcher import KeywordMatcher
+
+# Matchers compiled inside each worker process, keyed by keyword fingerprint.
+_worker_matchers: Dict[str, KeywordMatcher] = {}
+
+
+def _count_chunk(
+    fingerprint: str,
+    categories: Dict[str, Sequence[str]],
+    texts: List[str],
+    weights: Mapping[str, Mapping[str, float]] | None = None,
+) -> List[Tuple[int, ...]]:
+    matcher = _worker_matchers.get(fingerprint)
+    if matcher is None:
+        _worker_matchers.clear()
+        matcher = _worker_matchers[fingerprint] = KeywordMatcher(categories, weights)
+    count = matcher.count
+    return [count(text) for text in texts]
+
+
+class ParallelScorer:
+    """Counts keyword hits for many texts on a pool of worker processes.
+
+    Texts are split into ``chunk_size`` shards; results come back in input
+    order regardless of which worker finished first.  The pool is started on
+    first use and reused by later calls until ``shutdown``.
+    """
+
+    def __init__(self, workers: int | None = None, chunk_size: int = 500):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" avoids forking a multi-threaded web worker.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def count(
+        self,
+        fingerprint: str,
+        categories: Dict[str, Sequence[str]],
+        texts: Sequence[str],
+        weights: Mapping[str, Mapping[str, float]] | None = None,
+    ) -> np.ndarray:
+        """Return an ``(len(texts), len(categories))`` int32 array of hit counts.
+
+        With ``weights`` the array is float64 with the weight sum as an extra column.
+        """
+        if weights is None:
+            counts = np.zeros((len(texts), len(categories)), dtype=np.int32)
+        else:
+            counts = np.zeros((len(texts), len(categories) + 1), dtype=np.float64)
+        if not len(texts):
+            return counts
+        size = self.chunk_size
+        chunks = [list(texts[i:i + size]) for i in range(0, len(texts), size)]
+        futures = [self._pool().submit(_count_chunk, fingerprint, categories, chunk, weights) for chunk in chunks]
+        row = 0
+        for future in futures:
+            result = future.result()
+            counts[row:row + len(result)] = result
+            row += len(result)
+        return counts
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def get_status(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "running": self._executor is not None,
+        }
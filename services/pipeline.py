@@ -9,13 +9,29 @@ Pipeline orchestration for market risk detection.
 from __future__ import annotations
 
 import glob
-import json
 import os
+import re
+import threading
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
 
+from .aggregator import RiskAggregator
+from .article import Article
+from .batch import BatchScores
+from .colstore import SUFFIX as COLUMNAR_SUFFIX, ColumnarArticles, is_columnar, write_columnar
+from .dedup import NearDuplicateIndex
+from .events import AlertStream
+from .index import ArticleIndex
+from .ingest import ArticleStore
+from .timeseries import WINDOWS, RiskTimeSeries
+from .jsonstream import iter_json_records
+from .metrics import metrics
 from .sentiment import sentiment_analyzer
 from .brief import brief_generator
+from .jobs import brief_queue
+from .scheduler import PipelineScheduler
 
 # Seed news (fallback when no crawler data is available)
 SEED_NEWS = [
@@ -100,71 +116,262 @@ SEED_NEWS = [
         "stock_industry": "金融",
     },
 ]
-def load_news() -> List[Dict]:
+
+# Process-level cache of the analyzed corpus, see load_corpus().
+_corpus_cache: Dict = {}
+_corpus_lock = threading.Lock()
+
+# Articles are scored in chunks of this size when streamed through analysis.
+ANALYZE_CHUNK_SIZE = 1000
+
+# With CRAWLER_LATEST_PER_STOCK=1 only the newest run file of each stock is
+# ingested (see latest_per_stock); files of older runs are retracted.
+LATEST_PER_STOCK = os.getenv("CRAWLER_LATEST_PER_STOCK", "0") == "1"
+# Changed crawler files are read on this many threads (helps most on network storage).
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Crawler run files: articles_<stock_code>_<YYYYMMDD>_<HHMMSS>.json / .jsonl / .cols
+_RUN_FILE = re.compile(r"^articles_(?P<stock>.+)_(?P<run>\d{8}_\d{6})$")
+
+# Histogram of per-stage latency, labelled by stage (glob, ingest, sentiment, ...).
+STAGE_SECONDS = "pipeline_stage_seconds"
+
+
+def load_news(path: str | None = None) -> List[Dict]:
     """Load news from crawler JSON if available; fallback to seeds."""
-    data = _load_from_json()
+    data = _load_from_json(path)
     if data:
         return data
     return [item.copy() for item in SEED_NEWS]
 
 
-def analyze_news(news_items: List[Dict]) -> List[Dict]:
+def iter_news(path: str | None = None) -> Iterator[Dict]:
+    """Stream normalized articles from a crawler JSON/JSON Lines or columnar file."""
+    path = path or _find_latest_json()
+    if not path:
+        return
+    if is_columnar(path):
+        table = ColumnarArticles(path)
+        try:
+            yield from table.iter_news()
+        finally:
+            table.close()
+        return
+    for idx, item in enumerate(iter_json_records(path), 1):
+        yield _normalize_article(item, idx)
+
+
+def convert_to_columnar(json_path: str, out_path: str | None = None) -> str:
+    """Analyze a crawler JSON file and save it as a memory-mappable columnar file."""
+    out_path = out_path or os.path.splitext(json_path)[0] + COLUMNAR_SUFFIX
+    write_columnar(
+        out_path,
+        iter_analyzed(iter_news(json_path)),
+        meta={"source": os.path.basename(json_path), "keyword_fingerprint": sentiment_analyzer.scoring_fingerprint},
+    )
+    return out_path
+
+
+def load_corpus() -> Dict:
+    """Return the analyzed corpus built from every crawler file seen so far.
+
+    New files and newly appended records are merged into ``article_store``;
+    the derived alerts and dashboard are reused until the store or the
+    keyword lists change.  Callers must treat the result as read-only.
+    """
+    with _corpus_lock:
+        keyword_version = sentiment_analyzer.scoring_version
+        if _corpus_cache.get("keyword_version", keyword_version) != keyword_version:
+            with metrics.timer(STAGE_SECONDS, {"stage": "reanalyze"}), alert_stream.quiet():
+                article_store.reanalyze()
+        _corpus_cache["keyword_version"] = keyword_version
+        with metrics.timer(STAGE_SECONDS, {"stage": "glob"}):
+            paths = _find_json_files()
+            if LATEST_PER_STOCK:
+                paths, superseded = latest_per_stock(paths)
+                article_store.forget(superseded)
+        # The first load backfills history: its alerts are not news to subscribers.
+        backfill = alert_stream.quiet() if not _corpus_cache.get("ingested") else nullcontext()
+        with metrics.timer(STAGE_SECONDS, {"stage": "ingest"}) as timer, backfill:
+            timer.articles = article_store.refresh(paths, workers=INGEST_WORKERS)
+        _corpus_cache["ingested"] = True
+        key = (article_store.version, keyword_version)
+        corpus = _corpus_cache.get("corpus")
+        if corpus is not None and corpus["key"] == key:
+            metrics.inc("corpus_cache_requests_total", 1, {"result": "hit"})
+            return corpus
+        metrics.inc("corpus_cache_requests_total", 1, {"result": "miss"})
+        with metrics.timer(STAGE_SECONDS, {"stage": "aggregate"}):
+            processed = article_store.values()
+            aggregator, index, timeseries = store_aggregator, store_index, store_timeseries
+            used_seed = not processed
+            if used_seed:
+                processed = analyze_news(item.copy() for item in SEED_NEWS)
+                aggregator, index, timeseries = (
+                    RiskAggregator(processed), ArticleIndex(processed), RiskTimeSeries(processed)
+                )
+            corpus = {
+                "key": key,
+                "version": _corpus_version(used_seed),
+                "json_path": paths[-1] if paths else "",
+                "used_seed": used_seed,
+                "processed": processed,
+                "alerts": aggregator.alerts(),
+                "dashboard": aggregator.dashboard(),
+                "risk_articles": aggregator.risk_articles(),
+                "summary": aggregator.summary(),
+                "index": index,
+                "timeseries": timeseries,
+            }
+        _corpus_cache["corpus"] = corpus
+        return corpus
+
+
+def _corpus_version(used_seed: bool) -> str:
+    """Identity of the corpus contents that stays stable across restarts.
+
+    Built from every ingested file's (path, mtime, size) watermark and the
+    scoring fingerprint (keyword lists and model file); ``article_store.version`` only counts changes
+    within this process.
+    """
+    files = sorted((path, mark["mtime_ns"], mark["size"]) for path, mark in article_store.watermarks.items())
+    return repr((files, sentiment_analyzer.scoring_fingerprint, used_seed))
+
+
+def clear_corpus_cache() -> None:
+    with _corpus_lock:
+        _corpus_cache.clear()
+        article_store.clear()
+
+
+def score_news(news_items: List[Dict], groups: List | None = None, memo=None) -> BatchScores:
+    """Score all articles in one batch; results stay in columnar form."""
+    return sentiment_analyzer.score_batch(
+        [item.get("content", "") for item in news_items],
+        [item.get("title", "") for item in news_items],
+        groups,
+        memo,
+    )
+
+
+def analyze_news(news_items: Iterable[Dict]) -> List[Article]:
+    return list(iter_analyzed(news_items))
+
+
+def iter_analyzed(news_items: Iterable[Dict], chunk_size: int | None = None) -> Iterator[Article]:
+    """Analyze articles chunk by chunk, yielding results as each chunk is scored."""
+    if chunk_size is None:
+        chunk_size = ANALYZE_CHUNK_SIZE
+        parallel = sentiment_analyzer.parallel
+        if parallel is not None:
+            # Give every pool worker at least one shard per chunk.
+            chunk_size = max(chunk_size, parallel.workers * parallel.chunk_size)
+    items = iter(news_items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield from _analyze_chunk(chunk)
+
+
+def _analyze_chunk(news_items: List[Dict]) -> List[Article]:
+    clusters, sentiments = _score_clustered(news_items)
     analyzed = []
-    for item in news_items:
-        sentiment = sentiment_analyzer.analyze(item.get("content", ""), item.get("title", ""))
-        enriched = {**item, **sentiment}
-        enriched["is_risk"] = enriched.get("sentiment_label") == "风险"
-        enriched["alert"] = enriched["is_risk"] and enriched.get("confidence", 0) >= 0.6
-        enriched["score_bucket"] = _bucket_score(enriched.get("sentiment_score", 0))
-        analyzed.append(enriched)
+    for item, cluster, sentiment in zip(news_items, clusters, sentiments):
+        article = Article(item, sentiment, cluster)
+        article.is_risk = article.sentiment_label == "风险"
+        article.alert = article.is_risk and article.confidence >= 0.6
+        article.score_bucket = _bucket_score(article.sentiment_score)
+        analyzed.append(article)
     return analyzed
 
 
-def compute_dashboard(processed_news: List[Dict]) -> Dict:
-    total = len(processed_news)
-    risk_news = [n for n in processed_news if n.get("is_risk")]
-    risk_count = len(risk_news)
-    avg_confidence = round(sum(n.get("confidence", 0) for n in risk_news) / risk_count, 3) if risk_count else 0
-    alert_count = sum(1 for n in processed_news if n.get("alert"))
-    high_risk = sum(1 for n in processed_news if n.get("sentiment_score", 0) < -0.5)
-    medium_risk = sum(1 for n in processed_news if -0.5 <= n.get("sentiment_score", 0) < -0.2)
-    keyword_total = sum(n.get("keyword_counts", {}).get("risk", 0) for n in processed_news)
-    return {
-        "total_news": total,
-        "risk_news_count": risk_count,
-        "risk_ratio": round((risk_count / total) * 100, 1) if total else 0,
-        "avg_confidence": avg_confidence,
-        "alert_count": alert_count,
-        "high_risk": high_risk,
-        "medium_risk": medium_risk,
-        "keyword_hits": int(keyword_total),
-        "update_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    }
+class _ClusterModelMemo:
+    """Model probabilities remembered per near-duplicate cluster (see ``SentimentAnalyzer.score_batch``)."""
 
+    def __init__(self, index: NearDuplicateIndex, fingerprint: str):
+        self.index = index
+        self.fingerprint = fingerprint
+
+    def get(self, cluster: int) -> tuple | None:
+        return self.index.sentiment(cluster, self.fingerprint)
+
+    def put(self, cluster: int, probs: tuple) -> None:
+        self.index.remember(cluster, self.fingerprint, probs)
+
+
+def _score_clustered(news_items: List[Dict]) -> tuple:
+    """Cluster near-duplicates, then score every article.
+
+    Returns ``(cluster ids, sentiment tuples)`` aligned with ``news_items``.
+    Each article keeps its own keyword counts and keyword score, so a
+    member that differs from its cluster in a risk term is still flagged;
+    only the model prediction is shared per cluster, and remembered across
+    chunks until the keyword lists or model change.
+    """
+    if near_duplicates is None:
+        with metrics.timer(STAGE_SECONDS, {"stage": "sentiment"}, articles=len(news_items)):
+            scores = score_news(news_items)
+            return [None] * len(news_items), [scores.sentiment(i) for i in range(len(scores))]
+    clusters = _assign_clusters(news_items)
+    memo = _ClusterModelMemo(near_duplicates, sentiment_analyzer.scoring_fingerprint)
+    with metrics.timer(STAGE_SECONDS, {"stage": "sentiment"}, articles=len(news_items)):
+        scores = score_news(news_items, clusters, memo)
+    return clusters, [scores.sentiment(i) for i in range(len(scores))]
 
-def generate_alerts(processed_news: List[Dict]) -> List[Dict]:
-    return [
-        {
-            "id": n["id"],
-            "title": n["title"],
-            "stock_code": n.get("stock_code"),
-            "confidence": n.get("confidence"),
-            "sentiment_score": n.get("sentiment_score"),
-            "publish_time": n.get("publish_time"),
-        }
-        for n in processed_news
-        if n.get("alert")
-    ]
+
+def _assign_clusters(news_items: List[Dict]) -> List[int | None]:
+    """Near-duplicate cluster of each article with content (None without)."""
+    with metrics.timer(STAGE_SECONDS, {"stage": "dedup"}, articles=len(news_items)):
+        clusters: List[int | None] = [None] * len(news_items)
+        with_content = [i for i, item in enumerate(news_items) if item.get("content")]
+        ids = near_duplicates.assign_batch(
+            [f"{news_items[i].get('title', '')} {news_items[i]['content']}" for i in with_content]
+        )
+        for i, cluster in zip(with_content, ids):
+            clusters[i] = cluster
+        return clusters
+
+
+def iter_restored(articles: Iterable[Article]) -> Iterator[Article]:
+    """Articles read back with their stored analysis, given their near-duplicate clusters.
+
+    Cluster ids are local to this process's index, so columnar files do not
+    store them; they are assigned again here, as analysis would have.
+    """
+    if near_duplicates is None:
+        yield from articles
+        return
+    items = iter(articles)
+    while True:
+        chunk = list(islice(items, ANALYZE_CHUNK_SIZE))
+        if not chunk:
+            return
+        for article, cluster in zip(chunk, _assign_clusters(chunk)):
+            article.cluster_id = cluster
+        yield from chunk
+
+
+def compute_dashboard(processed_news: List[Article]) -> Dict:
+    return RiskAggregator(processed_news).dashboard()
+
+
+def generate_alerts(processed_news: List[Article]) -> List[Dict]:
+    """Alerts with near-duplicate articles collapsed into one entry per story."""
+    return RiskAggregator(processed_news).alerts()
 
 
 def run_pipeline() -> Dict:
-    news = load_news()
-    processed = analyze_news(news)
-    alerts = generate_alerts(processed)
-    dashboard = compute_dashboard(processed)
-    risk_articles = [n["title"] for n in processed if n.get("is_risk")]
-    brief = brief_generator.generate_risk_briefing("000000", "市场组合", risk_articles)
-    market_report = brief_generator.generate_market_report(processed)
+    with metrics.timer(STAGE_SECONDS, {"stage": "total"}):
+        corpus = load_corpus()
+        processed = corpus["processed"]
+        alerts = corpus["alerts"]
+        dashboard = corpus["dashboard"]
+        risk_articles = corpus["risk_articles"]
+        with metrics.timer(STAGE_SECONDS, {"stage": "brief"}):
+            brief = brief_queue.generate("000000", "市场组合", risk_articles)
+        with metrics.timer(STAGE_SECONDS, {"stage": "market_report"}):
+            summary = dict(corpus["summary"], window=dict(corpus["timeseries"].window(WINDOWS["24h"]), label="24h"))
+            market_report = brief_generator.generate_market_report(processed, summary=summary)
     return {
         "news": processed,
         "alerts": alerts,
@@ -174,6 +381,18 @@ def run_pipeline() -> Dict:
     }
 
 
+def data_signature() -> tuple:
+    """Cheap fingerprint of the pipeline inputs: crawler files and keyword lists."""
+    files = []
+    for path in _find_json_files():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(files), sentiment_analyzer.scoring_version
+
+
 def _bucket_score(score: float) -> str:
     if score < -0.5:
         return "高风险"
@@ -184,44 +403,74 @@ def _bucket_score(score: float) -> str:
     return "正面"
 
 
-def _load_from_json() -> List[Dict]:
+def _load_from_json(path: str | None = None) -> List[Dict]:
     """Read latest crawler JSON; return sanitized list or empty."""
-    path = _find_latest_json()
-    if not path:
-        return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
-        if not isinstance(payload, list):
-            return []
-        items = []
-        for idx, item in enumerate(payload, 1):
-            normalized = _normalize_article(item, idx)
-            items.append(normalized)
-        return items
+        return list(iter_news(path))
     except Exception:
         return []
 
 
 def _find_latest_json() -> str | None:
     """Pick latest JSON from env path or known folders."""
+    paths = _find_json_files()
+    return paths[-1] if paths else None
+
+
+def _find_json_files() -> List[str]:
+    """List crawler JSON files from env path or known folders, oldest first."""
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     patterns = [
         os.getenv("CRAWLER_JSON_PATH"),
         os.path.join(base_dir, "data", "*.json"),
+        os.path.join(base_dir, "data", "*.jsonl"),
+        os.path.join(base_dir, "data", "*" + COLUMNAR_SUFFIX),
         os.path.join(base_dir, "..", "market-risk-analysis", "src", "crawler", "articles_*.json"),
+        os.path.join(base_dir, "..", "market-risk-analysis", "src", "crawler", "articles_*.jsonl"),
+        os.path.join(base_dir, "..", "market-risk-analysis", "src", "crawler", "articles_*" + COLUMNAR_SUFFIX),
     ]
-    candidates: List[str] = []
+    candidates: Dict[str, float] = {}
     for pattern in patterns:
         if not pattern:
             continue
-        if os.path.isfile(pattern):
-            candidates.append(pattern)
+        paths = [pattern] if os.path.isfile(pattern) else glob.glob(pattern)
+        for path in paths:
+            try:
+                candidates[os.path.abspath(path)] = os.path.getmtime(path)
+            except OSError:
+                continue
+    return sorted(candidates, key=candidates.get)
+
+
+def parse_run_file(path: str) -> tuple | None:
+    """``(stock_code, run)`` from a crawler run file name, e.g. ``articles_600519_20260116_140030.json``."""
+    match = _RUN_FILE.match(os.path.splitext(os.path.basename(path))[0])
+    return (match["stock"], match["run"]) if match else None
+
+
+def latest_per_stock(paths: List[str]) -> tuple:
+    """Split ``paths`` (oldest first) into ``(selected, superseded)``.
+
+    Per stock only the run with the newest timestamp in its name is kept;
+    among files of the same run the most recently modified wins.  Files not
+    named like a crawler run are always selected.
+    """
+    latest: Dict[str, tuple] = {}
+    superseded: List[str] = []
+    for path in paths:
+        parsed = parse_run_file(path)
+        if parsed is None:
+            continue
+        stock, run = parsed
+        current = latest.get(stock)
+        if current is None or run >= current[0]:
+            if current is not None:
+                superseded.append(current[1])
+            latest[stock] = (run, path)
         else:
-            candidates.extend(glob.glob(pattern))
-    if not candidates:
-        return None
-    return max(candidates, key=os.path.getmtime)
+            superseded.append(path)
+    dropped = set(superseded)
+    return [path for path in paths if path not in dropped], superseded
 
 
 def _normalize_article(item: Dict, idx: int) -> Dict:
@@ -239,22 +488,114 @@ def _normalize_article(item: Dict, idx: int) -> Dict:
         "stock_code": stock_code,
         "stock_name": item.get("stock_name", stock_code),
         "stock_industry": item.get("stock_industry", "未知"),
+        "url": item.get("url", ""),
     }
 
 
-def get_data_source_info() -> Dict:
-    """Return info about which JSON is used and counts."""
-    path = _find_latest_json()
-    info: Dict = {
-        "json_path": path or "",
-        "used_seed": False,
-        "news_count": 0,
+def get_data_source_info(corpus: Dict | None = None) -> Dict:
+    """Return info about which JSON is used and counts (for ``corpus``, default the current one)."""
+    corpus = corpus if corpus is not None else load_corpus()
+    counts = article_store.file_counts()
+    files = []
+    stocks: Dict[str, List[Dict]] = {}
+    for path, mark in article_store.watermarks.items():
+        entry = {"path": path, "format": mark["format"], "records": mark["records"], "articles": counts.get(path, 0)}
+        parsed = parse_run_file(path)
+        if parsed is not None:
+            entry["stock_code"], entry["run"] = parsed
+            stocks.setdefault(parsed[0], []).append({"path": path, "run": parsed[1], "articles": entry["articles"]})
+        files.append(entry)
+    return {
+        "json_path": corpus["json_path"],
+        "used_seed": corpus["used_seed"],
+        "news_count": len(corpus["processed"]),
+        "latest_per_stock": LATEST_PER_STOCK,
+        "files": files,
+        "stocks": stocks,
+        "near_duplicates": near_duplicates.get_status() if near_duplicates is not None else None,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
     }
-    data = _load_from_json()
-    if data:
-        info["news_count"] = len(data)
-        return info
-    info["used_seed"] = True
-    info["news_count"] = len(SEED_NEWS)
-    return info
+
+
+def _default_near_duplicates() -> NearDuplicateIndex | None:
+    """Clustering applied before scoring; NEAR_DUP_ENABLED=0 scores every article."""
+    if os.getenv("NEAR_DUP_ENABLED", "1") == "0":
+        return None
+    return NearDuplicateIndex(
+        threshold=float(os.getenv("NEAR_DUP_THRESHOLD", "0.6")),
+        max_clusters=int(os.getenv("NEAR_DUP_MAX_CLUSTERS", "200000")),
+    )
+
+
+# Near-duplicate clusters of every analyzed article; see _score_clustered().
+near_duplicates = _default_near_duplicates()
+# Rolling store of every crawler file ingested by load_corpus().
+article_store = ArticleStore(
+    normalize=_normalize_article,
+    analyze=iter_analyzed,
+    fingerprint=lambda: sentiment_analyzer.scoring_fingerprint,
+    restore=iter_restored,
+)
+# Dashboard, alerts and brief summary of article_store, updated per upsert.
+store_aggregator = RiskAggregator()
+# Per-stock / per-industry lookups and rollups over article_store.
+store_index = ArticleIndex()
+# Minute/hour ring buffers for sliding-window risk metrics.
+store_timeseries = RiskTimeSeries()
+# New alerts, pushed once each to /api/alerts/stream subscribers.
+alert_stream = AlertStream(
+    retention=int(os.getenv("ALERT_STREAM_RETENTION", "1000")),
+    max_subscribers=int(os.getenv("ALERT_STREAM_MAX_CLIENTS", "100")),
+)
+article_store.observers.extend([store_aggregator, store_index, store_timeseries, alert_stream])
+# Background recompute of run_pipeline(), served by /api/pipeline.
+pipeline_scheduler = PipelineScheduler(
+    run_pipeline,
+    data_signature,
+    interval=float(os.getenv("PIPELINE_INTERVAL", "300")),
+    poll=float(os.getenv("PIPELINE_POLL", "10")),
+)
+
+metrics.describe(STAGE_SECONDS, "Latency of each pipeline stage")
+metrics.describe("pipeline_stage_articles_total", "Articles processed per pipeline stage")
+metrics.describe("corpus_cache_requests_total", "load_corpus() calls served from / rebuilding the corpus cache")
+metrics.gauge("corpus_articles", lambda: len(article_store), "Articles held in the ingest store")
+metrics.gauge(
+    "sentiment_cache_hit_rate",
+    lambda: sentiment_analyzer.result_cache.stats()["hit_rate"] if sentiment_analyzer.result_cache else 0.0,
+    "Hit rate of the sentiment result cache",
+)
+metrics.gauge(
+    "sentiment_cascade_articles",
+    lambda: [({"tier": tier}, n) for tier, n in sentiment_analyzer.tier_stats.articles.items()],
+    "Articles decided by each sentiment cascade tier",
+)
+metrics.gauge(
+    "sentiment_cascade_seconds",
+    lambda: [({"tier": tier}, s) for tier, s in sentiment_analyzer.tier_stats.seconds.items()],
+    "Time spent in each sentiment cascade tier",
+)
+metrics.gauge(
+    "brief_queue_jobs",
+    lambda: [({"kind": key}, value) for key, value in brief_queue.get_status().items() if key != "max_workers"],
+    "Brief queue job and request counts",
+)
+metrics.gauge("alert_stream_subscribers", lambda: alert_stream.subscribers, "Connected /api/alerts/stream clients")
+metrics.gauge(
+    "pipeline_snapshot_age_seconds",
+    lambda: pipeline_scheduler.snapshot.age() if pipeline_scheduler.snapshot else -1,
+    "Seconds since the served pipeline snapshot was computed",
+)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Market risk pipeline utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="convert crawler JSON to a columnar article file")
+    convert.add_argument("json_path")
+    convert.add_argument("out_path", nargs="?")
+    args = parser.parse_args()
+    if args.command == "convert":
+        print(convert_to_columnar(args.json_path, args.out_path))
@@ -0,0 +1,156 @@
+"""
+Pipeline scheduler
+Recomputes the pipeline in the background and publishes immutable snapshots.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One published pipeline result; never mutated after publication."""
+
+    result: Dict
+    signature: Hashable
+    generated_ts: float
+    duration: float
+
+    @property
+    def generated_at(self) -> str:
+        return datetime.fromtimestamp(self.generated_ts).strftime("%Y-%m-%d %H:%M:%S")
+
+    def age(self) -> float:
+        return max(0.0, time.time() - self.generated_ts)
+
+
+class PipelineScheduler:
+    """Keeps a precomputed ``compute()`` result fresh.
+
+    A daemon thread polls ``signature()`` (a cheap fingerprint of the input
+    data) every ``poll`` seconds and recomputes when it changes or when
+    ``interval`` seconds have passed.  At most one recompute runs at a time:
+    concurrent ``refresh()`` callers wait for the running one and share its
+    snapshot instead of starting their own.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[], Dict],
+        signature: Callable[[], Hashable],
+        interval: float = 300.0,
+        poll: float = 10.0,
+    ):
+        self.compute = compute
+        self.signature = signature
+        self.interval = interval
+        self.poll = poll
+        self._snapshot: Snapshot | None = None
+        self._cond = threading.Condition()
+        self._running = False
+        self._generation = 0
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.stats = {"runs": 0, "shared": 0, "failures": 0, "last_error": None}
+
+    @property
+    def snapshot(self) -> Snapshot | None:
+        return self._snapshot
+
+    def latest(self) -> Snapshot:
+        """The current snapshot, computing the first one if none exists yet."""
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self._refresh(reuse=True)
+
+    def refresh(self) -> Snapshot:
+        """Recompute now, or join the recompute already in progress."""
+        return self._refresh(reuse=False)
+
+    def _refresh(self, reuse: bool) -> Snapshot:
+        with self._cond:
+            if reuse and self._snapshot is not None:
+                return self._snapshot  # published while we were waiting for the lock
+            if self._running:
+                self.stats["shared"] += 1
+                generation = self._generation
+                while self._running and self._generation == generation:
+                    self._cond.wait()
+                if self._snapshot is not None:
+                    return self._snapshot
+            self._running = True
+        snapshot = None
+        try:
+            signature = self.signature()
+            started = time.perf_counter()
+            result = self.compute()
+            snapshot = Snapshot(result, signature, time.time(), time.perf_counter() - started)
+        except Exception as exc:
+            with self._cond:
+                self.stats["failures"] += 1
+                self.stats["last_error"] = str(exc)
+            raise
+        finally:
+            # Publish before waking the joiners so they all see this run's snapshot.
+            with self._cond:
+                if snapshot is not None:
+                    self._snapshot = snapshot
+                    self.stats["runs"] += 1
+                self._running = False
+                self._generation += 1
+                self._cond.notify_all()
+        return snapshot
+
+    def is_stale(self, snapshot: Snapshot | None = None) -> bool:
+        """True if the input data changed since ``snapshot`` was computed."""
+        snapshot = snapshot or self._snapshot
+        if snapshot is None:
+            return True
+        try:
+            return self.signature() != snapshot.signature
+        except Exception:
+            return True
+
+    def start(self) -> None:
+        """Start the background thread (idempotent)."""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="pipeline-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            snapshot = self._snapshot
+            try:
+                if snapshot is None or snapshot.age() >= self.interval or self.is_stale(snapshot):
+                    self.refresh()
+            except Exception as exc:  # pragma: no cover
+                logger.error("后台流水线计算失败: %s", exc)
+            self._stop.wait(self.poll)
+
+    def get_status(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            "background": self._thread is not None and self._thread.is_alive(),
+            "interval": self.interval,
+            "poll": self.poll,
+            "running": self._running,
+            "generated_at": snapshot.generated_at if snapshot else None,
+            "last_duration": round(snapshot.duration, 3) if snapshot else None,
+            **self.stats,
+        }
@@ -1,74 +1,333 @@
 """
 Sentiment analysis service
-Simplified BERT-style analyzer using keyword heuristics for risk detection.
+Simplified BERT-style analyzer using keyword heuristics for risk detection,
+optionally backed by a trained text model (see ``services.model``).
 """
 
+from __future__ import annotations
+
+import atexit
 import logging
+import os
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+from .batch import BatchScores
+from .cache import ResultCache
+from .cascade import CascadePolicy, TierStats
+from .lexicon import Lexicon, LexiconWatcher
+from .matcher import KeywordMatcher
+from .model import ModelEngine
+from .parallel import ParallelScorer
 
 logger = logging.getLogger(__name__)
 
 
 class SentimentAnalyzer:
-    """Keyword-based sentiment analyzer with BERT-compatible interface."""
+    """Keyword-based sentiment analyzer with BERT-compatible interface.
 
-    def __init__(self, use_simple_mode: bool = True):
+    With a ``model`` engine (and ``use_simple_mode=False``) labels and scores
+    come from the model once it has loaded; keyword counts are still
+    reported, and keyword scoring serves until then.  With a ``cascade``
+    policy only the articles keywords leave ambiguous go to the model.
+    """
+
+    def __init__(
+        self,
+        use_simple_mode: bool = True,
+        result_cache: ResultCache | None = None,
+        parallel: ParallelScorer | None = None,
+        model: ModelEngine | None = None,
+        cascade: CascadePolicy | None = None,
+    ):
         self.use_simple_mode = use_simple_mode
-        self.model_loaded = True  # simplified: always ready
+        self.result_cache = result_cache
+        self.parallel = parallel
+        self.model = model
+        self.cascade = cascade
+        self.tier_stats = TierStats()
+        self.model_loaded = model is None  # keyword scoring is always ready
         self.status = {
             "model_loaded": self.model_loaded,
             "use_simple_mode": use_simple_mode,
             "analyzed_count": 0,
         }
-        self.risk_keywords = [
-            "下跌", "暴跌", "亏损", "下滑", "下降", "预警", "风险", "违规",
-            "调查", "诉讼", "处罚", "警告", "退市", "ST", "*ST", "问询",
-            "监管", "爆雷", "债务", "违约", "破产", "重组", "裁员", "危机",
-            "利空", "跌停", "破发", "破净", "减持", "质押", "冻结", "查封",
-            "降价", "松动", "洗牌", "困境", "降价潮", "压力", "回调", "垃圾",
-            "割肉", "被套", "跌停板", "一泻千里", "崩盘", "腰斩", "凉凉",
-            "完蛋", "危险", "套牢", "割韭菜", "暴雷", "踩雷", "黑天鹅",
-        ]
-        self.positive_keywords = [
-            "上涨", "大涨", "增长", "盈利", "利好", "突破", "创新", "新高",
-            "合作", "签约", "中标", "扩产", "增产", "获奖", "表彰", "优秀",
-            "领先", "升级", "转型", "复苏", "反弹", "回暖", "改善", "提升",
-            "优化", "机会", "涨停", "翻倍", "增持", "回购", "分红", "送转",
-            "业绩", "预增", "政策", "支持", "牛市", "上板", "发财", "空间",
-        ]
-        self.neutral_keywords = [
-            "维持", "平稳", "稳定", "观望", "调整", "整理", "横盘", "持平",
-            "中性", "一般", "普通", "正常", "常规", "预计", "预期", "可能",
-            "或许", "大概", "估计", "猜测", "推测",
-        ]
+        self.keyword_version = 0
+        self.lexicon_watcher: LexiconWatcher | None = None
+        # Built-in lexicon; replaced from SENTIMENT_LEXICON_PATH when set.
+        self._lexicon = Lexicon({
+            "risk": [
+                "下跌", "暴跌", "亏损", "下滑", "下降", "预警", "风险", "违规",
+                "调查", "诉讼", "处罚", "警告", "退市", "ST", "*ST", "问询",
+                "监管", "爆雷", "债务", "违约", "破产", "重组", "裁员", "危机",
+                "利空", "跌停", "破发", "破净", "减持", "质押", "冻结", "查封",
+                "降价", "松动", "洗牌", "困境", "降价潮", "压力", "回调", "垃圾",
+                "割肉", "被套", "跌停板", "一泻千里", "崩盘", "腰斩", "凉凉",
+                "完蛋", "危险", "套牢", "割韭菜", "暴雷", "踩雷", "黑天鹅",
+            ],
+            "positive": [
+                "上涨", "大涨", "增长", "盈利", "利好", "突破", "创新", "新高",
+                "合作", "签约", "中标", "扩产", "增产", "获奖", "表彰", "优秀",
+                "领先", "升级", "转型", "复苏", "反弹", "回暖", "改善", "提升",
+                "优化", "机会", "涨停", "翻倍", "增持", "回购", "分红", "送转",
+                "业绩", "预增", "政策", "支持", "牛市", "上板", "发财", "空间",
+            ],
+            "neutral": [
+                "维持", "平稳", "稳定", "观望", "调整", "整理", "横盘", "持平",
+                "中性", "一般", "普通", "正常", "常规", "预计", "预期", "可能",
+                "或许", "大概", "估计", "猜测", "推测",
+            ],
+        })
+
+    # The lexicon is immutable and swapped as a whole, so a scoring call that
+    # reads ``self._lexicon`` once sees one consistent set of lists, weights,
+    # fingerprint and compiled matcher even while a reload happens.
+    @property
+    def lexicon(self) -> Lexicon:
+        return self._lexicon
+
+    def set_lexicon(self, lexicon: Lexicon) -> None:
+        """Swap in ``lexicon``; results keyed on the old version stop matching."""
+        self._lexicon = lexicon
+        self.keyword_version += 1
+
+    @property
+    def risk_keywords(self) -> Tuple[str, ...]:
+        return self._lexicon.categories["risk"]
+
+    @risk_keywords.setter
+    def risk_keywords(self, words: Sequence[str]) -> None:
+        self.set_lexicon(self._lexicon.with_words("risk", words))
+
+    @property
+    def positive_keywords(self) -> Tuple[str, ...]:
+        return self._lexicon.categories["positive"]
+
+    @positive_keywords.setter
+    def positive_keywords(self, words: Sequence[str]) -> None:
+        self.set_lexicon(self._lexicon.with_words("positive", words))
+
+    @property
+    def neutral_keywords(self) -> Tuple[str, ...]:
+        return self._lexicon.categories["neutral"]
+
+    @neutral_keywords.setter
+    def neutral_keywords(self, words: Sequence[str]) -> None:
+        self.set_lexicon(self._lexicon.with_words("neutral", words))
+
+    @property
+    def keyword_fingerprint(self) -> str:
+        """Content hash of the lexicon, stable across processes."""
+        return self._lexicon.version
+
+    @property
+    def matcher(self) -> KeywordMatcher:
+        """Compiled keyword automaton of the current lexicon."""
+        return self._lexicon.matcher
+
+    def _model_ready(self) -> bool:
+        """Whether scores come from the model; loads it on first use unless warming up."""
+        if self.model is None or self.use_simple_mode:
+            return False
+        return self.model.available()
+
+    def _on_model_ready(self) -> None:
+        # Scores change from keyword to model ones: invalidate like a keyword edit.
+        self.model_loaded = True
+        self.keyword_version += 1
+
+    @property
+    def scoring_version(self) -> int:
+        """``keyword_version``, after settling which scorer is in use."""
+        self._model_ready()
+        return self.keyword_version
+
+    @property
+    def scoring_fingerprint(self) -> str:
+        """Content hash of everything that determines scores: keywords and the model file."""
+        if not self._model_ready():
+            return self.keyword_fingerprint
+        fingerprint = f"{self.keyword_fingerprint}+{self.model.fingerprint}"
+        if self.cascade is not None:
+            fingerprint += f"+{self.cascade.fingerprint}"
+        return fingerprint
+
+    def enable_cascade(self, policy: CascadePolicy | None = None) -> None:
+        """Escalate only keyword-ambiguous articles to the model."""
+        self.cascade = policy or CascadePolicy()
+        self.tier_stats.reset()
+        self.keyword_version += 1
+
+    def disable_cascade(self) -> None:
+        if self.cascade is not None:
+            self.cascade = None
+            self.keyword_version += 1
 
     def analyze(self, text: str, title: str = "") -> Dict:
         if not text:
             return self._create_empty_result()
-        full_text = f"{title} {text}".lower()
-        if self.use_simple_mode:
-            result = self._analyze_with_keywords(full_text)
-        else:
-            result = self._analyze_with_keywords(full_text)
+        if self._model_ready():
+            return self.score_batch([text], [title]).record(0)
+        result = self._analyze_with_keywords(f"{title} {text}".lower())
         self.status["analyzed_count"] += 1
         return result
 
     def analyze_batch(self, texts: List[str]) -> List[Dict]:
-        return [self.analyze(t) for t in texts]
+        return self.score_batch(texts).records()
+
+    def score_batch(
+        self,
+        texts: Sequence[str],
+        titles: Sequence[str] | None = None,
+        groups: Sequence[Hashable | None] | None = None,
+        memo=None,
+    ) -> BatchScores:
+        """Score many articles in one call and return columnar results.
+
+        Every article gets its own keyword counts.  Rows with the same
+        ``groups`` key (e.g. a near-duplicate cluster) share one model
+        prediction, which ``memo`` (``get(key)``/``put(key, probs)``) keeps
+        across calls.
+        """
+        n = len(texts)
+        titles = titles if titles is not None else [""] * n
+        success = np.zeros(n, dtype=bool)
+        full_texts: List[str] = [""] * n
+        for i, (text, title) in enumerate(zip(texts, titles)):
+            if text:
+                full_texts[i] = f"{title} {text}".lower()
+                success[i] = True
+        start = time.perf_counter()
+        counts = self._batch_counts(full_texts, success)
+        self.status["analyzed_count"] += int(success.sum())
+        model_ready = self._model_ready()
+        if model_ready and self.cascade is None:
+            probs = np.zeros((n, 3), dtype=np.float32)
+            rows = np.flatnonzero(success)
+            if len(rows):
+                probs[rows] = self._predict(full_texts, rows, groups, memo)
+            return self._scores(full_texts, counts, success, probs=probs, method="model")
+        scores = self._scores(full_texts, counts, success)
+        if self.cascade is None:
+            return scores
+        rows = np.flatnonzero(self.cascade.escalate(scores)) if model_ready else np.empty(0, dtype=np.intp)
+        self.tier_stats.record("keyword", int(success.sum()) - len(rows), time.perf_counter() - start)
+        if len(rows):
+            start = time.perf_counter()
+            scores.escalate(rows, self._predict(full_texts, rows, groups, memo), "model")
+            self.tier_stats.record("model", len(rows), time.perf_counter() - start)
+        return scores
+
+    def _predict(
+        self,
+        full_texts: List[str],
+        rows: np.ndarray,
+        groups: Sequence[Hashable | None] | None,
+        memo,
+    ) -> np.ndarray:
+        """Model probabilities for ``rows``, predicting once per group."""
+        if groups is None:
+            return self.model.predict([full_texts[i] for i in rows])
+        probs = np.zeros((len(rows), 3), dtype=np.float32)
+        # Group key (or the row itself when ungrouped) -> positions in ``rows`` to fill.
+        todo: Dict[Hashable, List[int]] = {}
+        for pos, i in enumerate(rows.tolist()):
+            group = groups[i]
+            known = memo.get(group) if memo is not None and group is not None else None
+            if known is not None:
+                probs[pos] = known
+            else:
+                todo.setdefault(("row", i) if group is None else ("group", group), []).append(pos)
+        if todo:
+            predicted = self.model.predict([full_texts[rows[positions[0]]] for positions in todo.values()])
+            for (kind, group), positions, row in zip(todo, todo.values(), predicted):
+                probs[positions] = row
+                if memo is not None and kind == "group":
+                    memo.put(group, tuple(row.tolist()))
+        return probs
+
+    @staticmethod
+    def _scores(full_texts: List[str], counts: np.ndarray, success: np.ndarray, **kwargs) -> BatchScores:
+        if counts.shape[1] > 3:  # weighted lexicon: float counts plus the weight sum
+            risk, positive, neutral = (counts[:, k].astype(np.int32) for k in range(3))
+            return BatchScores(full_texts, risk, positive, neutral, success, weight=counts[:, 3], **kwargs)
+        return BatchScores(full_texts, counts[:, 0], counts[:, 1], counts[:, 2], success, **kwargs)
+
+    def enable_parallel(self, workers: int | None = None, chunk_size: int = 500) -> None:
+        """Score large batches on a process pool of ``workers`` processes."""
+        self.disable_parallel()
+        self.parallel = ParallelScorer(workers=workers, chunk_size=chunk_size)
+
+    def disable_parallel(self) -> None:
+        if self.parallel is not None:
+            self.parallel.shutdown()
+            self.parallel = None
+
+    def _batch_counts(self, full_texts: List[str], success: np.ndarray) -> np.ndarray:
+        """Keyword counts for every non-empty text, using the cache and pool.
+
+        Weighted lexicons add a fourth column, the summed keyword weights.
+        """
+        lexicon = self._lexicon
+        width, dtype = (4, np.float64) if lexicon.weighted else (3, np.int32)
+        counts = np.zeros((len(full_texts), width), dtype=dtype)
+        cache = self.result_cache
+        fingerprint = lexicon.version
+        pending: List[int] = []
+        keys: List[str] = []
+        for i in np.flatnonzero(success):
+            if cache is not None:
+                key = cache.make_key(fingerprint, full_texts[i])
+                cached = cache.get(key)
+                if cached is not None:
+                    counts[i] = cached
+                    continue
+                keys.append(key)
+            pending.append(i)
+        if not pending:
+            return counts
+        todo = [full_texts[i] for i in pending]
+        if self.parallel is not None and len(todo) > self.parallel.chunk_size:
+            computed = self.parallel.count(fingerprint, lexicon.categories, todo, lexicon.matcher_weights())
+        else:
+            count = lexicon.matcher.count
+            computed = np.array([count(text) for text in todo], dtype=dtype).reshape(-1, width)
+        counts[pending] = computed
+        if cache is not None:
+            for key, row in zip(keys, computed.tolist()):
+                cache.put(key, tuple(row))
+        return counts
+
+    def _keyword_counts(self, text: str) -> Tuple:
+        """Per-category keyword hits (plus the weight sum if weighted), cached when possible."""
+        lexicon = self._lexicon
+        cache = self.result_cache
+        if cache is None:
+            return lexicon.matcher.count(text)
+        key = cache.make_key(lexicon.version, text)
+        counts = cache.get(key)
+        if counts is None:
+            counts = lexicon.matcher.count(text)
+            cache.put(key, counts)
+        return counts
 
     def _analyze_with_keywords(self, text: str) -> Dict:
-        risk_count = sum(1 for w in self.risk_keywords if w in text)
-        positive_count = sum(1 for w in self.positive_keywords if w in text)
-        neutral_count = sum(1 for w in self.neutral_keywords if w in text)
+        risk_count, positive_count, neutral_count, *weight = self._keyword_counts(text)
+        risk_count, positive_count, neutral_count = int(risk_count), int(positive_count), int(neutral_count)
         total = risk_count + positive_count + neutral_count
 
         if total > 0:
-            score = (
-                positive_count * 1.0
-                + neutral_count * 0.0
-                - risk_count * 1.5
-            ) / total
+            if weight:
+                score = weight[0] / total
+            else:
+                score = (
+                    positive_count * 1.0
+                    + neutral_count * 0.0
+                    - risk_count * 1.5
+                ) / total
             score = max(-1.0, min(1.0, score))
             confidence = min(0.95, 0.6 + min(total, 5) * 0.08)
         else:
@@ -112,10 +371,96 @@ class SentimentAnalyzer:
         }
 
     def get_status(self) -> Dict:
-        return self.status.copy()
+        status = self.status.copy()
+        status["model_loaded"] = self.model_loaded
+        status["keyword_version"] = self.keyword_version
+        if self.model is not None:
+            status["model"] = self.model.get_status()
+        status["lexicon"] = self._lexicon.get_status()
+        if self.lexicon_watcher is not None:
+            status["lexicon"]["watcher"] = self.lexicon_watcher.get_status()
+        if self.cascade is not None:
+            status["cascade"] = dict(self.cascade.__dict__, **self.tier_stats.get_status())
+        if self.result_cache is not None:
+            status["result_cache"] = self.result_cache.stats()
+        if self.parallel is not None:
+            status["parallel"] = self.parallel.get_status()
+        return status
+
+
+def _default_result_cache() -> ResultCache | None:
+    """Result cache sized by SENTIMENT_CACHE_SIZE (0 disables it).
+
+    With SENTIMENT_CACHE_PATH set, entries are loaded at startup and saved on exit.
+    """
+    size = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+    if size <= 0:
+        return None
+    cache = ResultCache(max_size=size, path=os.getenv("SENTIMENT_CACHE_PATH") or None)
+    if cache.path:
+        atexit.register(cache.save)
+    return cache
+
+
+def _default_parallel() -> ParallelScorer | None:
+    """Process pool configured by SENTIMENT_WORKERS (0 or unset disables it)."""
+    workers = int(os.getenv("SENTIMENT_WORKERS", "0"))
+    if workers <= 0:
+        return None
+    return ParallelScorer(workers=workers, chunk_size=int(os.getenv("SENTIMENT_CHUNK_SIZE", "500")))
+
+
+def _default_model() -> ModelEngine | None:
+    """Model engine for SENTIMENT_MODEL_PATH (unset keeps keyword scoring).
+
+    SENTIMENT_MODEL_WARMUP=1 (default) loads it in the background at startup;
+    0 loads it on the first scoring call instead.
+    """
+    path = os.getenv("SENTIMENT_MODEL_PATH")
+    if not path:
+        return None
+    return ModelEngine(
+        path,
+        max_batch=int(os.getenv("SENTIMENT_MODEL_MAX_BATCH", "64")),
+        max_delay=float(os.getenv("SENTIMENT_MODEL_MAX_DELAY_MS", "5")) / 1000,
+    )
+
+
+def _default_cascade(model: ModelEngine | None) -> CascadePolicy | None:
+    """Cascade policy when SENTIMENT_CASCADE=1; it needs a model to escalate to."""
+    if os.getenv("SENTIMENT_CASCADE", "0") != "1":
+        return None
+    if model is None:
+        logger.warning("SENTIMENT_CASCADE 需要同时设置 SENTIMENT_MODEL_PATH，已忽略")
+        return None
+    return CascadePolicy(
+        band=float(os.getenv("SENTIMENT_CASCADE_BAND", "0.3")),
+        min_confidence=float(os.getenv("SENTIMENT_CASCADE_MIN_CONFIDENCE", "0.7")),
+        escalate_unmatched=os.getenv("SENTIMENT_CASCADE_UNMATCHED", "0") == "1",
+    )
 
 
-sentiment_analyzer = SentimentAnalyzer(use_simple_mode=True)
+_model = _default_model()
+sentiment_analyzer = SentimentAnalyzer(
+    use_simple_mode=_model is None,
+    result_cache=_default_result_cache(),
+    parallel=_default_parallel(),
+    model=_model,
+    cascade=_default_cascade(_model),
+)
+if os.getenv("SENTIMENT_LEXICON_PATH"):
+    # Load synchronously so scoring starts with the file's lexicon, then watch it.
+    sentiment_analyzer.lexicon_watcher = LexiconWatcher(
+        os.environ["SENTIMENT_LEXICON_PATH"],
+        sentiment_analyzer.set_lexicon,
+        poll=float(os.getenv("SENTIMENT_LEXICON_POLL", "5")),
+    )
+    sentiment_analyzer.lexicon_watcher.check()
+    sentiment_analyzer.lexicon_watcher.start()
+if _model is not None:
+    _model.on_ready.append(sentiment_analyzer._on_model_ready)
+    if os.getenv("SENTIMENT_MODEL_WARMUP", "1") != "0":
+        _model.warm()
 
 
 def analyze_text(text: str, title: str = "") -> Dict:
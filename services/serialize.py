@@ -0,0 +1,103 @@
+"""
+API serialization helpers
+Pagination cursors, field projection and incremental JSON / NDJSON / SSE encoding.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+MAX_PAGE_SIZE = 1000
+# Encoded items are flushed to the client in chunks of roughly this many bytes.
+FLUSH_BYTES = 64 * 1024
+
+
+def parse_fields(value: str | None) -> List[str] | None:
+    """``"title,stock_code"`` -> ``["title", "stock_code"]``; empty means all fields."""
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(",") if f.strip()]
+    return fields or None
+
+
+def project(items: Iterable[Dict], fields: Sequence[str] | None) -> Iterator[Dict]:
+    if not fields:
+        yield from items
+        return
+    for item in items:
+        yield {key: item[key] for key in fields if key in item}
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode()))["o"]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("无效的 cursor") from exc
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("无效的 cursor")
+    return offset
+
+
+def paginate(
+    items: Sequence[Dict],
+    offset: int = 0,
+    limit: int | None = None,
+) -> Tuple[Sequence[Dict], int | None]:
+    """Return ``(page, next_offset)``; ``next_offset`` is None on the last page."""
+    if offset < 0 or (limit is not None and limit < 1):
+        raise ValueError("offset 不能为负数，limit 必须为正数")
+    if limit is None:
+        return items[offset:], None
+    limit = min(limit, MAX_PAGE_SIZE)
+    end = offset + limit
+    return items[offset:end], (end if end < len(items) else None)
+
+
+def iter_json_array(items: Iterable[Dict], dumps: Callable[[Dict], str]) -> Iterator[str]:
+    """Encode ``items`` as one JSON array, one buffered chunk at a time."""
+    buf = ["["]
+    size = 1
+    first = True
+    for item in items:
+        text = dumps(item) if first else "," + dumps(item)
+        first = False
+        buf.append(text)
+        size += len(text)
+        if size >= FLUSH_BYTES:
+            yield "".join(buf)
+            buf, size = [], 0
+    buf.append("]")
+    yield "".join(buf)
+
+
+def iter_ndjson(items: Iterable[Dict], dumps: Callable[[Dict], str]) -> Iterator[str]:
+    """Encode ``items`` as newline-delimited JSON."""
+    buf: List[str] = []
+    size = 0
+    for item in items:
+        text = dumps(item) + "\n"
+        buf.append(text)
+        size += len(text)
+        if size >= FLUSH_BYTES:
+            yield "".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def format_sse(data: str, event_id: int | None = None, event: str | None = None) -> str:
+    """One Server-Sent Events frame; ``data`` must already be serialized."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
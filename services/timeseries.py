@@ -0,0 +1,256 @@
+"""
+Risk time series
+Per-minute and per-hour ring buffers of article metrics for sliding-window queries.
+"""
+
+from __future__ import annotations
+
+import calendar
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .index import time_key
+
+ALL = "*"
+# Named rolling windows served by default, in seconds.
+WINDOWS = {"15m": 15 * 60, "1h": 60 * 60, "24h": 24 * 60 * 60}
+RESOLUTIONS = {"minute": 60, "hour": 3600}
+
+
+def parse_timestamp(value) -> int | None:
+    """Publish time -> epoch seconds (naive times are taken as-is, no tz shift)."""
+    key = time_key(value)
+    if not key:
+        return None
+    try:
+        dt = datetime.fromisoformat(key)
+    except ValueError:
+        return None
+    return calendar.timegm(dt.timetuple())
+
+
+def format_timestamp(ts: int) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class RingSeries:
+    """``size`` buckets of ``resolution`` seconds, addressed by bucket % size.
+
+    Each slot remembers which absolute bucket it holds, so stale slots are
+    recycled on write and skipped on read without any sweeping.
+
+    Windows registered with ``track`` also keep running totals ending at the
+    newest bucket: a write adds to them, and moving the end forward
+    subtracts the buckets that fall out, so each bucket is added and
+    expired once and a tracked window is answered without reading buckets.
+    """
+
+    def __init__(self, resolution: int, size: int):
+        self.resolution = resolution
+        self.size = size
+        self.ids = np.full(size, -1, dtype=np.int64)
+        self.count = np.zeros(size, dtype=np.int32)
+        self.risk = np.zeros(size, dtype=np.int32)
+        self.alert = np.zeros(size, dtype=np.int32)
+        self.score = np.zeros(size, dtype=np.float64)
+        self.end: int | None = None
+        # Window length in buckets -> running (count, risk, alert, score) up to ``end``.
+        self._running: Dict[int, np.ndarray] = {}
+
+    def track(self, n: int) -> None:
+        n = min(n, self.size)
+        if n not in self._running:
+            live = np.empty(0, dtype=np.int64)
+            if self.end is not None:
+                _, slots = self._slots(self.end, n)
+                live = slots[slots >= 0]
+            self._running[n] = self._sums(live)
+
+    def apply(self, ts: int, article: Dict, sign: int) -> None:
+        bucket = ts // self.resolution
+        if sign > 0:
+            self._advance(bucket)
+        slot = bucket % self.size
+        held = self.ids[slot]
+        if held != bucket:
+            if held > bucket or sign < 0:
+                return  # older than the retained range, or never counted
+            self.ids[slot] = bucket
+            self.count[slot] = self.risk[slot] = self.alert[slot] = 0
+            self.score[slot] = 0.0
+        risk = sign * bool(article.get("is_risk"))
+        alert = sign * bool(article.get("alert"))
+        score = sign * article.get("sentiment_score", 0)
+        self.count[slot] += sign
+        self.risk[slot] += risk
+        self.alert[slot] += alert
+        self.score[slot] += score
+        for n, running in self._running.items():
+            if bucket > self.end - n:
+                running += (sign, risk, alert, score)
+
+    def _advance(self, bucket: int) -> None:
+        """Move ``end`` forward to ``bucket``, expiring buckets from the running totals."""
+        if self.end is None:
+            self.end = bucket
+            return
+        if bucket <= self.end:
+            return
+        for n, running in self._running.items():
+            first = self.end - n + 1
+            last = min(self.end, bucket - n)
+            if last >= first:
+                _, slots = self._slots(last, last - first + 1)
+                running -= self._sums(slots[slots >= 0])
+        self.end = bucket
+
+    def _sums(self, live: np.ndarray) -> np.ndarray:
+        return np.array([
+            self.count[live].sum(),
+            self.risk[live].sum(),
+            self.alert[live].sum(),
+            self.score[live].sum(),
+        ], dtype=np.float64)
+
+    def _slots(self, end_bucket: int, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        n = min(n, self.size)
+        buckets = np.arange(end_bucket - n + 1, end_bucket + 1, dtype=np.int64)
+        slots = buckets % self.size
+        return buckets, np.where(self.ids[slots] == buckets, slots, -1)
+
+    def totals(self, end_ts: int, n: int) -> Tuple[int, int, int, float]:
+        """Sums of the last ``n`` buckets ending at ``end_ts``.
+
+        O(1) amortized for a tracked window ending at or after ``end``; any
+        other window reads its ``n`` buckets.
+        """
+        end_bucket = end_ts // self.resolution
+        running = self._running.get(min(n, self.size))
+        if running is not None and self.end is not None and end_bucket >= self.end:
+            self._advance(end_bucket)
+            sums = running
+        else:
+            _, slots = self._slots(end_bucket, n)
+            sums = self._sums(slots[slots >= 0])
+        count, risk, alert, score = sums.tolist()
+        return int(count), int(risk), int(alert), float(score)
+
+    def points(self, end_ts: int, n: int) -> List[Dict]:
+        buckets, slots = self._slots(end_ts // self.resolution, n)
+        points = []
+        for bucket, slot in zip(buckets.tolist(), slots.tolist()):
+            count = int(self.count[slot]) if slot >= 0 else 0
+            points.append(_metrics(
+                count,
+                int(self.risk[slot]) if slot >= 0 else 0,
+                int(self.alert[slot]) if slot >= 0 else 0,
+                float(self.score[slot]) if slot >= 0 else 0.0,
+                time=format_timestamp(bucket * self.resolution),
+            ))
+        return points
+
+
+def _metrics(count: int, risk: int, alerts: int, score: float, **extra) -> Dict:
+    return {
+        **extra,
+        "articles": count,
+        "risk": risk,
+        "alerts": alerts,
+        "risk_ratio": round(risk / count * 100, 1) if count else 0,
+        "alert_rate": round(alerts / count * 100, 1) if count else 0,
+        "avg_score": round(score / count, 3) if count else 0,
+    }
+
+
+class RiskTimeSeries:
+    """Minute and hour ring buffers per stock_code plus one for all stocks.
+
+    Registered as an ``ArticleStore`` observer.  The named ``WINDOWS`` are
+    tracked with running totals, so they cost O(1) per query; other window
+    lengths read a fixed number of buckets.  Neither depends on how many
+    articles were ingested.
+    By default windows end at the newest publish time seen ("as of" the data).
+    """
+
+    def __init__(self, articles: Iterable[Dict] = (), minute_slots: int = 24 * 60, hour_slots: int = 7 * 24):
+        self.minute_slots = minute_slots
+        self.hour_slots = hour_slots
+        self._lock = threading.RLock()
+        self.clear()
+        for article in articles:
+            self.add(article)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.latest: int | None = None
+            self._series: Dict[str, Dict[str, RingSeries]] = {}
+
+    def _rings(self, key: str) -> Dict[str, RingSeries]:
+        rings = self._series.get(key)
+        if rings is None:
+            rings = self._series[key] = {
+                "minute": RingSeries(RESOLUTIONS["minute"], self.minute_slots),
+                "hour": RingSeries(RESOLUTIONS["hour"], self.hour_slots),
+            }
+            for seconds in WINDOWS.values():
+                ring, n = self._ring_for(seconds, rings)
+                ring.track(n)
+        return rings
+
+    def add(self, article: Dict) -> None:
+        self._apply(article, 1)
+
+    def remove(self, article: Dict) -> None:
+        self._apply(article, -1)
+
+    def _apply(self, article: Dict, sign: int) -> None:
+        ts = parse_timestamp(article.get("publish_time"))
+        if ts is None:
+            return
+        with self._lock:
+            if sign > 0 and (self.latest is None or ts > self.latest):
+                self.latest = ts
+            for key in (ALL, article.get("stock_code") or ""):
+                for ring in self._rings(key).values():
+                    ring.apply(ts, article, sign)
+
+    def _ring_for(self, seconds: int, rings: Dict[str, RingSeries]) -> Tuple[RingSeries, int]:
+        minute = rings["minute"]
+        if seconds <= minute.resolution * minute.size:
+            return minute, max(1, seconds // minute.resolution)
+        hour = rings["hour"]
+        return hour, max(1, -(-seconds // hour.resolution))
+
+    def window(self, seconds: int, stock_code: str | None = None, now: int | None = None) -> Dict:
+        """Metrics over the ``seconds`` before ``now`` (default: newest article)."""
+        with self._lock:
+            end = now if now is not None else self.latest
+            rings = self._series.get(stock_code or ALL)
+            if end is None or rings is None:
+                return _metrics(0, 0, 0, 0.0, seconds=seconds)
+            ring, n = self._ring_for(seconds, rings)
+            return _metrics(*ring.totals(end, n), seconds=seconds)
+
+    def windows(self, stock_code: str | None = None, now: int | None = None) -> Dict[str, Dict]:
+        return {name: self.window(seconds, stock_code, now) for name, seconds in WINDOWS.items()}
+
+    def series(
+        self,
+        resolution: str = "minute",
+        points: int = 60,
+        stock_code: str | None = None,
+        now: int | None = None,
+    ) -> List[Dict]:
+        """The last ``points`` buckets at ``resolution`` ("minute" or "hour"), oldest first."""
+        with self._lock:
+            end = now if now is not None else self.latest
+            rings = self._series.get(stock_code or ALL)
+            if end is None or rings is None:
+                return []
+            return rings[resolution].points(end, points)
+
+    def as_of(self) -> str | None:
+        return format_timestamp(self.latest) if self.latest is not None else None
@@ -0,0 +1,70 @@
+"""
+Scoring with near-duplicate clusters: members keep their own keyword
+counts and label, and only the model prediction is shared per cluster.
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from services import pipeline
+from services.dedup import NearDuplicateIndex
+from services.sentiment import SentimentAnalyzer
+
+RALLY = "今日大盘大幅上涨，市场情绪明显回暖，多只个股表现强势，成交量较昨日有所放大，板块轮动节奏加快。"
+CRASH = RALLY.replace("大幅上涨", "盘中暴跌")
+
+
+def _news(*texts):
+    return [{"id": i, "title": "", "content": text, "stock_code": "600519"} for i, text in enumerate(texts, 1)]
+
+
+class FakeModel:
+    fingerprint = "fake-model"
+
+    def __init__(self):
+        self.predicted = []
+
+    def available(self):
+        return True
+
+    def predict(self, texts):
+        self.predicted.extend(texts)
+        return np.tile(np.array([[0.7, 0.2, 0.1]], dtype=np.float32), (len(texts), 1))
+
+
+class ClusterScoringTest(unittest.TestCase):
+    def analyze(self, index, analyzer=None):
+        with mock.patch.object(pipeline, "near_duplicates", index), \
+                mock.patch.object(pipeline, "sentiment_analyzer", analyzer or SentimentAnalyzer()):
+            return pipeline.analyze_news(_news(RALLY, CRASH))
+
+    def test_member_with_a_risk_term_keeps_its_own_label_and_counts(self):
+        index = NearDuplicateIndex()
+        clustered = self.analyze(index)
+        self.assertEqual(clustered[0].cluster_id, clustered[1].cluster_id)
+        separate = self.analyze(None)
+        for got, want in zip(clustered, separate):
+            self.assertEqual(got.sentiment_label, want.sentiment_label)
+            self.assertEqual(got.sentiment_score, want.sentiment_score)
+            self.assertEqual(got.keyword_counts, want.keyword_counts)
+        self.assertEqual(clustered[1].keyword_counts["risk"], 1)
+        self.assertNotEqual(clustered[1].sentiment_label, clustered[0].sentiment_label)
+
+    def test_model_prediction_is_shared_per_cluster(self):
+        model = FakeModel()
+        analyzer = SentimentAnalyzer(use_simple_mode=False, model=model)
+        index = NearDuplicateIndex()
+        first = self.analyze(index, analyzer)
+        self.assertEqual(len(model.predicted), 1)
+        self.assertEqual(first[1].keyword_counts["risk"], 1)
+        self.assertEqual(first[0].keyword_counts["risk"], 0)
+
+        # A later chunk reuses the remembered prediction without calling the model.
+        self.analyze(index, analyzer)
+        self.assertEqual(len(model.predicted), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Columnar round trip: a crawler file ingested as JSON and as a converted
+``.cols`` file yields the same analyzed articles, cluster ids included.
+"""
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from services import pipeline
+from services.colstore import ColumnarArticles
+from services.dedup import NearDuplicateIndex
+from services.ingest import ArticleStore
+
+DATA = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "data", "articles_*.json")))[0]
+
+
+def _store() -> ArticleStore:
+    return ArticleStore(
+        normalize=pipeline._normalize_article,
+        analyze=pipeline.iter_analyzed,
+        fingerprint=lambda: pipeline.sentiment_analyzer.scoring_fingerprint,
+        restore=pipeline.iter_restored,
+    )
+
+
+def _rows(store: ArticleStore) -> list:
+    rows = [article.to_dict() for article in store.values()]
+    for row in rows:
+        del row["analysis_time"]
+    return sorted(rows, key=lambda row: row["id"])
+
+
+class ColumnarRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.dir, os.path.basename(DATA))
+        shutil.copy(DATA, self.json_path)
+        # Duplicate a post under another url so the corpus has a real cluster.
+        with open(self.json_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        records.append(dict(records[0], url=f"{records[0].get('url', '')}#repost"))
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def ingest(self, path: str) -> list:
+        with mock.patch.object(pipeline, "near_duplicates", NearDuplicateIndex()):
+            store = _store()
+            store.refresh([path])
+            return _rows(store)
+
+    def test_json_and_columnar_ingest_agree(self):
+        from_json = self.ingest(self.json_path)
+        with mock.patch.object(pipeline, "near_duplicates", NearDuplicateIndex()):
+            cols_path = pipeline.convert_to_columnar(self.json_path)
+        table = ColumnarArticles(cols_path)
+        try:
+            self.assertEqual(table.meta["keyword_fingerprint"], pipeline.sentiment_analyzer.scoring_fingerprint)
+        finally:
+            table.close()
+        from_cols = self.ingest(cols_path)
+
+        self.assertEqual(len(from_cols), len(from_json))
+        self.assertEqual(from_cols, from_json)
+        clusters = [row.get("cluster_id") for row in from_cols]
+        self.assertTrue(all(cluster is not None for cluster in clusters))
+        self.assertLess(len(set(clusters)), len(clusters))
+
+
+if __name__ == "__main__":
+    unittest.main()
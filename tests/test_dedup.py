@@ -0,0 +1,90 @@
+"""
+MinHash signatures, LSH cluster assignment and LRU eviction in
+NearDuplicateIndex.
+"""
+
+import unittest
+
+import numpy as np
+
+from services.dedup import NearDuplicateIndex, minhash_batch
+
+BASE = "公司公告称，受原材料价格上涨影响，预计上半年净利润同比下降百分之三十，董事会将审议应对方案。"
+NEAR = BASE.replace("三十", "三十五")
+OTHER = "新能源板块今日集体走强，龙头企业获得海外大额订单，机构上调全年出货量预期。"
+THIRD = "银行板块早盘震荡，券商分析认为息差收窄压力仍在，建议关注资产质量变化。"
+
+
+def _jaccard(a: str, b: str, k: int = 3) -> float:
+    grams = lambda s: {s[i:i + k] for i in range(len(s) - k + 1)}
+    x, y = grams("".join(a.split())), grams("".join(b.split()))
+    return len(x & y) / len(x | y)
+
+
+class MinHashTest(unittest.TestCase):
+    def test_signature_agreement_estimates_jaccard(self):
+        sig = minhash_batch([BASE, NEAR, OTHER], num_perm=256)
+        self.assertEqual(sig.shape, (3, 256))
+        near = float((sig[0] == sig[1]).mean())
+        self.assertAlmostEqual(near, _jaccard(BASE, NEAR), delta=0.1)
+        self.assertLess(float((sig[0] == sig[2]).mean()), 0.1)
+
+    def test_whitespace_is_ignored_and_batches_agree(self):
+        spaced = " ".join(BASE)
+        np.testing.assert_array_equal(minhash_batch([BASE])[0], minhash_batch([spaced])[0])
+        together = minhash_batch([BASE, "", OTHER])
+        np.testing.assert_array_equal(together[0], minhash_batch([BASE])[0])
+        np.testing.assert_array_equal(together[2], minhash_batch([OTHER])[0])
+        self.assertTrue((together[1] == np.iinfo(np.uint32).max).all())
+
+
+class NearDuplicateIndexTest(unittest.TestCase):
+    def test_near_duplicates_share_a_cluster(self):
+        index = NearDuplicateIndex()
+        ids = index.assign_batch([BASE, NEAR, OTHER, BASE])
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(ids[0], ids[3])
+        self.assertNotEqual(ids[0], ids[2])
+        self.assertEqual(len(index), 2)
+        # Across batches, exact and near copies find the existing clusters.
+        self.assertEqual(index.assign_batch([" ".join(NEAR), OTHER]), [ids[0], ids[2]])
+        self.assertEqual(index.get_status()["assigned"], 6)
+
+    def test_least_recently_matched_cluster_is_evicted(self):
+        index = NearDuplicateIndex(max_clusters=2)
+        base, other = index.assign_batch([BASE, OTHER])
+        index.assign_batch([NEAR])  # touches BASE's cluster, so OTHER's is now the oldest
+        third = index.assign_batch([THIRD])[0]
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.evicted, 1)
+        self.assertEqual(index.assign_batch([BASE]), [base])
+        # OTHER's exact key and LSH entries went with it: it founds a new cluster.
+        again = index.assign_batch([OTHER])[0]
+        self.assertNotIn(again, (base, other, third))
+        self.assertEqual(index.evicted, 2)
+        self.assertTrue(all(other not in members for table in index._tables for members in table.values()))
+        self.assertNotIn(other, index._exact.values())
+
+    def test_remembered_result_follows_fingerprint_and_eviction(self):
+        index = NearDuplicateIndex(max_clusters=1)
+        cluster = index.assign_batch([BASE])[0]
+        index.remember(cluster, "v1", (0.7, 0.2, 0.1))
+        self.assertEqual(index.sentiment(cluster, "v1"), (0.7, 0.2, 0.1))
+        self.assertIsNone(index.sentiment(cluster, "v2"))
+        index.assign_batch([OTHER])
+        self.assertIsNone(index.sentiment(cluster, "v1"))
+        # Remembering for a cluster that is already gone is a no-op.
+        index.remember(cluster, "v1", (0.7, 0.2, 0.1))
+        self.assertIsNone(index.sentiment(cluster, "v1"))
+
+    def test_clear_resets_everything(self):
+        index = NearDuplicateIndex()
+        index.assign_batch([BASE, OTHER])
+        index.clear()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.get_status()["assigned"], 0)
+        self.assertEqual(index.assign_batch([BASE]), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
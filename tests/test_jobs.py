@@ -0,0 +1,136 @@
+"""
+BriefQueue against a stub OpenAI-compatible /chat/completions server:
+deduplication by brief_key, the result TTL and backend timeouts.
+"""
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.brief import BriefGenerator
+from services.jobs import BriefQueue, brief_key
+
+ARTICLES = ["公司收到监管问询函", "大股东拟减持"]
+
+
+class StubModel(ThreadingHTTPServer):
+    """Answers every chat completion after ``delay`` seconds and counts the calls."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.calls = 0
+        self.delay = 0.0
+        self.release = threading.Event()
+        self.release.set()
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.calls += 1
+        self.server.release.wait(5)
+        time.sleep(self.server.delay)
+        reply = json.dumps({
+            "choices": [{"message": {"role": "assistant", "content": f"简报#{self.server.calls} {body['model']}"}}],
+        }).encode("utf-8")
+        try:
+            self.send_response(200 if self.path == "/v1/chat/completions" else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+        except OSError:
+            pass  # the client already gave up
+
+    def log_message(self, *args):
+        pass
+
+
+class BriefQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubModel()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def queue(self, timeout: float = 5.0, **kwargs) -> BriefQueue:
+        generator = BriefGenerator(
+            use_mock=False, api_base=self.server.api_base, api_key="test", model_name="stub", timeout=timeout
+        )
+        return BriefQueue(generator, **kwargs)
+
+    def test_identical_requests_share_one_job(self):
+        queue = self.queue()
+        self.server.release.clear()
+        first = queue.submit("600519", "贵州茅台", ARTICLES)
+        second = queue.submit("600519", "贵州茅台", list(reversed(ARTICLES)))
+        self.assertEqual(first["job_id"], second["job_id"])
+        self.assertEqual(first["job_id"], brief_key("600519", "贵州茅台", ARTICLES))
+        self.assertEqual(queue.stats["deduplicated"], 1)
+        self.server.release.set()
+
+        job = queue.wait(first["job_id"], 5)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["result"], "简报#1 stub")
+        self.assertEqual(self.server.calls, 1)
+
+        cached = queue.submit("600519", "贵州茅台", ARTICLES)
+        self.assertEqual(cached["status"], "done")
+        self.assertEqual(queue.stats["cache_hits"], 1)
+        self.assertEqual(self.server.calls, 1)
+
+        other = queue.submit("000001", "平安银行", ARTICLES)
+        self.assertNotEqual(other["job_id"], first["job_id"])
+        queue.wait(other["job_id"], 5)
+        self.assertEqual(self.server.calls, 2)
+
+    def test_finished_brief_expires_after_ttl(self):
+        queue = self.queue(ttl=0.2)
+        self.assertEqual(queue.generate("600519", "贵州茅台", ARTICLES), "简报#1 stub")
+        self.assertEqual(queue.generate("600519", "贵州茅台", ARTICLES), "简报#1 stub")
+        self.assertEqual(self.server.calls, 1)
+        time.sleep(0.3)
+        self.assertEqual(queue.generate("600519", "贵州茅台", ARTICLES), "简报#2 stub")
+        self.assertEqual(self.server.calls, 2)
+        self.assertEqual(queue.stats["cache_hits"], 1)
+
+    def test_backend_timeout_fails_the_job_and_allows_retry(self):
+        queue = self.queue(timeout=0.2)
+        self.server.delay = 1.0
+        job = queue.submit("600519", "贵州茅台", ARTICLES)
+        job = queue.wait(job["job_id"], 5)
+        self.assertEqual(job["status"], "failed")
+        self.assertIn("timed out", job["error"])
+        self.assertIn("生成失败", queue.briefing(job))
+        self.assertEqual(queue.stats["failed"], 1)
+
+        self.server.delay = 0.0
+        retry = queue.submit("600519", "贵州茅台", ARTICLES)
+        self.assertEqual(retry["status"], "queued")
+        self.assertEqual(queue.wait(retry["job_id"], 5)["status"], "done")
+        self.assertEqual(queue.stats["completed"], 1)
+
+    def test_wait_returns_pending_job_after_timeout(self):
+        queue = self.queue()
+        self.server.release.clear()
+        job = queue.submit("600519", "贵州茅台", ARTICLES)
+        pending = queue.wait(job["job_id"], 0.1)
+        self.assertIn(pending["status"], ("queued", "running"))
+        self.assertIn("等待超过", queue.generate("600519", "贵州茅台", ARTICLES, timeout=0.1))
+        self.server.release.set()
+        self.assertEqual(queue.wait(job["job_id"], 5)["status"], "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
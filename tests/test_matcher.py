@@ -0,0 +1,68 @@
+"""
+KeywordMatcher counts against the per-keyword ``str.count``-style reference
+(``sum(1 for w in words if w in text)``), including overlapping and nested
+keywords and the weights column.
+"""
+
+import random
+import unittest
+
+from services.matcher import KeywordMatcher
+from services.sentiment import SentimentAnalyzer
+
+NESTED = {
+    "risk": ["跌停", "跌停板", "停板", "降价", "降价潮", "雷", "暴雷", "踩雷", "跌停"],
+    "positive": ["涨", "涨停", "大涨", "板"],
+    "neutral": ["", "横盘", "盘"],
+}
+WEIGHTS = {
+    "risk": {"跌停": -2.0, "跌停板": -3.0, "停板": -1.0, "降价": -1.5, "降价潮": -2.5, "雷": -0.5, "暴雷": -4.0, "踩雷": -3.5},
+    "positive": {"涨": 0.5, "涨停": 2.0, "大涨": 1.5, "板": 0.25},
+    "neutral": {"": 0.0, "横盘": 0.1, "盘": 0.0},
+}
+TEXTS = [
+    "",
+    "跌停板",
+    "降价潮来了，跌停",
+    "暴雷踩雷黑天鹅，降价降价潮",
+    "大涨后涨停，随后跌停板，横盘整理",
+    "雷雷雷",
+    "停板跌",
+    "aaa 无关文本",
+]
+
+
+def reference(categories, text, weights=None):
+    counts = [sum(1 for w in categories[name] if w in text) for name in categories]
+    if weights is not None:
+        counts.append(sum(weights[name][w] for name in categories for w in categories[name] if w in text))
+    return tuple(counts)
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_overlapping_and_nested_keywords(self):
+        matcher = KeywordMatcher(NESTED)
+        for text in TEXTS:
+            self.assertEqual(matcher.count(text), reference(NESTED, text), text)
+
+    def test_weights_column(self):
+        matcher = KeywordMatcher(NESTED, WEIGHTS)
+        for text in TEXTS:
+            expected = reference(NESTED, text, WEIGHTS)
+            actual = matcher.count(text)
+            self.assertEqual(actual[:3], expected[:3], text)
+            self.assertAlmostEqual(actual[3], expected[3], places=9, msg=text)
+
+    def test_builtin_lexicon_on_random_texts(self):
+        analyzer = SentimentAnalyzer()
+        categories = dict(analyzer.lexicon.categories)
+        matcher = analyzer.matcher
+        alphabet = "".join(sorted({ch for words in categories.values() for w in words for ch in w})) + "的了是 ，"
+        rng = random.Random(7)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            self.assertEqual(matcher.count(text), reference(categories, text), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
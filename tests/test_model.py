@@ -0,0 +1,53 @@
+"""
+LinearTextModel files: save/load round trip and the recorded feature hash.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from services.hashing import HASH_VERSION
+from services.model import LEGACY_FEATURE_HASH, LinearTextModel, train_linear_model
+
+TEXTS = ["业绩大幅增长 股价上涨", "公司涉嫌违规 被立案调查", "今日横盘整理 成交平稳"]
+LABELS = [2, 1, 0]
+
+
+class ModelFileTest(unittest.TestCase):
+    def setUp(self):
+        self.model = train_linear_model(TEXTS, LABELS, dim=1 << 10, epochs=20)
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "model.npz")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip_keeps_predictions_and_feature_hash(self):
+        self.model.save(self.path)
+        loaded = LinearTextModel.load(self.path)
+        self.assertEqual(loaded.feature_hash, HASH_VERSION)
+        np.testing.assert_array_equal(loaded.predict(TEXTS), self.model.predict(TEXTS))
+        self.assertEqual(loaded.predict(TEXTS).argmax(axis=1).tolist(), LABELS)
+
+    def test_file_hashed_differently_is_rejected(self):
+        m = self.model
+        with open(self.path, "wb") as f:
+            np.savez(f, weights=m.weights, scale=m.scale, bias=m.bias, ngram=m.ngram, name=m.name, feature_hash="other")
+        with self.assertRaises(ValueError):
+            LinearTextModel.load(self.path)
+
+    def test_file_without_feature_hash_is_the_legacy_hash(self):
+        m = self.model
+        with open(self.path, "wb") as f:
+            np.savez(f, weights=m.weights, scale=m.scale, bias=m.bias, ngram=m.ngram, name=m.name)
+        if LEGACY_FEATURE_HASH == HASH_VERSION:
+            self.assertEqual(LinearTextModel.load(self.path).feature_hash, LEGACY_FEATURE_HASH)
+        else:
+            with self.assertRaises(ValueError):
+                LinearTextModel.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
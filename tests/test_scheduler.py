@@ -0,0 +1,80 @@
+"""
+PipelineScheduler under concurrent callers: joiners of a running
+recompute must get its snapshot, and a cold start computes only once.
+"""
+
+import sys
+import threading
+import time
+import unittest
+
+from services.scheduler import PipelineScheduler
+
+THREADS = 8
+RUNS = 100
+
+
+class SchedulerConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def scheduler(self):
+        calls = []
+
+        def compute():
+            calls.append(None)
+            time.sleep(0.001)
+            return {"run": len(calls)}
+
+        return PipelineScheduler(compute, lambda: len(calls)), calls
+
+    def race(self, call) -> list:
+        barrier = threading.Barrier(THREADS)
+        results = [None] * THREADS
+
+        def worker(i):
+            barrier.wait()
+            results[i] = call()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_cold_latest_computes_once(self):
+        for _ in range(RUNS):
+            scheduler, calls = self.scheduler()
+            results = self.race(scheduler.latest)
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(all(r is scheduler.snapshot for r in results))
+            self.assertEqual(scheduler.stats["runs"], 1)
+
+    def test_warm_refresh_never_returns_the_old_snapshot(self):
+        for _ in range(RUNS):
+            scheduler, calls = self.scheduler()
+            old = scheduler.refresh()
+            results = self.race(scheduler.refresh)
+            self.assertTrue(all(r is not None and r is not old for r in results))
+            self.assertTrue(all(r.result["run"] > old.result["run"] for r in results))
+            self.assertEqual(scheduler.stats["runs"], len(calls))
+
+    def test_failed_run_is_not_published(self):
+        def compute():
+            raise RuntimeError("boom")
+
+        scheduler = PipelineScheduler(compute, lambda: 0)
+        with self.assertRaises(RuntimeError):
+            scheduler.refresh()
+        self.assertIsNone(scheduler.snapshot)
+        self.assertEqual(scheduler.stats["failures"], 1)
+        self.assertFalse(scheduler.get_status()["running"])
+
+
+if __name__ == "__main__":
+    unittest.main()